@@ -0,0 +1,332 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Iterable, List, Optional, Union
+
+from core import metrics
+from core.buffers import Buffer, as_bytes
+from core.cancellation import CancellationToken
+from core.issues import (
+    CheckResult, ERROR_CHECK, ERROR_TIMEOUT, ERROR_CRASHED, STATUS_TIMEOUT, STATUS_CRASHED
+)
+from core.supervisor import SettingsSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Pemeriksa, event pembatalan per slot dan PID pemeriksa per slot di proses worker, diset oleh _init_async_worker
+_checker = None
+_cancel_events: List[Any] = []
+_slot_pids = None
+
+# Detik setelah batas waktu sebelum worker yang tidak berhenti (mis. macet di parsing native) dimatikan
+KILL_GRACE_SECONDS = 2.0
+
+# Nilai default argumen timeout: pakai batas waktu instance
+_DEFAULT = object()
+
+
+def _init_async_worker(settings_values, log_queue, log_level: int, cancel_events, slot_pids):
+    """Initializer of the AsyncDocumentChecker worker processes."""
+    global _checker, _cancel_events, _slot_pids
+    from core.logger_config import configure_worker_logging
+    configure_worker_logging(log_queue, log_level)
+    from core.checker import Checker
+    _checker = Checker(SettingsSnapshot(settings_values))
+    _cancel_events = cancel_events
+    _slot_pids = slot_pids
+
+
+def _check_in_worker(slot: int, source: Union[str, bytes], filename: str):
+    # Induk membaca PID ini untuk mematikan worker yang tidak merespons batas waktu
+    _slot_pids[slot] = os.getpid()
+    try:
+        result = _run_check(_checker, CancellationToken(_cancel_events[slot]), source, filename)
+    finally:
+        _slot_pids[slot] = 0
+    return result, metrics.worker_metrics()
+
+
+def _run_check(checker, cancel: CancellationToken, source, filename: str) -> CheckResult:
+    try:
+        if isinstance(source, str):
+            return checker.check_file(source, cancel).compact()
+        return checker.check_bytes(source, filename, cancel).compact()
+    except MemoryError:
+        raise
+    except Exception as e:
+        result = CheckResult.error(filename, ERROR_CHECK, e).compact()
+        metrics.record_check(filename, result)
+        return result
+
+
+class AsyncDocumentChecker:
+    """
+    ``asyncio`` front end of ``Checker`` for async services.
+
+    Checks run on a shared pool (``processes=True``: spawn worker processes,
+    each with its own checker; otherwise threads with one checker per slot) that
+    is started on first use and reused by every call. ``max_concurrency``
+    slots limit the checks in progress; every slot owns a cancellation
+    event, so a call that times out or whose task is cancelled stops its
+    own check at the next paragraph or page without touching the others.
+    A worker process that is still busy ``KILL_GRACE_SECONDS`` after its
+    timeout (e.g. stuck in native parsing) is killed and the pool replaced;
+    checks that were running on that pool are submitted again. If a worker
+    crashes by itself, the checks that were running on the pool are each
+    retried once in a separate one-process pool, so only the document that
+    caused the crash is reported as crashed. Threads
+    cannot be killed, so with ``processes=False`` such a check keeps its
+    slot until it returns::
+
+        async with AsyncDocumentChecker(workers=4, timeout=60) as checker:
+            result = await checker.check(upload_bytes, "thesis.pdf")
+            async for result in checker.check_many(paths):
+                ...
+    """
+
+    def __init__(self, settings=None, workers: int = None, processes: bool = True,
+                 max_concurrency: int = None, timeout: Optional[float] = None):
+        self.settings = SettingsSnapshot.of(settings)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.processes = processes
+        self.max_concurrency = max(1, max_concurrency or self.workers)
+        # Batas waktu default per pemeriksaan (detik, tanpa waktu tunggu slot); None = tanpa batas
+        self.timeout = timeout
+        self._executor = None
+        self._checkers: List[Any] = []
+        self._events: List[Any] = []
+        self._slots: Optional[asyncio.Queue] = None
+        self._loop = None
+        self._slot_pids = None
+        # Pool yang sengaja dihentikan karena worker macet; job lain di pool itu dikirim ulang
+        self._killed = weakref.WeakSet()
+        self._reapers = set()
+
+    def _start(self):
+        if self._slots is not None:
+            return
+        metrics.dump_on_exit()
+        self._loop = asyncio.get_running_loop()
+        if self.processes:
+            self._mp_context = multiprocessing.get_context("spawn")
+            self._events = [self._mp_context.Event() for _ in range(self.max_concurrency)]
+            self._slot_pids = self._mp_context.Array("i", self.max_concurrency, lock=False)
+        else:
+            from core.checker import Checker
+            # Satu Checker per slot: sebuah slot hanya dipakai satu pemeriksaan pada satu waktu
+            self._checkers = [Checker(self.settings) for _ in range(self.max_concurrency)]
+            self._events = [threading.Event() for _ in range(self.max_concurrency)]
+        self._executor = self._new_executor()
+        self._slots = asyncio.Queue()
+        for slot in range(self.max_concurrency):
+            self._slots.put_nowait(slot)
+        logger.info(f"AsyncDocumentChecker dimulai: {self.workers} "
+                    f"{'proses' if self.processes else 'thread'}, {self.max_concurrency} slot.")
+
+    def _new_executor(self, workers: int = None):
+        if not self.processes:
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="AsyncDocumentChecker")
+        from core.logger_config import worker_log_queue
+        return ProcessPoolExecutor(
+            max_workers=workers or self.workers, mp_context=self._mp_context,
+            initializer=_init_async_worker,
+            initargs=(self.settings.as_dict(), worker_log_queue(self._mp_context), logging.root.level,
+                      self._events, self._slot_pids),
+        )
+
+    def _release(self, slot: int):
+        self._events[slot].clear()
+        self._slots.put_nowait(slot)
+
+    def _release_threadsafe(self, slot: int):
+        try:
+            self._loop.call_soon_threadsafe(self._release, slot)
+        except RuntimeError:
+            pass  # Event loop sudah ditutup
+
+    async def check(self, source: Union[str, "os.PathLike", Buffer], filename: str = None,
+                    timeout: Optional[float] = _DEFAULT) -> CheckResult:
+        """
+        Check a file path or an in-memory document (``filename`` required).
+
+        After ``timeout`` seconds of checking (default: the instance timeout)
+        the check is told to stop and a ``STATUS_TIMEOUT`` result is returned.
+        Cancelling the awaiting task also stops the check in its worker.
+        """
+        self._start()
+        if isinstance(source, (bytes, bytearray, memoryview)) or not isinstance(source, (str, os.PathLike)):
+            if not filename:
+                raise ValueError("filename is required for in-memory documents")
+            if self.processes:
+                # Dikirim ke proses lain: perlu bytes yang dapat di-pickle
+                source = as_bytes(source)
+        else:
+            source = os.fspath(source)
+            filename = filename or os.path.basename(source)
+        timeout = self.timeout if timeout is _DEFAULT else timeout
+
+        slot = await self._slots.get()
+        # Batas waktu dihitung sejak slot didapat, termasuk pengiriman ulang ke pool baru
+        deadline = None if timeout is None else self._loop.time() + timeout
+        future = None
+        timed_out = False
+        # Pool satu proses untuk mengulang pemeriksaan ini sendirian setelah pool bersama rusak
+        isolated = None
+        try:
+            for attempt in (1, 2):
+                executor = self._executor if isolated is None else isolated
+                future = None
+                try:
+                    future = self._submit(executor, slot, source, filename)
+                    remaining = None if deadline is None else max(0.0, deadline - self._loop.time())
+                    result = await asyncio.wait_for(asyncio.wrap_future(future), remaining)
+                except BrokenProcessPool as e:
+                    self._restart_executor(executor)
+                    # Pool rusak sebelum berkas ini dikirim, atau dihentikan karena worker lain macet: kirim ulang
+                    if attempt == 1 and (future is None or executor in self._killed):
+                        continue
+                    if attempt == 1 and self._executor is not None:
+                        # Salah satu pemeriksaan yang berjalan merusak pool, tidak diketahui yang mana:
+                        # ulangi sendirian, agar berkas penyebabnya hanya merusak pool ulangannya sendiri
+                        logger.warning(f"Pool rusak saat memeriksa {filename}; diulang di proses terpisah.")
+                        isolated = self._new_executor(workers=1)
+                        continue
+                    logger.error(f"Proses pemeriksa berhenti tidak normal saat memeriksa {filename}.")
+                    result = CheckResult.error(filename, ERROR_CRASHED, e, status=STATUS_CRASHED).compact()
+                    metrics.record_check(filename, result)
+                    return result
+                if self.processes:
+                    result, worker_metrics = result
+                    metrics.REGISTRY.merge(worker_metrics)
+                return result
+        except asyncio.TimeoutError:
+            timed_out = True
+            self._events[slot].set()
+            logger.warning(f"Pemeriksaan {filename} melebihi batas waktu {timeout}s; worker diminta berhenti.")
+            result = CheckResult.error(filename, ERROR_TIMEOUT, timeout, status=STATUS_TIMEOUT).compact()
+            metrics.record_check(filename, result, seconds=timeout)
+            return result
+        except asyncio.CancelledError:
+            self._events[slot].set()
+            raise
+        finally:
+            if isolated is not None:
+                if future is None or future.done():
+                    isolated.shutdown(wait=False)
+                else:
+                    future.add_done_callback(lambda _: isolated.shutdown(wait=False))
+            if future is None or future.done():
+                self._release(slot)
+            else:
+                # Slot baru bebas setelah worker benar-benar selesai
+                future.add_done_callback(lambda _: self._release_threadsafe(slot))
+                if self.processes:
+                    reaper = self._loop.create_task(self._stop_hung(slot, future, executor, filename, timed_out))
+                    self._reapers.add(reaper)
+                    reaper.add_done_callback(self._reapers.discard)
+
+    def _submit(self, executor, slot: int, source, filename: str):
+        if self.processes:
+            return executor.submit(_check_in_worker, slot, source, filename)
+        return executor.submit(_run_check, self._checkers[slot], CancellationToken(self._events[slot]), source, filename)
+
+    async def _stop_hung(self, slot: int, future, executor, filename: str, timed_out: bool):
+        """Kill the worker of ``slot`` if it ignores the stop request for ``KILL_GRACE_SECONDS``."""
+        deadline = self._loop.time() + KILL_GRACE_SECONDS
+        while not future.done() and self._loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        pid = self._slot_pids[slot]
+        if future.done() or not pid:
+            return
+        reason = "batas waktu" if timed_out else "pembatalan"
+        logger.warning(f"Worker {pid} tidak merespons {reason} saat memeriksa {filename}; dihentikan paksa.")
+        self._killed.add(executor)
+        self._restart_executor(executor)
+        self._kill(pid)
+
+    @staticmethod
+    def _kill(pid: int):
+        try:
+            os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass  # Sudah selesai sendiri
+
+    def _restart_executor(self, executor):
+        """Replace ``executor`` with a new pool, unless another call already did (or the checker is closed)."""
+        if executor is None or self._executor is not executor:
+            return
+        self._executor = self._new_executor()
+        executor.shutdown(wait=False)
+        metrics.WORKER_RESTARTS.inc()
+
+    async def check_many(self, sources: Iterable[Union[str, "os.PathLike", tuple]], ordered: bool = False,
+                         timeout: Optional[float] = _DEFAULT) -> AsyncIterator[CheckResult]:
+        """
+        Check many documents and yield the results as they finish (or in
+        input order with ``ordered``). Items are paths or ``(data, filename)``
+        tuples; ``sources`` is read lazily, keeping at most twice
+        ``max_concurrency`` checks started but not yet yielded.
+        """
+        window = 2 * self.max_concurrency
+        iterator = iter(sources)
+        tasks = deque()
+
+        def fill():
+            while len(tasks) < window:
+                item = next(iterator, _DEFAULT)
+                if item is _DEFAULT:
+                    return
+                source, filename = item if isinstance(item, tuple) else (item, None)
+                tasks.append(asyncio.ensure_future(self.check(source, filename, timeout)))
+
+        try:
+            fill()
+            while tasks:
+                if ordered:
+                    task = tasks.popleft()
+                    result = await task
+                else:
+                    done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    task = next(task for task in tasks if task in done)
+                    tasks.remove(task)
+                    result = task.result()
+                yield result
+                fill()
+        finally:
+            # Konsumen berhenti lebih awal: batalkan sisa pemeriksaan (juga di worker)
+            for task in tasks:
+                task.cancel()
+
+    async def close(self):
+        """Stop all checks and shut the pool down."""
+        if self._executor is None:
+            return
+        for event in self._events:
+            event.set()
+        for reaper in list(self._reapers):
+            reaper.cancel()
+        executor, self._executor = self._executor, None
+        if self.processes:
+            # Worker yang tidak berhenti dalam tenggang waktu akan menahan shutdown selamanya
+            deadline = self._loop.time() + KILL_GRACE_SECONDS
+            while any(self._slot_pids) and self._loop.time() < deadline:
+                await asyncio.sleep(0.05)
+            for pid in self._slot_pids:
+                if pid:
+                    self._kill(pid)
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown, True)
+        self._slots = None
+
+    async def __aenter__(self) -> "AsyncDocumentChecker":
+        self._start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,93 @@
+import io
+import mmap
+from typing import Union
+
+# Tipe buffer yang diterima DocumentChecker.check_bytes
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a buffer, without copying it.
+
+    ``io.BytesIO`` copies anything that is not ``bytes``; this reader keeps a
+    ``memoryview`` of the buffer and only copies the ranges that are read
+    (e.g. one zip member at a time for python-docx).
+    """
+
+    def __init__(self, data: Buffer):
+        super().__init__()
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        end = min(self._pos + len(buffer), len(self._view))
+        count = max(0, end - self._pos)
+        buffer[:count] = self._view[self._pos:end]
+        self._pos += count
+        return count
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b""
+        self._pos = max(self._pos, end)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def as_buffer(data: Buffer) -> Union[bytes, memoryview]:
+    """
+    The buffer for ``fitz.open(stream=...)`` without copying: ``bytes`` as
+    is, a ``bytearray``, ``mmap`` or contiguous view as a flat byte
+    ``memoryview`` that PyMuPDF reads in place (only a non-contiguous view
+    is copied). The buffer must stay unchanged while the document is open.
+    """
+    if isinstance(data, bytes):
+        return data
+    view = memoryview(data)
+    if not view.c_contiguous:
+        return view.tobytes()
+    return view.cast("B")
+
+
+def as_bytes(data: Buffer) -> bytes:
+    """
+    The buffer as ``bytes``, e.g. to send it to another process (views and
+    ``mmap`` cannot be pickled): ``bytes`` (or a full view of one) is
+    returned as is, anything else is copied once.
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, memoryview) and isinstance(data.obj, bytes) and data.nbytes == len(data.obj):
+        return data.obj
+    return memoryview(data).tobytes()
@@ -0,0 +1,33 @@
+import threading
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag checked by ``DocumentChecker`` between
+    paragraphs (DOCX) and pages (PDF).
+
+    The flag is a ``threading.Event`` by default. Tokens created with
+    ``shared(mp_context)`` wrap a ``multiprocessing`` event instead and can be
+    passed to worker processes, so one ``cancel()`` in the GUI process stops
+    every running check.
+    """
+    __slots__ = ("_event",)
+
+    def __init__(self, event=None):
+        self._event = event if event is not None else threading.Event()
+
+    @classmethod
+    def shared(cls, mp_context) -> "CancellationToken":
+        return cls(mp_context.Event())
+
+    @property
+    def event(self):
+        """Underlying event, e.g. to hand to a worker process."""
+        return self._event
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
@@ -0,0 +1,789 @@
+import os
+import math
+import multiprocessing
+import threading
+from multiprocessing.connection import wait
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from docx import Document
+import fitz  # PyMuPDF
+from typing import BinaryIO, Callable, Dict, List, Tuple, Union, Any, Optional
+import logging # Impor modul logging
+import time
+
+from core.issues import (
+    CheckResult, ERROR_UNSUPPORTED, ERROR_CHECK, ERROR_PDF_OPEN, NOTE_PDF_MARGIN, STATUS_CANCELLED
+)
+from core.cancellation import CancellationToken
+from core.buffers import Buffer, BufferReader, as_buffer
+from core.features import DocumentFeatures, FeatureCache, FeatureRecorder, with_recorder
+from core import columnar, memory_diagnostics, metrics
+from core.profiles import Profile, ProfileLibrary
+from core.profiling import SlowFileProfiler
+from core.progress import DocumentProgressCallback, with_progress
+from core.rules import (
+    RuleRegistry, RuleSet, CheckContext, default_registry,
+    ParagraphNode, RunNode, SectionNode, PageNode, SpanNode,
+    NODE_RUN, NODE_PARAGRAPH, NODE_SECTION, NODE_PAGE, NODE_SPAN,
+    DOCX_NODE_KINDS, PDF_NODE_KINDS
+)
+
+logger = logging.getLogger(__name__) # Buat logger khusus untuk modul ini
+
+# Interval (detik) proses induk memeriksa token pembatalan saat menunggu rentang halaman
+CANCEL_POLL_INTERVAL = 0.05
+
+# Token pembatalan proses rentang halaman, diset oleh _init_range_worker
+_range_cancel: Optional[CancellationToken] = None
+
+
+def _init_range_worker(log_queue, log_level: int, cancel_event):
+    """Initializer of the page-range worker processes."""
+    global _range_cancel
+    from core.logger_config import configure_worker_logging
+    configure_worker_logging(log_queue, log_level)
+    _range_cancel = CancellationToken(cancel_event)
+    _exit_with_parent()
+
+
+def _exit_with_parent():
+    """
+    Exit this process once the process that started it is gone, e.g. a
+    supervised worker killed after a timeout; orphaned range processes
+    would otherwise keep parsing unsupervised.
+    """
+    parent = multiprocessing.parent_process()
+    if parent is None:
+        return
+
+    def watch():
+        wait([parent.sentinel])
+        os._exit(1)
+
+    threading.Thread(target=watch, name="ParentWatch", daemon=True).start()
+
+
+def _check_pdf_range(file_path: str, filename: str, rule_classes, config: Dict[str, Any],
+                     first_page: int, last_page: int) -> Tuple[CheckResult, Optional[DocumentFeatures]]:
+    """
+    Check pages ``[first_page, last_page)`` of a PDF; runs in a separate process.
+    Also returns the recorded features of the range if a ``FeatureRecorder`` is among the rules.
+    """
+    rule_set = RuleSet([rule_cls(config) for rule_cls in rule_classes])
+    ctx = CheckContext(filename, "pdf")
+    # Setiap proses membuka berkas sendiri dari path; dokumen tidak dikirim antar proses
+    with fitz.open(file_path) as doc:
+        rule_set.start(ctx, PDF_NODE_KINDS)
+        Checker._walk_pdf(doc, rule_set, ctx, range(first_page, last_page), _range_cancel)
+        if not ctx.cancelled:
+            rule_set.finish(ctx, PDF_NODE_KINDS)
+    logger.debug("Rentang halaman %d-%d dari %s selesai: %d isu.", first_page + 1, last_page, filename, len(ctx.issues))
+    recorder = next((rule for rule in rule_set.rules if isinstance(rule, FeatureRecorder)), None)
+    features = recorder.features if recorder is not None else None
+    return ctx.to_result().compact(), features
+
+
+def _open_pdf(data: Union[bytes, memoryview]):
+    """``fitz.open`` on an in-memory PDF; PyMuPDF versions that only take ``bytes`` get one copy."""
+    try:
+        return fitz.open(stream=data, filetype="pdf")
+    except TypeError:
+        if isinstance(data, bytes):
+            raise
+        return fitz.open(stream=memoryview(data).tobytes(), filetype="pdf")
+
+
+def _read_rest(stream: BinaryIO) -> bytes:
+    """Bytes of ``stream`` from its current position to the end."""
+    if hasattr(stream, "getvalue"):
+        try:
+            at_start = stream.tell() == 0
+        except (OSError, ValueError):
+            at_start = False
+        # getvalue() mengembalikan seluruh isi, terlepas dari posisi stream
+        if at_start:
+            return stream.getvalue()
+    return stream.read()
+
+
+class Checker:
+    """
+    Checks DOCX and PDF documents against the rules of the active profile.
+
+    Independent of Qt, so services and scripts can use it without PySide6;
+    the GUI uses the ``DocumentChecker`` wrapper, which emits a signal for
+    every result. ``settings`` only needs ``value(key, default)`` (a
+    ``QSettings`` or a ``SettingsSnapshot``). An instance is meant for one
+    thread at a time: create one per checking thread.
+    """
+
+    def __init__(self, settings, registry: RuleRegistry = None):
+        self.settings = settings
+        self.registry = registry or default_registry
+        # Fitur dokumen hasil parsing disimpan di disk; perubahan aturan tidak memerlukan parsing ulang
+        self.feature_cache = FeatureCache.from_settings(settings)
+        # Profil aturan dari berkas TOML/JSON, dimuat ulang otomatis saat berkas berubah
+        self.profile_library = ProfileLibrary.from_settings(settings, self.registry.codes())
+        self._missing_profile = None
+        # Profil cProfile disimpan hanya untuk berkas yang lambat (pengaturan Developer); None = mati
+        self.profiler = SlowFileProfiler.from_settings(settings)
+        # Diagnostik memori tracemalloc (pengaturan Developer) berlaku untuk seluruh proses
+        memory_diagnostics.from_settings(settings)
+        logger.info(f"{type(self).__name__} diinisialisasi.")
+
+    def completed(self, result: CheckResult):
+        """Called with the result of every ``check_file``/``check_bytes``/``check_stream``."""
+
+    def _get_setting(self, key: str, default: Any, type: type = None):
+        """Helper to get setting with type conversion."""
+        value = self.settings.value(key, default)
+        # Konversi tipe jika diperlukan, QSettings bisa mengembalikan tipe yang salah kadang-kadang
+        if type is bool and not isinstance(value, bool):
+            value = str(value).lower() in ('true', '1', 't', 'y', 'yes')
+        elif type is float and not isinstance(value, float):
+            try:
+                value = float(value)
+            except ValueError:
+                logger.warning(f"Gagal mengkonversi nilai pengaturan '{key}' ke float: {value}. Menggunakan default: {default}")
+                value = default
+        elif type is int and not isinstance(value, int):
+            try:
+                value = int(value)
+            except ValueError:
+                logger.warning(f"Gagal mengkonversi nilai pengaturan '{key}' ke int: {value}. Menggunakan default: {default}")
+                value = default
+        logger.debug("Pengaturan dibaca: %s = %s (default: %s)", key, value, default)
+        return value
+        
+    def check_file(self, file_path: str, cancel: CancellationToken = None) -> CheckResult:
+        """
+        Check a single file for compliance with formatting rules.
+
+        ``cancel`` is polled between paragraphs and pages; once it is set the
+        check stops and returns the findings so far with ``STATUS_CANCELLED``.
+        The result carries the fingerprint of the rule profile in effect.
+        """
+        logger.info(f"Mulai memeriksa file: {file_path}")
+        if not os.path.exists(file_path):
+            logger.error(f"File tidak ditemukan: {file_path}")
+            raise FileNotFoundError(f"File not found: {file_path}")
+            
+        filename = os.path.basename(file_path)
+        file_ext = os.path.splitext(filename)[1].lower()
+        # Profil diambil sekali per berkas agar muat ulang di tengah pemeriksaan tidak mencampur aturan
+        profile = self.active_profile()
+        started = time.perf_counter()
+        
+        with memory_diagnostics.measure(file_path):
+            if self.profiler is None:
+                result = self._check_file_type(file_path, filename, file_ext, cancel, profile)
+            else:
+                with self.profiler.profile(file_path) as profiled:
+                    result = profiled.result = self._check_file_type(file_path, filename, file_ext, cancel, profile)
+        metrics.record_check(filename, result, os.path.getsize(file_path), time.perf_counter() - started)
+            
+        self.completed(result)
+        return result
+
+    def _check_file_type(self, file_path: str, filename: str, file_ext: str,
+                         cancel: CancellationToken, profile: Profile) -> CheckResult:
+        """Check an existing file by its extension; errors become an error result."""
+        try:
+            if file_ext == '.docx':
+                result = self._check_docx_file(file_path, filename, cancel, profile)
+            elif file_ext == '.pdf':
+                result = self._check_pdf_file(file_path, filename, cancel, profile)
+            else:
+                result = CheckResult.error(filename, ERROR_UNSUPPORTED)
+        except MemoryError:
+            # Biarkan pemanggil (mis. worker terisolasi) menangani kehabisan memori
+            raise
+        except Exception as e:
+            result = CheckResult.error(filename, ERROR_CHECK, e)
+            logger.exception(f"Error saat memeriksa file {filename}") # Mencatat traceback juga
+        result.fingerprint = profile.fingerprint
+        return result
+
+    def check_bytes(self, data: Buffer, filename: str, cancel: CancellationToken = None,
+                    progress: DocumentProgressCallback = None) -> CheckResult:
+        """
+        Check an in-memory document, e.g. an upload, without writing it to disk.
+
+        ``data`` may be ``bytes``, ``bytearray``, ``memoryview`` or ``mmap``;
+        the document type comes from the extension of ``filename``, which is
+        also the name in the result. DOCX is read through a view of the
+        buffer and PyMuPDF reads a PDF in place (``as_buffer``), so the
+        document is not copied; the buffer must not change during the check.
+        Without a path the feature cache and parallel page ranges are not used.
+
+        ``progress(done, total, findings)`` is called from the checking
+        thread while paragraphs (DOCX) or pages (PDF) are visited, with the
+        findings reported since the previous call (see ``DocumentProgress``).
+        """
+        file_ext = os.path.splitext(filename)[1].lower()
+        size = memoryview(data).nbytes
+        if file_ext == '.docx':
+            reader = BufferReader(data)
+            try:
+                return self._check_memory(filename, cancel, docx_source=reader, progress=progress, size=size)
+            finally:
+                # Lepaskan view agar mmap/bytearray pemanggil dapat ditutup atau diubah lagi
+                reader.close()
+        buffer = as_buffer(data)
+        try:
+            return self._check_memory(filename, cancel, pdf_source=lambda: buffer, progress=progress, size=size)
+        finally:
+            if isinstance(buffer, memoryview):
+                try:
+                    # Lepaskan view agar mmap pemanggil dapat ditutup
+                    buffer.release()
+                except BufferError:
+                    pass  # Masih dipegang dokumen PyMuPDF; dilepas saat dokumen dibersihkan
+
+    def check_stream(self, stream: BinaryIO, filename: str, cancel: CancellationToken = None,
+                     progress: DocumentProgressCallback = None) -> CheckResult:
+        """
+        Check a document from a seekable binary file object (``io.BytesIO``,
+        an open file, a spooled upload), starting at its current position.
+        DOCX is read directly from the stream; a PDF is read into memory once
+        (a ``BytesIO`` at position 0 without copying).
+        See ``check_bytes`` for ``filename`` and ``progress``.
+        """
+        file_ext = os.path.splitext(filename)[1].lower()
+        try:
+            position = stream.tell()
+            stream.seek(0, os.SEEK_END)
+            size = stream.tell() - position
+            stream.seek(position)
+        except (AttributeError, OSError, ValueError):
+            size = None  # Stream tidak dapat di-seek; ukuran tidak dicatat di metrik
+        if file_ext == '.docx':
+            return self._check_memory(filename, cancel, docx_source=stream, progress=progress, size=size)
+        return self._check_memory(
+            filename, cancel,
+            pdf_source=lambda: _read_rest(stream),
+            progress=progress, size=size
+        )
+
+    def _check_memory(self, filename: str, cancel: CancellationToken = None,
+                      docx_source: BinaryIO = None, pdf_source: Callable[[], Union[bytes, memoryview]] = None,
+                      progress: DocumentProgressCallback = None, size: int = None) -> CheckResult:
+        """Shared part of ``check_bytes``/``check_stream``; mirrors ``check_file``."""
+        logger.info(f"Mulai memeriksa dokumen dari memori: {filename}")
+        file_ext = os.path.splitext(filename)[1].lower()
+        profile = self.active_profile()
+        started = time.perf_counter()
+
+        try:
+            if file_ext == '.docx':
+                with metrics.stage("parse"):
+                    doc = Document(docx_source)
+                result = self._check_docx(doc, filename, cancel, profile=profile, progress=progress)
+            elif file_ext == '.pdf':
+                result = self._check_pdf(pdf_source(), filename, cancel=cancel, profile=profile, progress=progress)
+            else:
+                result = CheckResult.error(filename, ERROR_UNSUPPORTED)
+        except MemoryError:
+            raise
+        except Exception as e:
+            result = CheckResult.error(filename, ERROR_CHECK, e)
+            logger.exception(f"Error saat memeriksa dokumen {filename}")
+        result.fingerprint = profile.fingerprint
+        metrics.record_check(filename, result, size, time.perf_counter() - started)
+
+        self.completed(result)
+        return result
+        
+    def check_profiles(self, file_path: str, profiles: List[Profile],
+                       cancel: CancellationToken = None) -> Dict[str, CheckResult]:
+        """
+        Check a file against several profiles with a single parse.
+
+        The document features are extracted once (or taken from the feature
+        cache) and every profile's rules are evaluated on them. Returns the
+        results keyed by profile name.
+        """
+        logger.info(f"Mulai memeriksa file terhadap {len(profiles)} profil: {file_path}")
+        if not os.path.exists(file_path):
+            logger.error(f"File tidak ditemukan: {file_path}")
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        filename = os.path.basename(file_path)
+        file_ext = os.path.splitext(filename)[1].lower()
+        if file_ext not in ('.docx', '.pdf'):
+            return {profile.name: CheckResult.error(filename, ERROR_UNSUPPORTED, fingerprint=profile.fingerprint)
+                    for profile in profiles}
+
+        try:
+            features, cancelled_page, cached = self._extract_features(file_path, filename, file_ext, cancel)
+            results = {}
+            for profile in profiles:
+                result = self._check_features(features, filename, cancel, cancelled_page, cached, profile)
+                result.fingerprint = profile.fingerprint
+                results[profile.name] = result
+            return results
+        except MemoryError:
+            raise
+        except Exception as e:
+            logger.exception(f"Error saat memeriksa file {filename} terhadap profil")
+            return {profile.name: CheckResult.error(filename, ERROR_CHECK, e, fingerprint=profile.fingerprint)
+                    for profile in profiles}
+
+    def active_profile(self) -> Profile:
+        """
+        The rule profile used by ``check_file``: the profile file named by the
+        setting ``rules/profile`` if set and valid, otherwise the flat rule settings.
+        """
+        name = self._get_setting("rules/profile", "")
+        if name:
+            profile = self.profile_library.get(name)
+            if profile is not None:
+                return profile
+            if self._missing_profile != name:
+                # Cukup sekali per nama, bukan untuk setiap berkas
+                self._missing_profile = name
+                logger.warning(f"Profil '{name}' tidak ditemukan di {self.profile_library.directory}; "
+                               f"menggunakan aturan dari pengaturan.")
+        return Profile.from_settings(self.settings, "", self.registry.codes())
+
+    def _extract_features(self, file_path: str, filename: str, file_ext: str,
+                          cancel: CancellationToken = None) -> Tuple[DocumentFeatures, Optional[int], bool]:
+        """
+        Document features from the cache, or recorded by parsing the file.
+        Returns (features, cancelled page or None, whether they were cached).
+        """
+        stat, features = self._cached_features(file_path)
+        if features is not None:
+            return features, None, True
+        if file_ext == '.docx':
+            with metrics.stage("parse"), open(file_path, 'rb') as f:
+                doc = Document(f)
+            features, ctx = self._record_docx(doc, filename, cancel)
+        else:
+            with metrics.stage("read"), open(file_path, 'rb') as f:
+                pdf_data = f.read()
+            with metrics.stage("parse"):
+                doc = fitz.open(stream=pdf_data, filetype="pdf")
+            features, ctx = self._record_pdf(doc, filename, file_path, cancel)
+        if stat is not None and not ctx.cancelled:
+            self._store_features((file_path, stat), features)
+        return features, ctx.cancelled_page if ctx.cancelled else None, False
+
+    def _check_docx_file(self, file_path: str, filename: str, cancel: CancellationToken = None,
+                         profile: Profile = None) -> CheckResult:
+        """Load and check a DOCX file"""
+        logger.debug("Memeriksa file DOCX: %s", filename)
+        try:
+            stat, features = self._cached_features(file_path)
+            if features is not None:
+                return self._check_features(features, filename, cancel, profile=profile)
+            with metrics.stage("parse"), open(file_path, 'rb') as f:
+                doc = Document(f)
+            return self._check_docx(doc, filename, cancel, (file_path, stat) if stat else None, profile)
+        except MemoryError:
+            raise
+        except Exception as e:
+            logger.exception(f"Gagal memproses file DOCX {filename}")
+            raise Exception(f"Failed to process DOCX file: {str(e)}")
+    
+    def _check_pdf_file(self, file_path: str, filename: str, cancel: CancellationToken = None,
+                        profile: Profile = None) -> CheckResult:
+        """Load and check a PDF file"""
+        logger.debug("Memeriksa file PDF: %s", filename)
+        try:
+            stat, features = self._cached_features(file_path)
+            if features is not None:
+                return self._check_features(features, filename, cancel, profile=profile)
+            with metrics.stage("read"), open(file_path, 'rb') as f:
+                file_bytes = f.read()
+            return self._check_pdf(file_bytes, filename, file_path, cancel,
+                                   (file_path, stat) if stat else None, profile)
+        except MemoryError:
+            raise
+        except Exception as e:
+            logger.exception(f"Gagal memproses file PDF {filename}")
+            raise Exception(f"Failed to process PDF file: {str(e)}")
+    
+    def _cached_features(self, file_path: str) -> Tuple[Optional[os.stat_result], Optional[DocumentFeatures]]:
+        """File status (taken before parsing) and cached features, if the feature cache is enabled."""
+        if self.feature_cache is None:
+            return None, None
+        stat = os.stat(file_path)
+        with metrics.stage("cache"):
+            return stat, self.feature_cache.load(file_path, stat)
+
+    def _store_features(self, cache_entry: Tuple[str, os.stat_result], features: DocumentFeatures):
+        file_path, stat = cache_entry
+        self.feature_cache.store(file_path, stat, features)
+
+    def _check_features(self, features: DocumentFeatures, filename: str, cancel: CancellationToken = None,
+                        cancelled_page: Optional[int] = None, cached: bool = True,
+                        profile: Profile = None) -> CheckResult:
+        """
+        Evaluate the current rules (or those of ``profile``) on extracted
+        document features, without parsing the file.
+
+        Rules are evaluated column-wise with NumPy when every enabled rule
+        supports it, otherwise node by node (replay). ``cancelled_page`` marks
+        features that were only partially extracted (cancelled traversal).
+        """
+        rule_set = self._build_rule_set(profile)
+        kinds = DOCX_NODE_KINDS if features.file_type == "docx" else PDF_NODE_KINDS
+        ctx = CheckContext(filename, features.file_type)
+        rules = rule_set.rules_for(kinds)
+        with metrics.stage("evaluate"):
+            if columnar.supports(rules):
+                if cancel is not None and cancel.cancelled:
+                    ctx.mark_cancelled()
+                else:
+                    columnar.evaluate(features, rules, ctx, complete=cancelled_page is None)
+            else:
+                rule_set.start(ctx, kinds)
+                features.replay(rule_set, ctx, cancel)
+                if not ctx.cancelled and cancelled_page is None:
+                    rule_set.finish(ctx, kinds)
+        if cancelled_page is not None:
+            ctx.mark_cancelled(page=cancelled_page)
+        if features.file_type == "pdf":
+            ctx.note(NOTE_PDF_MARGIN)
+
+        source = " (dari cache)" if cached else ""
+        if profile is not None:
+            source += f" [profil {profile.name}]"
+        logger.info(f"Pemeriksaan {features.file_type.upper()}{source} selesai untuk {filename}. "
+                    f"Sukses: {ctx.success}, Pesan: {len(ctx.issues)} isu.")
+        return ctx.to_result()
+
+    def _columnar_recording(self, rule_set: RuleSet, kinds, cache_entry) -> bool:
+        """
+        True if the document should only be recorded while parsing and the
+        rules evaluated afterwards on the feature columns.
+        """
+        return cache_entry is not None and columnar.supports(rule_set.rules_for(kinds))
+
+    def _load_rule_config(self, profile: Profile) -> Dict[str, Any]:
+        """Rule parameters of a profile as a plain dict shared by all rules."""
+        config = dict(profile.config)
+        config["pdf_size_tolerance"] = 0.5
+        return config
+
+    def _pdf_split_plan(self, rule_set: RuleSet, page_count: int) -> List[Tuple[int, int]]:
+        """
+        Page ranges for a parallel check, or an empty list if the document
+        should be checked in one pass.
+        """
+        threshold = self._get_setting("pdf/split_threshold", 200, type=int)
+        if threshold <= 0 or page_count < threshold:
+            return []
+        rules = rule_set.rules_for(PDF_NODE_KINDS)
+        if not rules or not all(rule.splittable for rule in rules):
+            return []
+        workers = self._pdf_split_workers()
+        if workers < 2:
+            return []
+        chunk_pages = max(1, self._get_setting("pdf/split_chunk_pages", 50, type=int))
+        # Pastikan setiap worker mendapat setidaknya satu rentang
+        chunk_pages = min(chunk_pages, math.ceil(page_count / workers))
+        return [(start, min(start + chunk_pages, page_count)) for start in range(0, page_count, chunk_pages)]
+
+    def _pdf_split_workers(self) -> int:
+        workers = self._get_setting("pdf/split_workers", 0, type=int)
+        return workers if workers > 0 else (os.cpu_count() or 1)
+
+    def _build_rule_set(self, profile: Profile = None) -> RuleSet:
+        """
+        Build the enabled rules of ``profile`` (default: ``active_profile()``). In the
+        flat settings a rule is disabled with the setting ``rules/<code>/enabled``.
+        """
+        if profile is None:
+            profile = self.active_profile()
+        return self.registry.build(self._load_rule_config(profile), profile.enabled_codes(self.registry.codes()))
+
+    def _check_docx(self, doc: Document, filename: str, cancel: CancellationToken = None,
+                    cache_entry: Tuple[str, os.stat_result] = None, profile: Profile = None,
+                    progress: DocumentProgressCallback = None) -> CheckResult:
+        """
+        Check DOCX file for compliance with formatting rules (of ``profile``, or the active profile).
+        With ``cache_entry`` (path, stat) the document features are recorded and cached.
+        ``progress`` receives per-paragraph progress of the traversal.
+        """
+        rule_set = self._build_rule_set(profile)
+        if progress is None and self._columnar_recording(rule_set, DOCX_NODE_KINDS, cache_entry):
+            # Satu lintasan hanya untuk mencatat fitur; aturan dievaluasi per kolom sesudahnya
+            features, ctx = self._record_docx(doc, filename, cancel)
+            if not ctx.cancelled:
+                self._store_features(cache_entry, features)
+            return self._check_features(features, filename, cancelled_page=ctx.cancelled_page if ctx.cancelled else None,
+                                        cached=False, profile=profile)
+
+        recorder = None
+        if cache_entry is not None:
+            rule_set, recorder = with_recorder(rule_set)
+        if progress is not None:
+            rule_set = with_progress(rule_set, progress, len(doc.paragraphs))
+        ctx = CheckContext(filename, "docx")
+        rule_set.start(ctx, DOCX_NODE_KINDS)
+        with metrics.stage("extract"):
+            self._walk_docx(doc, rule_set, ctx, cancel)
+        if ctx.cancelled:
+            # finish() menilai seluruh dokumen (mis. margin tidak diperiksa); tidak berlaku untuk hasil parsial
+            logger.info(f"Pemeriksaan DOCX {filename} dibatalkan; {len(ctx.issues)} isu dari bagian yang sudah diperiksa.")
+            return ctx.to_result()
+        rule_set.finish(ctx, DOCX_NODE_KINDS)
+        if recorder is not None:
+            self._store_features(cache_entry, recorder.features)
+
+        logger.info(f"Pemeriksaan DOCX selesai untuk {filename}. Sukses: {ctx.success}, Pesan: {len(ctx.issues)} isu.")
+        return ctx.to_result()
+
+    def _walk_docx(self, doc: Document, rule_set: RuleSet, ctx: CheckContext,
+                   cancel: CancellationToken = None):
+        """
+        Single pass over the document, dispatching each node to the rules interested in it.
+        Stops at the next paragraph or section once ``cancel`` is set (``ctx.cancelled``).
+        """
+        visit_run = rule_set.dispatch(NODE_RUN)
+        visit_paragraph = rule_set.dispatch(NODE_PARAGRAPH)
+        visit_section = rule_set.dispatch(NODE_SECTION)
+
+        if visit_run or visit_paragraph:
+            for para_idx, para in enumerate(doc.paragraphs):
+                if cancel is not None and cancel.cancelled:
+                    ctx.mark_cancelled()
+                    return
+                text = para.text
+                # Skip empty paragraphs
+                if not text.strip():
+                    continue
+
+                line_spacing = para.paragraph_format.line_spacing if visit_paragraph else None
+                para_node = ParagraphNode(para_idx, text, line_spacing)
+
+                if visit_run:
+                    para_style_font = None
+                    for run in para.runs:
+                        # Skip empty runs
+                        if not run.text.strip():
+                            continue
+
+                        # Determine the effective font name: run, then run style, then paragraph style
+                        font = run.font
+                        font_name = font.name
+                        if font_name is None and run.style and run.style.font:
+                            font_name = run.style.font.name
+                        if font_name is None:
+                            if para_style_font is None and para.style and para.style.font:
+                                para_style_font = para.style.font
+                            if para_style_font is not None:
+                                font_name = para_style_font.name
+
+                        size = font.size.pt if font.size else None
+                        run_node = RunNode(para_node, font_name, size)
+                        for visit in visit_run:
+                            visit(run_node, ctx)
+
+                for visit in visit_paragraph:
+                    visit(para_node, ctx)
+
+        if visit_section:
+            for section_idx, section in enumerate(doc.sections):
+                if cancel is not None and cancel.cancelled:
+                    ctx.mark_cancelled()
+                    return
+                # Convert inches to cm (1 inch = 2.54 cm)
+                section_node = SectionNode(
+                    section_idx,
+                    section.left_margin.inches * 2.54,
+                    section.right_margin.inches * 2.54,
+                    section.top_margin.inches * 2.54,
+                    section.bottom_margin.inches * 2.54,
+                )
+                for visit in visit_section:
+                    visit(section_node, ctx)
+
+    def _check_pdf(self, pdf_data: Union[bytes, memoryview], filename: str, file_path: str = None,
+                   cancel: CancellationToken = None, cache_entry: Tuple[str, os.stat_result] = None,
+                   profile: Profile = None, progress: DocumentProgressCallback = None) -> CheckResult:
+        """
+        Check PDF file for compliance with formatting rules (of ``profile``, or the active profile).
+
+        With ``file_path`` given, documents of at least ``pdf/split_threshold``
+        pages are checked as page ranges in parallel worker processes. With
+        ``cache_entry`` (path, stat) the document features are recorded and cached.
+        ``progress`` receives per-page progress; such checks run in one pass.
+        """
+        rule_set = self._build_rule_set(profile)
+        try:
+            with metrics.stage("parse"):
+                doc = _open_pdf(pdf_data)
+        except Exception as e:
+            logger.exception(f"Gagal membaca PDF {filename}")
+            return CheckResult.error(filename, ERROR_PDF_OPEN, e)
+
+        if progress is None and self._columnar_recording(rule_set, PDF_NODE_KINDS, cache_entry):
+            features, ctx = self._record_pdf(doc, filename, file_path, cancel)
+            if not ctx.cancelled:
+                self._store_features(cache_entry, features)
+            return self._check_features(features, filename, cancelled_page=ctx.cancelled_page if ctx.cancelled else None,
+                                        cached=False, profile=profile)
+
+        recorder = None
+        if cache_entry is not None:
+            rule_set, recorder = with_recorder(rule_set)
+        if progress is not None:
+            rule_set = with_progress(rule_set, progress, doc.page_count)
+        ctx = CheckContext(filename, "pdf")
+
+        ranges = self._pdf_split_plan(rule_set, doc.page_count) if file_path else []
+        if ranges:
+            doc.close()
+            with metrics.stage("extract"):
+                features = self._check_pdf_ranges(file_path, filename, rule_set, ranges, ctx, cancel)
+        else:
+            rule_set.start(ctx, PDF_NODE_KINDS)
+            with metrics.stage("extract"):
+                self._walk_pdf(doc, rule_set, ctx, cancel=cancel)
+            if not ctx.cancelled:
+                rule_set.finish(ctx, PDF_NODE_KINDS)
+            features = recorder.features if recorder is not None else None
+        if features is not None and not ctx.cancelled:
+            self._store_features(cache_entry, features)
+
+        # Note about margin checking
+        ctx.note(NOTE_PDF_MARGIN)
+
+        logger.info(f"Pemeriksaan PDF selesai untuk {filename}. Sukses: {ctx.success}, Pesan: {len(ctx.issues)} isu.")
+        return ctx.to_result()
+
+    def _record_docx(self, doc: Document, filename: str,
+                     cancel: CancellationToken = None) -> Tuple[DocumentFeatures, CheckContext]:
+        """Walk a DOCX only to record its features; the context holds a possible cancellation."""
+        rule_set, recorder = with_recorder(RuleSet([]))
+        ctx = CheckContext(filename, "docx")
+        rule_set.start(ctx, DOCX_NODE_KINDS)
+        with metrics.stage("extract"):
+            self._walk_docx(doc, rule_set, ctx, cancel)
+        return recorder.features, ctx
+
+    def _record_pdf(self, doc, filename: str, file_path: str = None,
+                    cancel: CancellationToken = None) -> Tuple[DocumentFeatures, CheckContext]:
+        """Walk an opened PDF only to record its features, as page ranges in parallel for large files."""
+        rule_set, recorder = with_recorder(RuleSet([]))
+        ctx = CheckContext(filename, "pdf")
+        ranges = self._pdf_split_plan(rule_set, doc.page_count) if file_path else []
+        if ranges:
+            doc.close()
+            with metrics.stage("extract"):
+                return self._check_pdf_ranges(file_path, filename, rule_set, ranges, ctx, cancel), ctx
+        rule_set.start(ctx, PDF_NODE_KINDS)
+        with metrics.stage("extract"):
+            self._walk_pdf(doc, rule_set, ctx, cancel=cancel)
+        return recorder.features, ctx
+
+    def _check_pdf_ranges(self, file_path: str, filename: str, rule_set: RuleSet,
+                          ranges: List[Tuple[int, int]], ctx: CheckContext,
+                          cancel: CancellationToken = None) -> Optional[DocumentFeatures]:
+        """
+        Check page ranges in worker processes and merge the findings in page order.
+
+        ``cancel`` may be a thread-local token; it is relayed to the range
+        processes through a process-shared event. After a cancelled range,
+        later ranges are discarded so the result covers a contiguous prefix.
+        Returns the merged document features when the rule set records them
+        (covering the checked prefix if cancelled).
+        """
+        from core.logger_config import worker_log_queue
+
+        rules = rule_set.rules_for(PDF_NODE_KINDS)
+        rule_classes = [type(rule) for rule in rules]
+        config = rules[0].config
+        features = DocumentFeatures("pdf") if any(isinstance(rule, FeatureRecorder) for rule in rules) else None
+        workers = min(self._pdf_split_workers(), len(ranges))
+        logger.info(f"Memeriksa {filename} dalam {len(ranges)} rentang halaman dengan {workers} proses.")
+
+        mp_context = multiprocessing.get_context("spawn")
+        range_cancel = CancellationToken.shared(mp_context)
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp_context,
+            initializer=_init_range_worker,
+            initargs=(worker_log_queue(mp_context), logging.root.level, range_cancel.event),
+        ) as executor:
+            futures = [
+                executor.submit(_check_pdf_range, file_path, filename, rule_classes, config, first, last)
+                for first, last in ranges
+            ]
+            # Digabung sesuai urutan rentang agar urutan isu sama dengan pemeriksaan satu proses
+            for (first, _), future in zip(ranges, futures):
+                while True:
+                    try:
+                        part, part_features = future.result(timeout=CANCEL_POLL_INTERVAL)
+                        break
+                    except CancelledError:
+                        part = part_features = None
+                        break
+                    except FutureTimeout:
+                        if cancel is not None and cancel.cancelled and not range_cancel.cancelled:
+                            range_cancel.cancel()
+                            # Rentang yang belum dimulai tidak perlu dijalankan
+                            for pending in futures:
+                                pending.cancel()
+                if ctx.cancelled:
+                    continue
+                if part is None:
+                    ctx.mark_cancelled(page=first + 1)
+                    continue
+                ctx.collector.merge(part)
+                ctx.success = ctx.success and part.success
+                if features is not None and part_features is not None:
+                    features.extend(part_features)
+                if part.status == STATUS_CANCELLED:
+                    # Catatan pembatalan (dengan nomor halaman) sudah ikut tergabung dari rentang ini
+                    ctx.cancelled = True
+                    if part_features is not None:
+                        ctx.cancelled_page = first + len(part_features.page_number) + 1
+                    ctx.success = False
+                    range_cancel.cancel()
+        return features
+
+    @staticmethod
+    def _walk_pdf(doc, rule_set: RuleSet, ctx: CheckContext, pages: range = None,
+                  cancel: CancellationToken = None):
+        """
+        Single pass over the PDF pages (all, or the given 0-based range) and text spans.
+        Stops before the next page once ``cancel`` is set (``ctx.cancelled``).
+        """
+        visit_page = rule_set.dispatch(NODE_PAGE)
+        visit_span = rule_set.dispatch(NODE_SPAN)
+        if not (visit_page or visit_span):
+            return
+
+        for page_num in (pages if pages is not None else range(doc.page_count)):
+            page_number = page_num + 1
+            if cancel is not None and cancel.cancelled:
+                ctx.mark_cancelled(page=page_number)
+                return
+            page = doc.load_page(page_num)
+
+            if visit_page:
+                rect = page.rect
+                page_node = PageNode(page_number, rect.width, rect.height)
+                for visit in visit_page:
+                    visit(page_node, ctx)
+
+            # Text extraction is the expensive part, skip it when no rule needs spans
+            if not visit_span:
+                continue
+            blocks = page.get_text("dict")["blocks"]
+            for block in blocks:
+                if block.get('type', -1) != 0:  # Text only
+                    continue
+                for line in block.get('lines', []):
+                    for span in line.get('spans', []):
+                        span_node = SpanNode(
+                            page_number,
+                            span.get('text', ''),
+                            span.get('font', 'Unknown'),
+                            span.get('size', 0),
+                            span.get('bbox', (0.0, 0.0, 0.0, 0.0)),
+                        )
+                        for visit in visit_span:
+                            visit(span_node, ctx)
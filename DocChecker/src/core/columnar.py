@@ -0,0 +1,184 @@
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.features import DocumentFeatures
+from core.rules import Rule, CheckContext
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np  # Opsional; tanpa NumPy aturan dievaluasi per node (replay)
+except ImportError:
+    np = None
+
+
+def available() -> bool:
+    return np is not None
+
+
+def supports(rules: Sequence[Rule]) -> bool:
+    """True if NumPy is installed and every rule defines ``evaluate_columns``."""
+    return np is not None and all(rule.evaluate_columns is not None for rule in rules)
+
+
+class FeatureColumns:
+    """
+    NumPy views over the ``array`` columns of ``DocumentFeatures``.
+
+    The views share memory with the feature arrays. Every node also gets a
+    sequence number: its position in the traversal order (runs of a
+    paragraph, then the paragraph; a page, then its spans), so vectorized
+    findings can be reported in the same order as a per-node evaluation.
+    ``complete`` is False for a partially extracted (cancelled) document.
+    """
+
+    def __init__(self, features: DocumentFeatures, complete: bool = True):
+        self.features = features
+        self.complete = complete
+        self.fonts = features.fonts
+
+        self.run_para = self._ints(features.run_para)
+        self.run_font = self._ints(features.run_font)
+        self.run_size = self._floats(features.run_size)
+        self.para_index = self._ints(features.para_index)
+        self.para_spacing = self._floats(features.para_spacing)
+        self.section_margins = self._floats(features.section_margins).reshape(-1, 4)
+        self.page_number = self._ints(features.page_number)
+        self.page_size = self._floats(features.page_size).reshape(-1, 2)
+        self.span_page = self._ints(features.span_page)
+        self.span_font = self._ints(features.span_font)
+        self.span_size = self._floats(features.span_size)
+        self.span_bbox = self._floats(features.span_bbox).reshape(-1, 4)
+
+        runs, paragraphs = len(self.run_para), len(self.para_index)
+        self.run_seq = np.arange(runs) + self.run_para
+        self.para_seq = np.searchsorted(self.run_para, np.arange(paragraphs), side="right") + np.arange(paragraphs)
+        self.section_seq = runs + paragraphs + np.arange(len(self.section_margins))
+        spans_before = np.searchsorted(self.span_page, self.page_number, side="left")
+        self.page_seq = np.arange(len(self.page_number)) + spans_before
+        self.span_seq = np.arange(len(self.span_page)) + np.searchsorted(self.page_number, self.span_page) + 1
+        self.end_seq = runs + paragraphs + len(self.section_margins) + len(self.page_number) + len(self.span_page)
+
+    @staticmethod
+    def _ints(values):
+        return np.frombuffer(values, dtype=np.intc) if len(values) else np.zeros(0, dtype=np.intc)
+
+    @staticmethod
+    def _floats(values):
+        return np.frombuffer(values, dtype=np.float64) if len(values) else np.zeros(0, dtype=np.float64)
+
+    def font_lookup(self, predicate: Callable[[Optional[str]], bool]):
+        """
+        Evaluate ``predicate`` once per distinct font. The returned boolean
+        array is indexed by font id; id -1 (no font name) maps to the last entry.
+        """
+        return np.array([predicate(font) for font in self.fonts] + [predicate(None)], dtype=bool)
+
+    @staticmethod
+    def rows(mask):
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def first_rows(rows, *keys):
+        """The first of ``rows`` for each distinct combination of ``keys`` (aligned with rows), in row order."""
+        if not len(rows) or not keys:
+            return rows
+        stacked = np.stack([np.asarray(key, dtype=np.int64) for key in keys], axis=1)
+        _, first = np.unique(stacked, axis=0, return_index=True)
+        return rows[np.sort(first)]
+
+    @staticmethod
+    def value_ids(values, key: Callable[[float], Any]):
+        """Ids of ``key(value)`` for ``values`` (for grouping); ``key`` is called once per distinct value."""
+        if not len(values):
+            return np.zeros(0, dtype=np.int64)
+        distinct, inverse = np.unique(values, return_inverse=True)
+        ids: Dict[Any, int] = {}
+        lookup = np.array([ids.setdefault(key(value), len(ids)) for value in distinct.tolist()], dtype=np.int64)
+        return lookup[inverse.reshape(-1)]
+
+    def dominant_size(self) -> Optional[float]:
+        """
+        Most used font size (0.1 pt) of the document, or None without sizes;
+        ties go to the smaller size.
+
+        Spans are weighted by their number of characters. DOCX runs with a
+        direct size count once each (run text is not part of the features);
+        runs that inherit their size from a style are not counted.
+        """
+        run_sizes = self.run_size[self.run_size == self.run_size]
+        sizes = np.concatenate((self.span_size, run_sizes))
+        if not len(sizes):
+            return None
+        weights = np.concatenate((
+            np.fromiter(map(len, self.features.span_text), dtype=np.float64, count=len(self.span_size)),
+            np.ones(len(run_sizes)),
+        ))
+        keys: Dict[float, int] = {}
+        distinct, inverse = np.unique(sizes, return_inverse=True)
+        lookup = np.array([keys.setdefault(round(size, 1), len(keys)) for size in distinct.tolist()], dtype=np.int64)
+        totals = np.bincount(lookup[inverse.reshape(-1)], weights=weights)
+        return list(keys)[int(totals.argmax())]
+
+    @staticmethod
+    def text_ids(texts: List[str], rows, length: int):
+        """Ids of the ``length``-character prefixes of ``texts`` at ``rows`` (for grouping)."""
+        ids: Dict[str, int] = {}
+        return np.array([ids.setdefault(texts[row][:length], len(ids)) for row in rows.tolist()], dtype=np.int64)
+
+
+class ColumnarReport:
+    """Collects vectorized findings and replays them into a ``CheckContext`` in traversal order."""
+
+    def __init__(self):
+        self._issues: List[tuple] = []
+        self._rule_position = 0
+
+    def for_rule(self, position: int) -> "ColumnarReport":
+        self._rule_position = position
+        return self
+
+    def add(self, seq: int, code: str, page: int = -1, paragraph: int = -1,
+            found: Any = None, expected: Any = None, text: str = None, once_per: Any = None):
+        """
+        Queue a finding at traversal position ``seq``. Of the findings that
+        share a ``once_per`` key (across rules), only the first in traversal
+        order is reported.
+        """
+        self._issues.append((int(seq), self._rule_position, len(self._issues),
+                             code, int(page), int(paragraph), found, expected, text, once_per))
+
+    def flush(self, ctx: CheckContext):
+        seen = set()
+        # Urutan sama dengan evaluasi per node: posisi node, lalu urutan pendaftaran rule
+        for _, _, _, code, page, paragraph, found, expected, text, once_per in sorted(self._issues):
+            if once_per is not None:
+                if once_per in seen:
+                    continue
+                seen.add(once_per)
+            ctx.report(code, page, paragraph, found, expected, text)
+        self._issues = []
+
+
+def dominant_font_size(features: DocumentFeatures) -> Optional[float]:
+    """``FeatureColumns.dominant_size`` of ``features``; counted in Python when NumPy is missing."""
+    if np is not None:
+        return FeatureColumns(features).dominant_size()
+    totals: Counter = Counter()
+    for text, size in zip(features.span_text, features.span_size):
+        totals[round(size, 1)] += len(text)
+    for size in features.run_size:
+        if size == size:
+            totals[round(size, 1)] += 1
+    # Sama seperti versi NumPy: bila seri, ukuran terkecil
+    return max(sorted(totals), key=totals.__getitem__) if totals else None
+
+
+def evaluate(features: DocumentFeatures, rules: Sequence[Rule], ctx: CheckContext, complete: bool = True):
+    """Evaluate rules that implement ``evaluate_columns`` on the whole feature table at once."""
+    columns = FeatureColumns(features, complete)
+    report = ColumnarReport()
+    for position, rule in enumerate(rules):
+        rule.evaluate_columns(columns, report.for_rule(position))
+    report.flush(ctx)
@@ -0,0 +1,211 @@
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil  # Opsional; tanpa psutil dipakai /proc (Linux) atau os.getloadavg
+except ImportError:
+    psutil = None
+
+_MB = 1024 * 1024
+
+
+def cpu_count() -> int:
+    """CPUs usable by this process (respects affinity masks where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        try:
+            return max(1, len(os.sched_getaffinity(0)))
+        except OSError:
+            pass
+    return os.cpu_count() or 1
+
+
+def available_memory_mb() -> Optional[int]:
+    """Physical memory currently available to new processes, or None if unknown."""
+    if psutil is not None:
+        return psutil.virtual_memory().available // _MB
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // _MB
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def process_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB, or None if it cannot be read."""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / _MB
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / _MB
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _CpuSampler:
+    """System-wide CPU utilization (0-100) between consecutive ``sample`` calls."""
+
+    def __init__(self):
+        self._last = self._read_proc_stat()
+        if psutil is not None:
+            psutil.cpu_percent(None)  # Panggilan pertama hanya menyetel titik acuan
+
+    @staticmethod
+    def _read_proc_stat():
+        try:
+            with open("/proc/stat") as f:
+                fields = [int(value) for value in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+        return sum(fields), idle
+
+    def sample(self) -> Optional[float]:
+        if psutil is not None:
+            return psutil.cpu_percent(None)
+        current = self._read_proc_stat()
+        if current is not None and self._last is not None:
+            total = current[0] - self._last[0]
+            idle = current[1] - self._last[1]
+            self._last = current
+            return 100.0 * (total - idle) / total if total > 0 else None
+        if hasattr(os, "getloadavg"):
+            return min(100.0, 100.0 * os.getloadavg()[0] / cpu_count())
+        return None
+
+
+class ConcurrencyController:
+    """
+    Adjusts the number of in-flight checks during a batch.
+
+    Every ``interval`` seconds the controller compares throughput with the
+    previous interval and climbs one worker at a time while throughput keeps
+    improving and the CPU is not saturated; when an added worker does not pay
+    off it steps back. The limit never exceeds ``memory_budget_mb`` divided
+    by the largest worker RSS seen.
+
+    Throughput is work done per second: the sum of the ``work`` passed to
+    ``file_done`` (the predicted cost of each finished file), not the file
+    count. The batch runs shortest jobs first, so files per second falls as
+    the files get bigger even when the extra workers do help.
+    """
+
+    def __init__(self, min_workers: int = 1, max_workers: int = None,
+                 memory_budget_mb: int = 0, interval: float = 2.0,
+                 cpu_high: float = 90.0):
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers or cpu_count())
+        if memory_budget_mb <= 0:
+            # Otomatis: separuh memori yang tersedia saat batch dimulai
+            available = available_memory_mb()
+            memory_budget_mb = available // 2 if available else 0
+        self.memory_budget_mb = memory_budget_mb
+        self.interval = interval
+        self.cpu_high = cpu_high
+
+        self.limit = max(self.min_workers, min(self.max_workers, cpu_count() // 2))
+        self.cpu_percent: Optional[float] = None
+        self.rss_mb = 0.0          # Total RSS worker pada sampel terakhir
+        self.peak_worker_rss_mb = 0.0
+        self.throughput = 0.0
+
+        self._cpu = _CpuSampler()
+        self._window_start = time.monotonic()
+        self._window_work = 0.0
+        self._previous_throughput: Optional[float] = None
+        self._last_step = 0  # +1 naik, -1 turun, 0 belum berubah
+
+    @classmethod
+    def from_settings(cls, settings, jobs: int = None) -> "ConcurrencyController":
+        """Controller configured from ``batch/*`` settings; ``jobs`` caps the workers at the batch size."""
+        max_workers = settings.value("batch/max_workers", 0, type=int) or cpu_count()
+        if jobs:
+            max_workers = min(max_workers, jobs)
+        return cls(
+            min_workers=settings.value("batch/min_workers", 1, type=int),
+            max_workers=max_workers,
+            memory_budget_mb=settings.value("batch/memory_budget_mb", 0, type=int),
+        )
+
+    def memory_cap(self) -> int:
+        """Largest worker count that fits the memory budget at the peak RSS observed so far."""
+        if not self.memory_budget_mb or self.peak_worker_rss_mb <= 0:
+            return self.max_workers
+        return max(self.min_workers, int(self.memory_budget_mb // self.peak_worker_rss_mb))
+
+    def file_done(self, work: float = 1.0):
+        """Count a finished file with its estimated ``work`` (e.g. ``CostEstimate.cost``)."""
+        self._window_work += work
+
+    def sample_memory(self, worker_pids: Iterable[int]):
+        total = 0.0
+        for pid in worker_pids:
+            rss = process_rss_mb(pid)
+            if rss is None:
+                continue
+            total += rss
+            self.peak_worker_rss_mb = max(self.peak_worker_rss_mb, rss)
+        self.rss_mb = total
+
+    def update(self, worker_pids: Iterable[int] = ()) -> int:
+        """Take a sample if the interval has elapsed and return the current limit."""
+        self.sample_memory(worker_pids)
+
+        # Batas memori berlaku segera, tanpa menunggu interval
+        memory_cap = self.memory_cap()
+        if self.limit > memory_cap:
+            logger.info(f"Batas worker diturunkan ke {memory_cap} (RSS puncak {self.peak_worker_rss_mb:.0f} MB, anggaran {self.memory_budget_mb} MB).")
+            self.limit = memory_cap
+            self._last_step = -1
+
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.interval:
+            return self.limit
+
+        self.throughput = self._window_work / elapsed
+        self.cpu_percent = self._cpu.sample()
+        self._window_start = now
+        self._window_work = 0.0
+        previous, self._previous_throughput = self._previous_throughput, self.throughput
+
+        cpu_saturated = self.cpu_percent is not None and self.cpu_percent >= self.cpu_high
+        improved = previous is None or self.throughput >= previous * 1.05
+        step = 0
+        if self._last_step > 0 and not improved:
+            step = -1  # Worker tambahan tidak menaikkan throughput
+        elif cpu_saturated or self._last_step < 0:
+            step = 0   # Tahan satu interval setelah turun atau saat CPU penuh
+        elif self.limit < min(self.max_workers, memory_cap):
+            step = 1
+
+        new_limit = max(self.min_workers, min(self.limit + step, self.max_workers, memory_cap))
+        if new_limit != self.limit:
+            logger.debug("Batas worker %d -> %d (throughput %.2f unit kerja/s, CPU %s%%, RSS %.0f MB)",
+                         self.limit, new_limit, self.throughput, self.cpu_percent, self.rss_mb)
+        self._last_step = new_limit - self.limit
+        self.limit = new_limit
+        return self.limit
+
+    def status(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "max_workers": min(self.max_workers, self.memory_cap()),
+            "cpu_percent": self.cpu_percent if self.cpu_percent is not None else -1.0,
+            "rss_mb": self.rss_mb,
+            "memory_budget_mb": self.memory_budget_mb,
+            "throughput": self.throughput,
+        }
@@ -0,0 +1,359 @@
+import hashlib
+import logging
+import math
+import os
+import pickle
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from core import metrics
+from core.cancellation import CancellationToken
+from core.rules import (
+    Rule, RuleSet, CheckContext,
+    ParagraphNode, RunNode, SectionNode, PageNode, SpanNode,
+    NODE_KINDS, NODE_RUN, NODE_PARAGRAPH, NODE_SECTION, NODE_PAGE, NODE_SPAN,
+)
+
+logger = logging.getLogger(__name__)
+
+# Naikkan bila isi fitur atau cara ekstraksinya berubah; entri cache lama diabaikan
+FEATURES_VERSION = 1
+
+_NONE = math.nan  # Nilai None pada kolom float
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+def default_cache_dir() -> str:
+    """Per-user cache folder; independent of Qt so worker processes resolve the same path."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "MDC-2025", "features")
+
+
+class DocumentFeatures:
+    """
+    Rule-independent content of one document, stored column-wise.
+
+    Holds every node the traversal produces (DOCX paragraphs, runs with
+    their effective font, sections; PDF pages and spans) in ``array``
+    columns plus one shared string table for font names. ``replay`` feeds
+    the nodes to a rule set in the original traversal order, so a changed
+    rule configuration is evaluated without parsing the file again.
+    """
+    __slots__ = (
+        "file_type", "fonts", "_font_ids",
+        "para_index", "para_text", "para_spacing",
+        "run_para", "run_font", "run_size",
+        "section_margins",
+        "page_number", "page_size",
+        "span_page", "span_text", "span_font", "span_size", "span_bbox",
+    )
+
+    def __init__(self, file_type: str):
+        self.file_type = file_type
+        self.fonts: List[str] = []
+        self._font_ids: Dict[str, int] = {}
+        # DOCX
+        self.para_index = array("i")
+        self.para_text: List[str] = []
+        self.para_spacing = array("d")
+        self.run_para = array("i")  # Urutan paragraf (posisi di para_index) pemilik run
+        self.run_font = array("i")
+        self.run_size = array("d")
+        self.section_margins = array("d")  # kiri, kanan, atas, bawah per section
+        # PDF
+        self.page_number = array("i")
+        self.page_size = array("d")  # lebar, tinggi per halaman
+        self.span_page = array("i")
+        self.span_text: List[str] = []
+        self.span_font = array("i")
+        self.span_size = array("d")
+        self.span_bbox = array("d")  # x0, y0, x1, y1 per span
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "_font_ids"}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._font_ids = {font: font_id for font_id, font in enumerate(self.fonts)}
+
+    def font_id(self, font: Optional[str]) -> int:
+        if font is None:
+            return -1
+        font_id = self._font_ids.get(font)
+        if font_id is None:
+            font_id = self._font_ids[font] = len(self.fonts)
+            self.fonts.append(sys.intern(font))
+        return font_id
+
+    def font(self, font_id: int) -> Optional[str]:
+        return self.fonts[font_id] if font_id >= 0 else None
+
+    def extend(self, other: "DocumentFeatures"):
+        """Append the nodes of another part of the same document (e.g. a PDF page range)."""
+        paragraph_offset = len(self.para_index)
+        remap = [self.font_id(font) for font in other.fonts]
+        self.para_index.extend(other.para_index)
+        self.para_text.extend(other.para_text)
+        self.para_spacing.extend(other.para_spacing)
+        self.run_para.extend(ordinal + paragraph_offset for ordinal in other.run_para)
+        self.run_font.extend(remap[font_id] if font_id >= 0 else -1 for font_id in other.run_font)
+        self.run_size.extend(other.run_size)
+        self.section_margins.extend(other.section_margins)
+        self.page_number.extend(other.page_number)
+        self.page_size.extend(other.page_size)
+        self.span_page.extend(other.span_page)
+        self.span_text.extend(other.span_text)
+        self.span_font.extend(remap[font_id] if font_id >= 0 else -1 for font_id in other.span_font)
+        self.span_size.extend(other.span_size)
+        self.span_bbox.extend(other.span_bbox)
+
+    def replay(self, rule_set: RuleSet, ctx: CheckContext, cancel: CancellationToken = None):
+        """Dispatch the stored nodes to the rules; stops like the traversal once ``cancel`` is set."""
+        if self.file_type == "docx":
+            self._replay_docx(rule_set, ctx, cancel)
+        else:
+            self._replay_pdf(rule_set, ctx, cancel)
+
+    def _replay_docx(self, rule_set: RuleSet, ctx: CheckContext, cancel: CancellationToken):
+        visit_run = rule_set.dispatch(NODE_RUN)
+        visit_paragraph = rule_set.dispatch(NODE_PARAGRAPH)
+        visit_section = rule_set.dispatch(NODE_SECTION)
+
+        if visit_run or visit_paragraph:
+            run, run_count = 0, len(self.run_para)
+            for ordinal, para_idx in enumerate(self.para_index):
+                if cancel is not None and cancel.cancelled:
+                    ctx.mark_cancelled()
+                    return
+                para_node = ParagraphNode(para_idx, self.para_text[ordinal], _optional(self.para_spacing[ordinal]))
+                if visit_run:
+                    while run < run_count and self.run_para[run] == ordinal:
+                        run_node = RunNode(para_node, self.font(self.run_font[run]), _optional(self.run_size[run]))
+                        for visit in visit_run:
+                            visit(run_node, ctx)
+                        run += 1
+                for visit in visit_paragraph:
+                    visit(para_node, ctx)
+
+        if visit_section:
+            margins = self.section_margins
+            for section_idx in range(len(margins) // 4):
+                if cancel is not None and cancel.cancelled:
+                    ctx.mark_cancelled()
+                    return
+                offset = section_idx * 4
+                section_node = SectionNode(section_idx, *margins[offset:offset + 4])
+                for visit in visit_section:
+                    visit(section_node, ctx)
+
+    def _replay_pdf(self, rule_set: RuleSet, ctx: CheckContext, cancel: CancellationToken):
+        visit_page = rule_set.dispatch(NODE_PAGE)
+        visit_span = rule_set.dispatch(NODE_SPAN)
+        if not (visit_page or visit_span):
+            return
+
+        span, span_count = 0, len(self.span_page)
+        for ordinal, page_number in enumerate(self.page_number):
+            if cancel is not None and cancel.cancelled:
+                ctx.mark_cancelled(page=page_number)
+                return
+            if visit_page:
+                page_node = PageNode(page_number, self.page_size[ordinal * 2], self.page_size[ordinal * 2 + 1])
+                for visit in visit_page:
+                    visit(page_node, ctx)
+            while span < span_count and self.span_page[span] == page_number:
+                if visit_span:
+                    offset = span * 4
+                    span_node = SpanNode(
+                        page_number,
+                        self.span_text[span],
+                        self.fonts[self.span_font[span]],
+                        self.span_size[span],
+                        tuple(self.span_bbox[offset:offset + 4]),
+                    )
+                    for visit in visit_span:
+                        visit(span_node, ctx)
+                span += 1
+
+
+class FeatureRecorder(Rule):
+    """
+    Pseudo-rule that records every visited node into ``DocumentFeatures``.
+
+    Added to the rule set while a document is parsed, so the features come
+    from the same single traversal that evaluates the real rules. It is not
+    registered and never reports anything.
+    """
+    code = "_feature_recorder"
+    node_kinds = NODE_KINDS
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.features: Optional[DocumentFeatures] = None
+
+    def start(self, ctx: CheckContext):
+        self.features = DocumentFeatures(ctx.file_type)
+
+    def visit_run(self, node: RunNode, ctx: CheckContext):
+        features = self.features
+        # Run dikunjungi sebelum paragrafnya, jadi urutan paragraf = jumlah paragraf yang sudah dicatat
+        features.run_para.append(len(features.para_index))
+        features.run_font.append(features.font_id(node.font_name))
+        features.run_size.append(_NONE if node.size is None else node.size)
+
+    def visit_paragraph(self, node: ParagraphNode, ctx: CheckContext):
+        features = self.features
+        features.para_index.append(node.index)
+        features.para_text.append(node.text)
+        features.para_spacing.append(_NONE if node.line_spacing is None else node.line_spacing)
+
+    def visit_section(self, node: SectionNode, ctx: CheckContext):
+        self.features.section_margins.extend((node.left, node.right, node.top, node.bottom))
+
+    def visit_page(self, node: PageNode, ctx: CheckContext):
+        self.features.page_number.append(node.number)
+        self.features.page_size.extend((node.width, node.height))
+
+    def visit_span(self, node: SpanNode, ctx: CheckContext):
+        features = self.features
+        features.span_page.append(node.page)
+        features.span_text.append(node.text)
+        features.span_font.append(features.font_id(node.font_name))
+        features.span_size.append(node.size)
+        features.span_bbox.extend(node.bbox)
+
+
+def with_recorder(rule_set: RuleSet) -> Tuple[RuleSet, FeatureRecorder]:
+    """Copy of ``rule_set`` that additionally records the document features."""
+    config = rule_set.rules[0].config if rule_set.rules else {}
+    recorder = FeatureRecorder(config)
+    return RuleSet(rule_set.rules + [recorder]), recorder
+
+
+class FeatureCache:
+    """
+    On-disk cache of ``DocumentFeatures`` keyed by file path, size and
+    modification time.
+
+    Entries are zlib-compressed pickles named after a hash of the path; a
+    changed file (size or mtime) or a new ``FEATURES_VERSION`` is simply a
+    miss. Writes go through a temporary file and ``os.replace`` so parallel
+    worker processes never read a partial entry.
+
+    Entries hold the full paragraph and span text of every checked document,
+    so the cache is opt-in (``cache/enabled``).
+    """
+
+    def __init__(self, directory: str = None, max_mb: int = 512):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max(0, max_mb) * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["FeatureCache"]:
+        """Cache configured in settings, or None when caching is disabled (the default)."""
+        if not settings.value("cache/enabled", False, type=bool):
+            return None
+        return cls(settings.value("cache/dir", "") or None, settings.value("cache/max_mb", 512, type=int))
+
+    def _entry_path(self, path: str) -> str:
+        key = os.path.normcase(os.path.abspath(path)).encode("utf-8", "surrogatepass")
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest() + ".feat")
+
+    @staticmethod
+    def _signature(path: str, stat: os.stat_result):
+        return (FEATURES_VERSION, os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    def load(self, path: str, stat: os.stat_result) -> Optional[DocumentFeatures]:
+        try:
+            with open(self._entry_path(path), "rb") as f:
+                signature, features = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            self._miss()
+            return None
+        except Exception as e:
+            logger.warning(f"Entri cache fitur untuk {path} rusak, diabaikan: {e}")
+            self._miss()
+            return None
+        if signature != self._signature(path, stat):
+            self._miss()
+            return None
+        self.hits += 1
+        metrics.CACHE_HITS.inc()
+        logger.debug("Fitur %s dibaca dari cache.", path)
+        return features
+
+    def _miss(self):
+        self.misses += 1
+        metrics.CACHE_MISSES.inc()
+
+    def store(self, path: str, stat: os.stat_result, features: DocumentFeatures):
+        entry_path = self._entry_path(path)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            data = zlib.compress(pickle.dumps((self._signature(path, stat), features), pickle.HIGHEST_PROTOCOL), 1)
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            logger.warning(f"Gagal menyimpan cache fitur untuk {path}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as iterator:
+                return [entry for entry in iterator if entry.name.endswith(".feat")]
+        except OSError:
+            return []
+
+    def prune(self):
+        """Delete the least recently written entries until the cache fits ``max_mb``."""
+        if not self.max_bytes:
+            return
+        entries = []
+        total = 0
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        logger.info(f"Cache fitur dipangkas: {removed} entri dihapus, sisa {total / (1024 * 1024):.1f} MB.")
+
+    def clear(self):
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        logger.info("Cache fitur dikosongkan.")
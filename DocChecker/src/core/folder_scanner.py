@@ -0,0 +1,175 @@
+import fnmatch
+import logging
+import os
+import time
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from core.cancellation import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTENSIONS = (".docx", ".pdf")
+# Berkas kunci Word (~$nama.docx) serta berkas/folder tersembunyi
+DEFAULT_EXCLUDE = "~$*;.*"
+
+
+def split_patterns(text: Union[str, Sequence[str], None]) -> List[str]:
+    """Parse a ``;``/``,`` separated pattern list (as stored in settings)."""
+    if not text:
+        return []
+    if not isinstance(text, str):
+        text = ";".join(text)
+    return [pattern.strip() for pattern in text.replace(",", ";").split(";") if pattern.strip()]
+
+
+class FolderScanner:
+    """
+    Recursive document discovery for dropped or selected folders.
+
+    Directories are read with ``os.scandir`` (one system call per directory
+    on POSIX; file types come from the directory entry). Files are filtered
+    by extension, optional ``include`` globs and ``exclude`` globs, and
+    de-duplicated by (device, inode), falling back to the real path where the
+    file system has no inode numbers. Patterns without a slash match the
+    entry name, patterns with a slash match the path relative to the scanned
+    folder; excluded folders are not descended into.
+
+    ``scan`` yields the files in chunks so callers can show them while a
+    large tree is still being read.
+    """
+
+    def __init__(self, extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+                 include: Iterable[str] = (), exclude: Iterable[str] = None,
+                 follow_symlinks: bool = False, chunk_size: int = 500, chunk_interval: float = 0.25):
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.include = list(include)
+        self.exclude = list(exclude) if exclude is not None else split_patterns(DEFAULT_EXCLUDE)
+        self.follow_symlinks = follow_symlinks
+        self.chunk_size = max(1, chunk_size)
+        # Kirim chunk lebih awal bila folder lambat dibaca (mis. drive jaringan)
+        self.chunk_interval = chunk_interval
+        self.files_found = 0
+        self.directories_scanned = 0
+        self.duplicates = 0
+        self.errors = 0
+        self._seen = set()
+
+    @classmethod
+    def from_settings(cls, settings) -> "FolderScanner":
+        return cls(
+            include=split_patterns(settings.value("scan/include_patterns", "")),
+            exclude=split_patterns(settings.value("scan/exclude_patterns", DEFAULT_EXCLUDE)),
+            follow_symlinks=settings.value("scan/follow_symlinks", False, type=bool),
+        )
+
+    def _matches(self, patterns: List[str], name: str, relpath: str) -> bool:
+        for pattern in patterns:
+            if fnmatch.fnmatch(relpath if "/" in pattern else name, pattern):
+                return True
+        return False
+
+    def _accept_file(self, name: str, relpath: str) -> bool:
+        if not name.lower().endswith(self.extensions):
+            return False
+        if self._matches(self.exclude, name, relpath):
+            return False
+        return not self.include or self._matches(self.include, name, relpath)
+
+    def _is_new(self, key) -> bool:
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(key)
+        return True
+
+    @staticmethod
+    def _path_key(path: str, stat: Optional[os.stat_result] = None):
+        try:
+            stat = stat or os.stat(path)
+        except OSError:
+            stat = None
+        if stat is not None and stat.st_ino:
+            return (stat.st_dev, stat.st_ino)
+        return os.path.normcase(os.path.realpath(path))
+
+    def _entry_key(self, entry: os.DirEntry, device: int):
+        # Entri biasa: inode dari direktori (tanpa stat); symlink: identitas target
+        try:
+            if not entry.is_symlink():
+                inode = entry.inode()
+                if inode:
+                    return (device, inode)
+        except OSError:
+            pass
+        return self._path_key(entry.path)
+
+    def _emit(self, chunk: List[str]) -> List[str]:
+        self.files_found += len(chunk)
+        return chunk
+
+    def scan(self, paths: Iterable[str], cancel: CancellationToken = None) -> Iterator[List[str]]:
+        """Yield lists of document paths found under ``paths`` (files or folders)."""
+        chunk: List[str] = []
+        last_yield = time.monotonic()
+        # Tumpukan (folder, folder akar, device); dibaca depth-first dengan urutan nama
+        stack: List[Tuple[str, str, int]] = []
+
+        for path in reversed(list(paths)):
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                key = self._path_key(path)
+                if self._is_new(key):
+                    stack.append((path, path, key[0] if isinstance(key, tuple) else 0))
+            elif self._accept_file(os.path.basename(path), os.path.basename(path)):
+                if self._is_new(self._path_key(path)):
+                    chunk.append(path)
+
+        while stack:
+            if cancel is not None and cancel.cancelled:
+                logger.info("Pemindaian folder dibatalkan.")
+                break
+            directory, root, device = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError as e:
+                self.errors += 1
+                logger.warning(f"Folder tidak dapat dibaca: {directory} ({e})")
+                continue
+            self.directories_scanned += 1
+
+            subdirectories = []
+            for entry in entries:
+                relpath = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                try:
+                    if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                        if self._matches(self.exclude, entry.name, relpath):
+                            continue
+                        # Folder dicatat berdasarkan identitasnya agar symlink melingkar tidak dipindai ulang
+                        key = self._path_key(entry.path, entry.stat(follow_symlinks=True))
+                        if self._is_new(key):
+                            subdirectories.append((entry.path, root, key[0] if isinstance(key, tuple) else device))
+                        continue
+                    if not entry.is_file(follow_symlinks=self.follow_symlinks):
+                        continue
+                except OSError:
+                    self.errors += 1
+                    continue
+                if self._accept_file(entry.name, relpath) and self._is_new(self._entry_key(entry, device)):
+                    chunk.append(entry.path)
+
+            stack.extend(reversed(subdirectories))
+
+            while len(chunk) >= self.chunk_size:
+                yield self._emit(chunk[:self.chunk_size])
+                chunk = chunk[self.chunk_size:]
+                last_yield = time.monotonic()
+            if chunk and time.monotonic() - last_yield >= self.chunk_interval:
+                yield self._emit(chunk)
+                chunk = []
+                last_yield = time.monotonic()
+
+        if chunk:
+            yield self._emit(chunk)
+        logger.info(f"Pemindaian folder selesai: {self.files_found} berkas di {self.directories_scanned} folder, "
+                    f"{self.duplicates} duplikat dilewati.")
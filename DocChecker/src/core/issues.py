@@ -0,0 +1,303 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Jenis kode isu
+KIND_VIOLATION = "violation"  # Pelanggaran aturan, membuat dokumen gagal
+KIND_NOTE = "note"            # Informasi saja, tidak mempengaruhi status
+KIND_ERROR = "error"          # Dokumen tidak dapat diperiksa
+
+# Kode isu bawaan
+ISSUE_FONT = "font"
+ISSUE_SIZE = "size"
+ISSUE_SPACING = "spacing"
+ISSUE_MARGIN_LEFT = "margin_left"
+ISSUE_MARGIN_RIGHT = "margin_right"
+ISSUE_MARGIN_TOP = "margin_top"
+ISSUE_MARGIN_BOTTOM = "margin_bottom"
+ISSUE_MARGIN_UNCHECKED = "margin_unchecked"
+NOTE_PDF_MARGIN = "pdf_margin_note"
+ERROR_UNSUPPORTED = "unsupported_format"
+ERROR_CHECK = "check_error"
+ERROR_PDF_OPEN = "pdf_open_error"
+ERROR_TIMEOUT = "worker_timeout"
+ERROR_CRASHED = "worker_crashed"
+ERROR_MEMORY = "worker_memory_limit"
+NOTE_CANCELLED = "check_cancelled"
+NOTE_NOT_CHECKED = "check_not_started"
+
+# Status akhir pemeriksaan sebuah berkas
+STATUS_COMPLETED = "completed"        # Semua aturan dievaluasi (lulus atau gagal)
+STATUS_ERROR = "error"                # Berkas tidak dapat dibaca/diperiksa
+STATUS_TIMEOUT = "timeout"            # Worker dihentikan karena melebihi batas waktu
+STATUS_CRASHED = "crashed"            # Proses worker berhenti tidak normal
+STATUS_MEMORY_LIMIT = "memory_limit"  # Worker melebihi batas memori
+STATUS_CANCELLED = "cancelled"        # Dibatalkan di tengah dokumen; hanya sebagian yang dievaluasi
+
+MARGIN_ISSUES = {
+    ISSUE_MARGIN_LEFT: "left",
+    ISSUE_MARGIN_RIGHT: "right",
+    ISSUE_MARGIN_TOP: "top",
+    ISSUE_MARGIN_BOTTOM: "bottom",
+}
+
+NO_VALUE = -1
+
+# Tabel kode isu: indeks dipakai oleh IssueTable, metadata dipakai untuk kategori dan status
+_issue_codes: List[str] = []
+_issue_code_index: Dict[str, int] = {}
+_issue_kinds: Dict[str, str] = {}
+_issue_categories: Dict[str, Optional[str]] = {}
+
+
+def register_issue_code(code: str, category: str = None, kind: str = KIND_VIOLATION) -> int:
+    """
+    Register an issue code and return its compact index.
+
+    ``category`` is the legacy ``details`` key the issue is listed under
+    (e.g. ``"font_issues"``); codes without a category are only shown as messages.
+    """
+    code = sys.intern(code)
+    if code not in _issue_code_index:
+        _issue_code_index[code] = len(_issue_codes)
+        _issue_codes.append(code)
+    _issue_kinds[code] = kind
+    _issue_categories[code] = category
+    return _issue_code_index[code]
+
+
+def issue_kind(code: str) -> str:
+    return _issue_kinds.get(code, KIND_VIOLATION)
+
+
+def issue_category(code: str) -> Optional[str]:
+    return _issue_categories.get(code)
+
+
+register_issue_code(ISSUE_FONT, "font_issues")
+register_issue_code(ISSUE_SIZE, "size_issues")
+register_issue_code(ISSUE_SPACING, "spacing_issues")
+for _code in MARGIN_ISSUES:
+    register_issue_code(_code, "margin_issues")
+register_issue_code(ISSUE_MARGIN_UNCHECKED)
+register_issue_code(NOTE_PDF_MARGIN, kind=KIND_NOTE)
+register_issue_code(ERROR_UNSUPPORTED, kind=KIND_ERROR)
+register_issue_code(ERROR_CHECK, kind=KIND_ERROR)
+register_issue_code(ERROR_PDF_OPEN, kind=KIND_ERROR)
+register_issue_code(ERROR_TIMEOUT, kind=KIND_ERROR)
+register_issue_code(ERROR_CRASHED, kind=KIND_ERROR)
+register_issue_code(ERROR_MEMORY, kind=KIND_ERROR)
+register_issue_code(NOTE_CANCELLED, kind=KIND_NOTE)
+register_issue_code(NOTE_NOT_CHECKED, kind=KIND_NOTE)
+
+
+class Issue:
+    """
+    A single finding.
+
+    Location is stored as plain ints (-1 when not applicable); ``found``,
+    ``expected`` and ``snippet`` are ids into the owning result's value table.
+    """
+    __slots__ = ("code", "page", "paragraph", "found", "expected", "snippet")
+
+    def __init__(self, code: str, page: int = -1, paragraph: int = -1,
+                 found: int = NO_VALUE, expected: int = NO_VALUE, snippet: int = NO_VALUE):
+        self.code = code
+        self.page = page
+        self.paragraph = paragraph
+        self.found = found
+        self.expected = expected
+        self.snippet = snippet
+
+    def __getstate__(self):
+        return (self.code, self.page, self.paragraph, self.found, self.expected, self.snippet)
+
+    def __setstate__(self, state):
+        self.code, self.page, self.paragraph, self.found, self.expected, self.snippet = state
+
+    def __repr__(self):
+        return (f"Issue({self.code!r}, page={self.page}, paragraph={self.paragraph}, "
+                f"found={self.found}, expected={self.expected}, snippet={self.snippet})")
+
+
+class IssueTable:
+    """
+    Array-backed (struct-of-arrays) issue container.
+
+    Stores each issue in about 22 bytes instead of a separate object; ``Issue``
+    instances are only created while iterating.
+    """
+    __slots__ = ("codes", "pages", "paragraphs", "found", "expected", "snippets")
+
+    def __init__(self, issues: Iterable[Issue] = ()):
+        self.codes = array("H")
+        self.pages = array("i")
+        self.paragraphs = array("i")
+        self.found = array("i")
+        self.expected = array("i")
+        self.snippets = array("i")
+        self.extend(issues)
+
+    def append(self, issue: Issue):
+        code_index = _issue_code_index.get(issue.code)
+        if code_index is None:
+            code_index = register_issue_code(issue.code)
+        self.codes.append(code_index)
+        self.pages.append(issue.page)
+        self.paragraphs.append(issue.paragraph)
+        self.found.append(issue.found)
+        self.expected.append(issue.expected)
+        self.snippets.append(issue.snippet)
+
+    def extend(self, issues: Iterable[Issue]):
+        for issue in issues:
+            self.append(issue)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Issue:
+        return Issue(_issue_codes[self.codes[index]], self.pages[index], self.paragraphs[index],
+                     self.found[index], self.expected[index], self.snippets[index])
+
+    def __iter__(self) -> Iterator[Issue]:
+        codes = _issue_codes
+        for row in zip(self.codes, self.pages, self.paragraphs, self.found, self.expected, self.snippets):
+            yield Issue(codes[row[0]], *row[1:])
+
+
+class IssueCollector:
+    """
+    Builds the issue list and the de-duplicated value table for one document.
+
+    Equal values (font names, sizes, paragraph snippets) are stored once per
+    result; string values other than snippets are interned so that font names
+    are shared across every result of a batch.
+    """
+
+    def __init__(self):
+        self.issues: List[Issue] = []
+        self.values: List[Any] = []
+        self._value_ids: Dict[Tuple[type, Any], int] = {}
+
+    def value_id(self, value: Any, intern: bool = True) -> int:
+        if value is None:
+            return NO_VALUE
+        key = (value.__class__, value)
+        value_id = self._value_ids.get(key)
+        if value_id is None:
+            if intern and value.__class__ is str:
+                value = sys.intern(value)
+            value_id = len(self.values)
+            self.values.append(value)
+            self._value_ids[key] = value_id
+        return value_id
+
+    def add(self, code: str, page: int = -1, paragraph: int = -1,
+            found: Any = None, expected: Any = None, text: str = None) -> Issue:
+        issue = Issue(
+            code, page, paragraph,
+            self.value_id(found),
+            self.value_id(expected),
+            self.value_id(text, intern=False),
+        )
+        self.issues.append(issue)
+        return issue
+
+    def merge(self, result: "CheckResult"):
+        """Append the issues of another (partial) result, re-mapping its value ids."""
+        value = result.value
+        for issue in result.issues:
+            self.issues.append(Issue(
+                issue.code, issue.page, issue.paragraph,
+                self.value_id(value(issue.found)),
+                self.value_id(value(issue.expected)),
+                self.value_id(value(issue.snippet), intern=False),
+            ))
+
+
+class CheckResult:
+    """
+    Result of checking one document.
+
+    ``messages`` and ``details`` are derived from ``issues`` on demand and are
+    not stored. ``messages`` uses the default language; UI code renders through
+    ``LanguageManager.render_messages`` instead. ``status`` tells a regular
+    verdict (``STATUS_COMPLETED``) apart from files that could not be checked.
+    ``fingerprint`` identifies the rule profile the file was checked against
+    (``Profile.fingerprint``); a stored result is only valid for the same one.
+    """
+    __slots__ = ("filename", "success", "issues", "values", "status", "fingerprint")
+
+    def __init__(self, filename: str, success: bool,
+                 issues: Union[List[Issue], IssueTable] = None, values: List[Any] = None,
+                 status: str = STATUS_COMPLETED, fingerprint: str = ""):
+        self.filename = filename
+        self.success = success
+        self.issues = issues if issues is not None else []
+        self.values = values if values is not None else []
+        self.status = status
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_collector(cls, filename: str, collector: IssueCollector, success: bool = None,
+                       status: str = STATUS_COMPLETED) -> "CheckResult":
+        if success is None:
+            success = not any(issue_kind(issue.code) != KIND_NOTE for issue in collector.issues)
+        return cls(filename, success, collector.issues, collector.values, status)
+
+    @classmethod
+    def error(cls, filename: str, code: str, error: Any = None, status: str = STATUS_ERROR,
+              fingerprint: str = "") -> "CheckResult":
+        """Failed result with a single error issue, e.g. ``CheckResult.error(name, ERROR_CHECK, e)``."""
+        collector = IssueCollector()
+        collector.add(code, found=str(error) if error is not None else None)
+        return cls(filename, False, collector.issues, collector.values, status, fingerprint)
+
+    def value(self, value_id: int, default: Any = None) -> Any:
+        return self.values[value_id] if value_id >= 0 else default
+
+    def compact(self) -> "CheckResult":
+        """Move issues into an IssueTable (in place). Returns self."""
+        if not isinstance(self.issues, IssueTable):
+            self.issues = IssueTable(self.issues)
+        return self
+
+    def issue_counts(self) -> Dict[str, int]:
+        """Number of issues per legacy details category."""
+        counts: Dict[str, int] = {}
+        for issue in self.issues:
+            category = _issue_categories.get(issue.code)
+            if category:
+                counts[category] = counts.get(category, 0) + 1
+        return counts
+
+    @property
+    def messages(self) -> List[str]:
+        from core.messages import render_messages
+        return render_messages(self)
+
+    @property
+    def details(self) -> Dict[str, List[Dict[str, Any]]]:
+        details: Dict[str, List[Dict[str, Any]]] = {}
+        for issue in self.issues:
+            category = _issue_categories.get(issue.code)
+            if not category:
+                continue
+            entry: Dict[str, Any]
+            if issue.code in MARGIN_ISSUES:
+                entry = {"margin": MARGIN_ISSUES[issue.code]}
+            elif issue.paragraph >= 0:
+                entry = {"paragraph": issue.paragraph, "text": self.value(issue.snippet, "")}
+            elif issue.page >= 0:
+                entry = {"page": issue.page, "text": self.value(issue.snippet, "")}
+            else:
+                entry = {}
+            entry["found"] = self.value(issue.found)
+            entry["expected"] = self.value(issue.expected)
+            if issue.code == ISSUE_SIZE and issue.page >= 0:
+                # Format lama untuk PDF: ukuran sebagai teks "12.0pt"
+                entry["found"] = f"{entry['found']:.1f}pt"
+                entry["expected"] = f"{entry['expected']:.1f}pt"
+            details.setdefault(category, []).append(entry)
+        return details
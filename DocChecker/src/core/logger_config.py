@@ -1,34 +1,233 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from PySide6.QtCore import QSettings, QStandardPaths
 
+# Listener aktif; dihentikan dan diganti setiap kali setup_logging dipanggil ulang
+_listener = None
+_listener_lock = threading.Lock()
+# Listener yang meneruskan log dari proses worker ke handler proses ini
+_worker_forwarder = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limit DEBUG records per call site (logger + message template).
+
+    Each site may log ``burst`` records at once and then ``rate`` records per
+    second; the rest is dropped before formatting or queueing. The number of
+    dropped records is appended to the next record that gets through.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 50, max_sites: int = 10000):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.max_sites = max_sites
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                if len(self._sites) >= self.max_sites:
+                    self._sites.clear()
+                site = self._sites[key] = [float(self.burst), now, 0]
+            tokens = min(self.burst, site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            if tokens < 1.0:
+                site[0] = tokens
+                site[2] += 1
+                return False
+            site[0] = tokens - 1.0
+            suppressed, site[2] = site[2], 0
+        if suppressed:
+            record.sampled_out = suppressed
+        return True
+
+
+class _SuppressedCountFormatter(logging.Formatter):
+    """Plain-text formatter that mentions records dropped by sampling."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "sampled_out", 0)
+        if suppressed:
+            text += f" [{suppressed} pesan serupa diabaikan oleh sampling]"
+        return text
+
+
+class _SampledJsonFormatter(JsonFormatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "sampled_out", 0)
+        if suppressed:
+            text = text[:-1] + f', "sampled_out": {suppressed}}}'
+        return text
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    The stock handler formats every record in the calling thread; here only the
+    traceback is rendered eagerly (so frames are not kept alive) and the
+    message arguments are formatted by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _stop_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+class _ForwardHandler(logging.Handler):
+    """Re-emit records received from worker processes through the local logger tree."""
+
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)
+
+
+def worker_log_queue(mp_context):
+    """
+    Queue that worker processes log into (see ``configure_worker_logging``).
+
+    Records are forwarded to this process' handlers, so worker logs end up in
+    the same rotating file without two processes writing to it.
+    """
+    global _worker_forwarder
+    with _listener_lock:
+        if _worker_forwarder is None:
+            log_queue = mp_context.Queue()
+            _worker_forwarder = logging.handlers.QueueListener(log_queue, _ForwardHandler())
+            _worker_forwarder.start()
+        return _worker_forwarder.queue
+
+
+def configure_worker_logging(log_queue, level: int, sample_rate: float = 20.0):
+    """Logging setup for a worker process: everything goes to the parent's queue."""
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+    # QueueHandler standar memformat pesan di worker agar argumen tidak perlu di-pickle
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    if sample_rate > 0:
+        queue_handler.addFilter(SamplingFilter(rate=sample_rate))
+    logging.root.addHandler(queue_handler)
+    logging.root.setLevel(level)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background logging threads."""
+    global _worker_forwarder
+    with _listener_lock:
+        if _worker_forwarder is not None:
+            _worker_forwarder.stop()
+            _worker_forwarder = None
+    _stop_listener()
+
+
+atexit.register(shutdown_logging)
+
+
 def setup_logging(settings: QSettings):
     """Konfigurasi logging berdasarkan pengaturan."""
+    global _listener
     log_enabled = settings.value("developer/extensive_logging", False, type=bool)
-    
-    # Hapus handler yang ada untuk menghindari duplikasi jika fungsi ini dipanggil beberapa kali
+
+    # Hentikan listener lama dan hapus handler yang ada untuk menghindari duplikasi
+    _stop_listener()
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
+        handler.close()
+
+    text_format = '%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s'
+    log_file_path = None
 
     if log_enabled:
         log_level = logging.DEBUG
-        log_format = '%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s'
-        
+
         # Tentukan path untuk file log di direktori data aplikasi
         log_dir = QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
         if not os.path.exists(log_dir):
             os.makedirs(log_dir, exist_ok=True)
         log_file_path = os.path.join(log_dir, "mdc2025_debug.log")
 
-        logging.basicConfig(
-            level=log_level,
-            format=log_format,
-            handlers=[
-                logging.FileHandler(log_file_path, mode='a', encoding='utf-8'), # Menyimpan ke file
-                logging.StreamHandler()  # Juga output ke konsol
-            ]
+        max_bytes = settings.value("developer/log_max_bytes", 5 * 1024 * 1024, type=int)
+        backup_count = settings.value("developer/log_backup_count", 3, type=int)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file_path, mode='a', maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
         )
+        file_handler.setFormatter(_SampledJsonFormatter())
+
+        console_handler = logging.StreamHandler()  # Juga output ke konsol
+        console_handler.setFormatter(_SuppressedCountFormatter(text_format))
+        handlers = [file_handler, console_handler]
+    else:
+        log_level = logging.WARNING
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handlers = [console_handler]
+
+    # Semua penulisan dilakukan oleh thread listener; thread pemanggil hanya memasukkan record ke antrean
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    sample_rate = settings.value("developer/log_sample_rate", 20.0, type=float)
+    if sample_rate > 0:
+        queue_handler.addFilter(SamplingFilter(rate=sample_rate))
+
+    logging.root.setLevel(log_level)
+    logging.root.addHandler(queue_handler)
+
+    with _listener_lock:
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+    if log_enabled:
         logging.info(f"Logging ekstensif diaktifkan. Log disimpan di: {log_file_path}")
     else:
-        logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
-        logging.info("Logging ekstensif dinonaktifkan. Hanya warning dan error yang akan dicatat.") 
\ No newline at end of file
+        logging.info("Logging ekstensif dinonaktifkan. Hanya warning dan error yang akan dicatat.")
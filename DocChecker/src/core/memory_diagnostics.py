@@ -0,0 +1,199 @@
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from core.features import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Diagnostik memori aktif di proses ini; None = mati (measure tidak mengukur apa pun)
+_diagnostics: Optional["MemoryDiagnostics"] = None
+_lock = threading.Lock()
+
+
+def default_report_dir() -> str:
+    """Per-user folder for memory reports, next to the feature cache."""
+    return os.path.join(os.path.dirname(default_cache_dir()), "memory")
+
+
+def _format_size(size: float, signed: bool = True) -> str:
+    sign = "+" if signed else ""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:{sign}.0f} {unit}" if unit == "B" else f"{size:{sign}.1f} {unit}"
+        size /= 1024
+    return f"{size:{sign}.1f} GiB"
+
+
+class MemoryRecord:
+    """Memory attribution of one measured step (a check or a results render)."""
+    __slots__ = ("label", "kind", "retained", "peak", "growth", "sites", "flagged")
+
+    def __init__(self, label: str, kind: str, retained: int, peak: int, growth: int,
+                 sites: List[Tuple[str, int, int]], flagged: bool):
+        self.label = label
+        self.kind = kind
+        # Selisih memori tertelusur setelah gc, dibanding sebelum langkah
+        self.retained = retained
+        self.peak = peak
+        # Selisih terhadap baseline (pengukuran pertama di proses ini)
+        self.growth = growth
+        # (berkas:baris, selisih ukuran, selisih jumlah blok), terbesar dahulu
+        self.sites = sites
+        self.flagged = flagged
+
+    def format(self) -> str:
+        mark = " [NOT BACK TO BASELINE]" if self.flagged else ""
+        lines = [f"{self.kind} {self.label}: retained {_format_size(self.retained)}, "
+                 f"peak {_format_size(self.peak)}, since baseline {_format_size(self.growth)}{mark}"]
+        for site, size, count in self.sites:
+            lines.append(f"    {_format_size(size):>12} {count:+7d} blocks  {site}")
+        return "\n".join(lines)
+
+
+class MemoryDiagnostics:
+    """
+    Attributes Python memory to checks and renders with ``tracemalloc``.
+
+    ``measure`` takes a snapshot before and after (both after a full garbage
+    collection) and records the retained-size delta, the peak during the step
+    and the top ``top`` allocation sites by size delta. A step is flagged when
+    it retains more than ``leak_threshold`` bytes, i.e. memory does not return
+    to the level before it. Snapshots cover the whole process, so steps that
+    run concurrently in other threads are attributed to each other; tracing
+    also slows Python allocations down considerably, so this is a diagnostics
+    mode only.
+    """
+
+    def __init__(self, frames: int = 1, top: int = 10, leak_threshold: int = 1024 * 1024,
+                 history: int = 1000):
+        self.frames = frames
+        self.top = top
+        self.leak_threshold = leak_threshold
+        self.records: Deque[MemoryRecord] = deque(maxlen=history)
+        self.baseline: Optional[int] = None
+        self._started_tracing = False
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _snapshot(self) -> Tuple[tracemalloc.Snapshot, int]:
+        gc.collect()
+        # Dibaca sebelum snapshot, agar snapshot itu sendiri tidak terhitung
+        current = tracemalloc.get_traced_memory()[0]
+        return tracemalloc.take_snapshot().filter_traces(self._filters), current
+
+    @contextmanager
+    def measure(self, label: str, kind: str = "check") -> Iterator[None]:
+        """Measure the memory the ``with`` block allocates and keeps."""
+        before, current_before = self._snapshot()
+        if self.baseline is None:
+            self.baseline = current_before
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - current_before
+            after, current_after = self._snapshot()
+            self._record(label, kind, before, after, current_before, current_after, peak)
+
+    def _record(self, label: str, kind: str, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+                current_before: int, current_after: int, peak: int):
+        stats = after.compare_to(before, "lineno")
+        sites = [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff)
+                 for stat in stats[:self.top] if stat.size_diff]
+        retained = current_after - current_before
+        record = MemoryRecord(label, kind, retained, peak, current_after - self.baseline, sites,
+                              retained > self.leak_threshold)
+        self.records.append(record)
+        if record.flagged:
+            logger.warning(f"Memori tidak kembali ke baseline setelah {record.format()}")
+        else:
+            logger.info(f"Memori {kind} {label}: tertahan {_format_size(retained)}, "
+                        f"puncak {_format_size(peak)}")
+
+    def report(self) -> str:
+        """Text report of the recorded steps, flagged ones first."""
+        records = sorted(self.records, key=lambda record: (not record.flagged, -record.retained))
+        flagged = sum(1 for record in records if record.flagged)
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        header = [
+            f"Memory diagnostics, process {os.getpid()}, {time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Traced now {_format_size(current, False)}, peak {_format_size(peak, False)}, "
+            f"baseline {_format_size(self.baseline or 0, False)}",
+            f"{len(records)} steps, {flagged} retained more than {_format_size(self.leak_threshold, False)}",
+        ]
+        return "\n".join(header) + "\n\n" + "\n\n".join(record.format() for record in records) + "\n"
+
+    def write(self, path: str = None) -> str:
+        """Write ``report()`` to ``path`` (default: a new file in ``default_report_dir()``)."""
+        if path is None:
+            directory = default_report_dir()
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"memory-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report())
+        logger.info(f"Laporan memori ditulis ke {path}")
+        return path
+
+
+def start(**options) -> MemoryDiagnostics:
+    """Start memory diagnostics in this process (or return the running one)."""
+    global _diagnostics
+    with _lock:
+        if _diagnostics is None:
+            _diagnostics = MemoryDiagnostics(**options)
+            _diagnostics.start()
+            logger.info("Diagnostik memori (tracemalloc) diaktifkan.")
+        return _diagnostics
+
+
+def stop() -> Optional[MemoryDiagnostics]:
+    """Stop memory diagnostics; returns the diagnostics with the recorded steps."""
+    global _diagnostics
+    with _lock:
+        diagnostics, _diagnostics = _diagnostics, None
+    if diagnostics is not None:
+        diagnostics.stop()
+    return diagnostics
+
+
+def active() -> Optional[MemoryDiagnostics]:
+    return _diagnostics
+
+
+def from_settings(settings) -> Optional[MemoryDiagnostics]:
+    """Start diagnostics if ``developer/memory_diagnostics`` is set; returns the running ones."""
+    if settings.value("developer/memory_diagnostics", False, type=bool):
+        return start()
+    return _diagnostics
+
+
+@contextmanager
+def measure(label: str, kind: str = "check") -> Iterator[None]:
+    """Measure the ``with`` block if diagnostics are on; costs a single check otherwise."""
+    diagnostics = _diagnostics
+    if diagnostics is None:
+        yield
+        return
+    with diagnostics.measure(label, kind):
+        yield
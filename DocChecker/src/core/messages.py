@@ -0,0 +1,105 @@
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from core.issues import (
+    CheckResult, Issue,
+    ISSUE_FONT, ISSUE_SIZE, ISSUE_SPACING,
+    ISSUE_MARGIN_LEFT, ISSUE_MARGIN_RIGHT, ISSUE_MARGIN_TOP, ISSUE_MARGIN_BOTTOM,
+    ISSUE_MARGIN_UNCHECKED, NOTE_PDF_MARGIN,
+    ERROR_UNSUPPORTED, ERROR_CHECK, ERROR_PDF_OPEN,
+    ERROR_TIMEOUT, ERROR_CRASHED, ERROR_MEMORY, NOTE_CANCELLED, NOTE_NOT_CHECKED,
+)
+
+DEFAULT_LANGUAGE = "id"
+
+# Template pesan per bahasa dan kode isu.
+# Kunci dengan akhiran "@page" dipakai bila isu berlokasi di halaman (PDF).
+MESSAGE_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "id": {
+        ISSUE_FONT: 'Font tidak sesuai di paragraf: "{text}..."',
+        ISSUE_FONT + "@page": 'Font tidak sesuai di halaman {page}: "{text}..." (Ditemukan: {found})',
+        ISSUE_SIZE: 'Ukuran font tidak sesuai di paragraf: "{text}..."',
+        ISSUE_SIZE + "@page": 'Ukuran font tidak sesuai di halaman {page}: "{text}..." (Ditemukan: {found:.1f}pt)',
+        ISSUE_SPACING: 'Spasi tidak sesuai di paragraf: "{text}..."',
+        ISSUE_MARGIN_LEFT: 'Margin kiri tidak sesuai: {found:.2f} cm (Diharapkan: {expected} cm)',
+        ISSUE_MARGIN_RIGHT: 'Margin kanan tidak sesuai: {found:.2f} cm (Diharapkan: {expected} cm)',
+        ISSUE_MARGIN_TOP: 'Margin atas tidak sesuai: {found:.2f} cm (Diharapkan: {expected} cm)',
+        ISSUE_MARGIN_BOTTOM: 'Margin bawah tidak sesuai: {found:.2f} cm (Diharapkan: {expected} cm)',
+        ISSUE_MARGIN_UNCHECKED: 'Tidak dapat memeriksa margin.',
+        NOTE_PDF_MARGIN: 'Pemeriksaan margin pada PDF tidak dilakukan secara mendalam.',
+        ERROR_UNSUPPORTED: 'Format file tidak didukung. Hanya file .docx atau .pdf yang dapat diperiksa.',
+        ERROR_CHECK: 'Error saat memeriksa file: {found}',
+        ERROR_PDF_OPEN: 'Gagal membaca dokumen PDF: {found}',
+        ERROR_TIMEOUT: 'Pemeriksaan dihentikan: melebihi batas waktu {found} detik.',
+        ERROR_CRASHED: 'Proses pemeriksa berhenti tidak normal (kode keluar {found}).',
+        ERROR_MEMORY: 'Pemeriksaan dihentikan: melebihi batas memori {found} MB.',
+        NOTE_CANCELLED: 'Pemeriksaan dibatalkan sebelum selesai; hasil hanya mencakup bagian yang sudah diperiksa.',
+        NOTE_CANCELLED + "@page": 'Pemeriksaan dibatalkan di halaman {page}; hasil hanya mencakup halaman sebelumnya.',
+        NOTE_NOT_CHECKED: 'Tidak diperiksa: pemrosesan batch dihentikan sebelum berkas ini dimulai.',
+    },
+    "en": {
+        ISSUE_FONT: 'Font mismatch in paragraph: "{text}..."',
+        ISSUE_FONT + "@page": 'Font mismatch on page {page}: "{text}..." (Found: {found})',
+        ISSUE_SIZE: 'Font size mismatch in paragraph: "{text}..."',
+        ISSUE_SIZE + "@page": 'Font size mismatch on page {page}: "{text}..." (Found: {found:.1f}pt)',
+        ISSUE_SPACING: 'Line spacing mismatch in paragraph: "{text}..."',
+        ISSUE_MARGIN_LEFT: 'Left margin mismatch: {found:.2f} cm (Expected: {expected} cm)',
+        ISSUE_MARGIN_RIGHT: 'Right margin mismatch: {found:.2f} cm (Expected: {expected} cm)',
+        ISSUE_MARGIN_TOP: 'Top margin mismatch: {found:.2f} cm (Expected: {expected} cm)',
+        ISSUE_MARGIN_BOTTOM: 'Bottom margin mismatch: {found:.2f} cm (Expected: {expected} cm)',
+        ISSUE_MARGIN_UNCHECKED: 'Unable to check margins.',
+        NOTE_PDF_MARGIN: 'Margins are not checked in depth for PDF files.',
+        ERROR_UNSUPPORTED: 'Unsupported file format. Only .docx or .pdf files can be checked.',
+        ERROR_CHECK: 'Error while checking file: {found}',
+        ERROR_PDF_OPEN: 'Failed to read PDF document: {found}',
+        ERROR_TIMEOUT: 'Check stopped: exceeded the time limit of {found} seconds.',
+        ERROR_CRASHED: 'The checker process exited abnormally (exit code {found}).',
+        ERROR_MEMORY: 'Check stopped: exceeded the memory limit of {found} MB.',
+        NOTE_CANCELLED: 'Check cancelled before completion; results only cover the part already checked.',
+        NOTE_CANCELLED + "@page": 'Check cancelled at page {page}; results only cover the preceding pages.',
+        NOTE_NOT_CHECKED: 'Not checked: the batch was stopped before this file was started.',
+    },
+}
+
+
+def register_message(code: str, language: str, template: str):
+    """Add or override the message template of an issue code (e.g. for third-party rules)."""
+    MESSAGE_TEMPLATES.setdefault(language, {})[code] = template
+    _render_cached.cache_clear()
+
+
+def _template(language: str, code: str, on_page: bool) -> str:
+    for lang in (language, DEFAULT_LANGUAGE):
+        templates = MESSAGE_TEMPLATES.get(lang, {})
+        if on_page and code + "@page" in templates:
+            return templates[code + "@page"]
+        if code in templates:
+            return templates[code]
+    return code
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _render_cached(language: str, code: str, page: int, paragraph: int,
+                   found: Any, expected: Any, text: str) -> str:
+    template = _template(language, code, page >= 0)
+    return template.format(page=page, paragraph=paragraph + 1, found=found, expected=expected, text=text)
+
+
+def render_issue(result: CheckResult, issue: Issue, language: str = DEFAULT_LANGUAGE) -> str:
+    """
+    Render the message text of an issue in the given language.
+
+    Rendering only happens when a message is actually displayed or exported;
+    identical issues (same code and values) share one cached string.
+    """
+    return _render_cached(
+        language, issue.code, issue.page, issue.paragraph,
+        result.value(issue.found, ""),
+        result.value(issue.expected, ""),
+        result.value(issue.snippet, "")[:30],
+    )
+
+
+def render_messages(result: CheckResult, language: str = DEFAULT_LANGUAGE) -> List[str]:
+    """All messages of a result in the given language."""
+    return [render_issue(result, issue, language) for issue in result.issues]
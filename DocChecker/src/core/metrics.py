@@ -0,0 +1,409 @@
+import atexit
+import bisect
+import logging
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core import tracing
+from core.issues import CheckResult, STATUS_COMPLETED
+
+try:
+    import resource  # Tidak tersedia di Windows; RSS puncak lalu tidak dilaporkan
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Batas atas bucket histogram latensi (detik)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Berkas tujuan dump metrik saat proses utama keluar (CLI/skrip); kosong = tidak di-dump
+METRICS_FILE_ENV = "DOCCHECKER_METRICS_FILE"
+
+_dump_paths = set()
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric:
+    """Base of the metric types; values are kept per tuple of label values."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _label_text(self, key: LabelValues, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def drain(self) -> Dict[LabelValues, Any]:
+        """Current values, which are then reset (for shipping from worker processes)."""
+        raise NotImplementedError
+
+    def merge(self, values: Dict[LabelValues, Any]):
+        """Add values drained from another process."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labels:
+            values = [((), 0.0)]
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}" for key, value in values]
+
+    def drain(self) -> Dict[LabelValues, Any]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[LabelValues, Any]):
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down. ``set_function`` makes a label set read
+    its value when rendered (e.g. a queue length). Values merged from
+    worker processes are treated as high-water marks (maximum).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], Optional[float]]] = {}
+
+    def set(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_max(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = max(value, self._values.get(key, value))
+
+    def set_function(self, function: Optional[Callable[[], Optional[float]]], **labels: Any):
+        """Read the value from ``function`` at render time; None removes it."""
+        key = self._key(labels)
+        with self._lock:
+            if function is None:
+                self._functions.pop(key, None)
+            else:
+                self._functions[key] = function
+
+    def _current(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            values = dict(self._values)
+            functions = list(self._functions.items())
+        for key, function in functions:
+            try:
+                value = function()
+            except Exception as e:
+                logger.debug("Nilai metrik %s tidak dapat dibaca: %s", self.name, e)
+                continue
+            if value is not None:
+                values[key] = value
+        return values
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}"
+                for key, value in sorted(self._current().items())]
+
+    def drain(self) -> Dict[LabelValues, Any]:
+        return self._current()
+
+    def merge(self, values: Dict[LabelValues, Any]):
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = max(value, self._values.get(key, value))
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets, plus their sum and count."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label: [hitungan per bucket (non-kumulatif, + bucket +Inf), jumlah]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the ``with`` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(entry[0]), entry[1])) for key, entry in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{self._label_text(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+    def drain(self) -> Dict[LabelValues, Any]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[LabelValues, Any]):
+        with self._lock:
+            for key, (counts, total) in values.items():
+                entry = self._values.get(key)
+                if entry is None:
+                    entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+
+
+class MetricsRegistry:
+    """
+    Set of metrics rendered together in the Prometheus text exposition format.
+
+    Worker processes have their own registry; ``drain`` returns (and resets)
+    its values so the parent can ``merge`` them with each result.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, Dict[LabelValues, Any]]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: values for metric in metrics for values in (metric.drain(),) if values}
+
+    def merge(self, values: Optional[Dict[str, Dict[LabelValues, Any]]]):
+        if not values:
+            return
+        for name, metric_values in values.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(metric_values)
+
+    def dump(self, path: str):
+        """Write the current metrics to ``path`` (atomically, via a temporary file)."""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+CHECKS = REGISTRY.counter(
+    "doccheck_checks_total", "Documents checked, by file type and verdict.", ("type", "verdict"))
+STAGE_SECONDS = REGISTRY.histogram(
+    "doccheck_stage_seconds", "Time spent per check stage (read, parse, cache, extract, evaluate, sink, total).", ("stage",))
+BYTES = REGISTRY.counter(
+    "doccheck_bytes_processed_total", "Bytes of documents checked, by file type.", ("type",))
+CACHE_HITS = REGISTRY.counter(
+    "doccheck_feature_cache_hits_total", "Documents whose features were read from the feature cache.")
+CACHE_MISSES = REGISTRY.counter(
+    "doccheck_feature_cache_misses_total", "Feature cache lookups that had to parse the document.")
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "doccheck_feature_cache_hit_ratio", "Feature cache hits / lookups since start.")
+QUEUE_DEPTH = REGISTRY.gauge(
+    "doccheck_queue_depth", "Documents waiting to be checked, by queue.", ("queue",))
+WORKER_RESTARTS = REGISTRY.counter(
+    "doccheck_worker_restarts_total", "Worker processes replaced after a crash, timeout or memory limit.")
+PEAK_RSS = REGISTRY.gauge(
+    "doccheck_peak_rss_bytes", "Peak resident set size (main process, largest worker process).", ("process",))
+
+
+def _cache_hit_ratio() -> Optional[float]:
+    hits = CACHE_HITS.total()
+    lookups = hits + CACHE_MISSES.total()
+    return hits / lookups if lookups else None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KiB, macOS byte
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+CACHE_HIT_RATIO.set_function(_cache_hit_ratio)
+PEAK_RSS.set_function(peak_rss_bytes, process="main")
+
+
+def file_type(filename: str) -> str:
+    """Label value for the file type of ``filename``."""
+    ext = os.path.splitext(filename)[1].lower()
+    return ext[1:] if ext in (".docx", ".pdf") else "other"
+
+
+def verdict(result: CheckResult) -> str:
+    """``pass``/``fail`` for completed checks, otherwise the status (error, timeout, cancelled, ...)."""
+    if result.status == STATUS_COMPLETED:
+        return "pass" if result.success else "fail"
+    return result.status
+
+
+@contextmanager
+def stage(name: str, **trace_args: Any) -> Iterator[None]:
+    """Time one check stage; also a span in the trace if tracing is on (``core.tracing``)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        STAGE_SECONDS.observe(duration, stage=name)
+        tracing.record(name, started, duration, **trace_args)
+
+
+def record_check(filename: str, result: CheckResult, size: int = None, seconds: float = None):
+    """Count one checked document (and its size and total check time, if known)."""
+    kind = file_type(filename)
+    CHECKS.inc(type=kind, verdict=verdict(result))
+    if size:
+        BYTES.inc(size, type=kind)
+    if seconds is not None:
+        STAGE_SECONDS.observe(seconds, stage="total")
+
+
+def worker_metrics() -> Dict[str, Dict[LabelValues, Any]]:
+    """Drain this worker process's metrics, including its peak RSS, to send them to the parent."""
+    values = REGISTRY.drain()
+    # Rasio dihitung ulang dari penghitung yang digabung di proses induk
+    values.pop(CACHE_HIT_RATIO.name, None)
+    # RSS puncak worker digabung sebagai nilai maksimum, bukan sebagai RSS proses utama
+    main = values.pop(PEAK_RSS.name, {}).get(("main",))
+    if main is not None:
+        values[PEAK_RSS.name] = {("worker",): main}
+    return values
+
+
+def dump_on_exit(path: str = None):
+    """
+    Write the metrics to ``path`` (default: ``$DOCCHECKER_METRICS_FILE``)
+    when the main process exits. Does nothing without a path.
+    """
+    path = path or os.environ.get(METRICS_FILE_ENV, "")
+    # Proses worker tidak menimpa berkas milik proses utama
+    if not path or path in _dump_paths or multiprocessing.parent_process() is not None:
+        return
+    _dump_paths.add(path)
+
+    def dump():
+        try:
+            REGISTRY.dump(path)
+        except OSError as e:
+            logger.warning(f"Metrik tidak dapat ditulis ke {path}: {e}")
+
+    atexit.register(dump)
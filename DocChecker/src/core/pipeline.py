@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Union
+
+from core import metrics, tracing
+from core.cancellation import CancellationToken
+from core.issues import CheckResult, ERROR_CHECK
+from core.supervisor import SettingsSnapshot, SupervisedPool
+
+logger = logging.getLogger(__name__)
+
+# Interval (detik) menunggu hasil worker dalam satu putaran generator
+COLLECT_INTERVAL = 0.1
+
+_DONE = object()
+
+
+def iter_check(paths: Iterable[str], jobs: int = None, ordered: bool = False, settings=None,
+               max_in_flight: int = None, timeout: float = 120.0, memory_limit_mb: int = 2048,
+               cancel: CancellationToken = None, with_paths: bool = False,
+               trace: str = None) -> Iterator[Union[CheckResult, tuple]]:
+    """
+    Check files and yield each ``CheckResult`` as soon as it is available.
+
+    ``paths`` is consumed lazily. Files are checked in ``jobs`` isolated
+    worker processes (default: CPU count, with the per-file ``timeout`` and
+    ``memory_limit_mb`` of ``SupervisedPool``); ``jobs=0`` checks them one by
+    one in the calling thread. At most ``max_in_flight`` files (default
+    ``2 * jobs``) are submitted but not yet yielded, so a slow consumer
+    stalls the workers instead of piling up results in memory.
+
+    With ``ordered`` results come in the order of ``paths``; otherwise in
+    completion order. ``with_paths`` yields ``(path, result)`` tuples.
+    Setting ``cancel`` stops submitting new files; running checks return
+    their partial results, which are still yielded. Leaving the loop early
+    (``break``) shuts the workers down. With ``$DOCCHECKER_METRICS_FILE``
+    set, the metrics of the run are written there on exit.
+
+    ``trace`` is a path for a Chrome trace-event JSON of the run (one track
+    per worker with read/parse/extract/evaluate spans per file, plus the
+    consumer's ``sink`` time), written when the generator finishes.
+    """
+    metrics.dump_on_exit()
+    snapshot = SettingsSnapshot.of(settings)
+    if trace:
+        tracing.start()
+    try:
+        if jobs is not None and jobs <= 0:
+            yield from _iter_check_inline(paths, snapshot, cancel, with_paths)
+        else:
+            yield from _iter_check_pool(paths, jobs, ordered, snapshot, max_in_flight, timeout,
+                                        memory_limit_mb, cancel, with_paths)
+    finally:
+        tracer = tracing.stop() if trace else None
+        if tracer is not None:
+            tracer.write(trace)
+
+
+def _iter_check_pool(paths: Iterable[str], jobs: int, ordered: bool, snapshot: SettingsSnapshot,
+                     max_in_flight: int, timeout: float, memory_limit_mb: int,
+                     cancel: CancellationToken, with_paths: bool) -> Iterator[Union[CheckResult, tuple]]:
+    jobs = jobs or os.cpu_count() or 1
+    max_in_flight = max(jobs, max_in_flight or 2 * jobs)
+    pool = SupervisedPool(snapshot, jobs, timeout, memory_limit_mb)
+    pending = iter(paths)
+    exhausted = False
+    next_id = 0
+    next_yield = 0
+    in_flight = 0
+    # Hasil mode berurutan yang menunggu hasil sebelumnya
+    finished: Dict[int, tuple] = {}
+
+    try:
+        while True:
+            cancelled = cancel is not None and cancel.cancelled
+            if cancelled and not pool.cancel_token.cancelled:
+                logger.info("iter_check dibatalkan; menunggu hasil parsial berkas yang sedang diperiksa.")
+                pool.cancel_token.cancel()
+            while not exhausted and not cancelled and in_flight < max_in_flight and pool.has_idle():
+                path = next(pending, _DONE)
+                if path is _DONE:
+                    exhausted = True
+                    break
+                pool.submit(next_id, os.fspath(path))
+                next_id += 1
+                in_flight += 1
+            if in_flight == 0 and (exhausted or cancelled):
+                break
+
+            for job_id, path, result in pool.collect(COLLECT_INTERVAL):
+                if ordered:
+                    finished[job_id] = (path, result)
+                    continue
+                in_flight -= 1
+                with metrics.stage("sink"):
+                    yield (path, result) if with_paths else result
+            while next_yield in finished:
+                path, result = finished.pop(next_yield)
+                next_yield += 1
+                in_flight -= 1
+                with metrics.stage("sink"):
+                    yield (path, result) if with_paths else result
+    finally:
+        pool.close()
+
+
+def _iter_check_inline(paths: Iterable[str], settings: SettingsSnapshot, cancel: CancellationToken,
+                       with_paths: bool) -> Iterator[Union[CheckResult, tuple]]:
+    from core.checker import Checker
+    checker = Checker(settings)
+    for path in paths:
+        if cancel is not None and cancel.cancelled:
+            break
+        path = os.fspath(path)
+        try:
+            with tracing.span(os.path.basename(path), path=path):
+                result = checker.check_file(path, cancel)
+        except MemoryError:
+            raise
+        except Exception as e:
+            # Sama seperti worker terisolasi: berkas yang gagal menjadi hasil error
+            result = CheckResult.error(os.path.basename(path), ERROR_CHECK, e)
+            metrics.record_check(path, result)
+        with metrics.stage("sink"):
+            yield (path, result) if with_paths else result
+
+
+async def aiter_check(paths: Iterable[str], **kwargs: Any) -> AsyncIterator[Union[CheckResult, tuple]]:
+    """
+    ``asyncio`` variant of ``iter_check`` with the same arguments::
+
+        async for result in aiter_check(paths, jobs=4):
+            ...
+
+    The generator runs on one helper thread (``SupervisedPool`` must be used
+    from a single thread); the next result is only requested when the
+    consumer asks for it, so backpressure works as in ``iter_check``.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="iter_check")
+    generator = iter_check(paths, **kwargs)
+    try:
+        while True:
+            item = await loop.run_in_executor(executor, next, generator, _DONE)
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # Menutup generator (dan pool-nya) di thread yang sama dengan pemakaiannya
+        await asyncio.shield(loop.run_in_executor(executor, generator.close))
+        executor.shutdown(wait=False)
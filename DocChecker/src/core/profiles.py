@@ -0,0 +1,362 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.issues import CheckResult
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib  # Opsional untuk Python lama; tanpa ini hanya profil JSON yang dibaca
+    except ImportError:
+        tomllib = None
+
+logger = logging.getLogger(__name__)
+
+# Parameter aturan beserta nilai default-nya; tipe default menentukan konversi nilai QSettings
+RULE_DEFAULTS: Dict[str, Any] = {
+    "font_name": "Times New Roman",
+    "font_size": 12.0,
+    "line_spacing": 1.5,
+    "margin_left": 4.0,
+    "margin_right": 3.0,
+    "margin_top": 3.0,
+    "margin_bottom": 3.0,
+    "margin_tolerance": 0.1,
+}
+
+PROFILES_GROUP = "profiles"
+PROFILE_EXTENSIONS = (".toml", ".json")
+
+
+class ProfileError(ValueError):
+    """A profile file or value that does not pass validation."""
+
+
+def default_profile_dir() -> str:
+    """Per-user folder for profile files; independent of Qt so worker processes resolve the same path."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "MDC-2025", "profiles")
+
+
+def _convert(value: Any, default: Any) -> Any:
+    """Convert a QSettings value (often a string) to the type of ``default``."""
+    if value is None:
+        return default
+    try:
+        if isinstance(default, bool):
+            return value if isinstance(value, bool) else str(value).lower() in ('true', '1', 't', 'y', 'yes')
+        return type(default)(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Nilai profil tidak valid: {value!r}. Menggunakan default: {default}")
+        return default
+
+
+def _validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Known parameters only, with the type of their default (ints are accepted for floats)."""
+    values = dict(RULE_DEFAULTS)
+    for key, value in config.items():
+        if key not in RULE_DEFAULTS:
+            raise ProfileError(f"Parameter aturan tidak dikenal: {key}")
+        default = RULE_DEFAULTS[key]
+        if isinstance(default, float):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ProfileError(f"Parameter {key} harus berupa angka, bukan {value!r}")
+            value = float(value)
+        elif not isinstance(value, type(default)):
+            raise ProfileError(f"Parameter {key} harus bertipe {type(default).__name__}, bukan {value!r}")
+        values[key] = value
+    return values
+
+
+class Profile:
+    """
+    A named set of rule parameters and enabled rules, validated once and
+    immutable afterwards.
+
+    ``config`` holds the ``RULE_DEFAULTS`` parameters; ``disabled`` the codes
+    of rules that are switched off in this profile. ``fingerprint`` is a
+    hash of the content (not the name): two profiles with the same
+    fingerprint produce the same results, so it is stored on every
+    ``CheckResult`` to tell which rules a result was checked against.
+    """
+    __slots__ = ("name", "config", "disabled", "fingerprint", "source")
+
+    def __init__(self, name: str, config: Dict[str, Any] = None, disabled: Iterable[str] = (),
+                 source: str = None):
+        values = _validate_config(config or {})
+        disabled = frozenset(disabled)
+        canonical = json.dumps({"config": values, "disabled": sorted(disabled)}, sort_keys=True)
+        set_attr = object.__setattr__
+        set_attr(self, "name", name)
+        set_attr(self, "config", MappingProxyType(values))
+        set_attr(self, "disabled", disabled)
+        set_attr(self, "fingerprint", hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16])
+        # Berkas asal profil (None untuk profil dari QSettings)
+        set_attr(self, "source", source)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Profile is immutable")
+
+    def __reduce__(self):
+        return Profile, (self.name, dict(self.config), sorted(self.disabled), self.source)
+
+    def enabled_codes(self, codes: Iterable[str]) -> List[str]:
+        return [code for code in codes if code not in self.disabled]
+
+    @classmethod
+    def from_settings(cls, settings, name: str, codes: Iterable[str], prefix: str = "") -> "Profile":
+        """
+        Read a profile from settings keys under ``prefix`` (empty for the
+        current, flat rule settings).
+        """
+        config = {key: _convert(settings.value(prefix + key, default), default)
+                  for key, default in RULE_DEFAULTS.items()}
+        disabled = [code for code in codes
+                    if not _convert(settings.value(f"{prefix}rules/{code}/enabled", True), True)]
+        return cls(name, config, disabled)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], name: str, codes: Iterable[str] = None,
+                  source: str = None) -> "Profile":
+        """
+        Compile a profile from parsed file content::
+
+            name = "Jurnal"            # optional, defaults to the file name
+            disabled = ["margins"]     # optional rule codes
+
+            [rules]
+            font_name = "Arial"
+            font_size = 11
+        """
+        if not isinstance(data, dict):
+            raise ProfileError("Isi profil harus berupa tabel/objek")
+        unknown = set(data) - {"name", "rules", "disabled"}
+        if unknown:
+            raise ProfileError(f"Kunci profil tidak dikenal: {', '.join(sorted(unknown))}")
+        name = data.get("name", name)
+        rules = data.get("rules", {})
+        disabled = data.get("disabled", [])
+        if not isinstance(name, str) or not name.strip():
+            raise ProfileError("Nama profil harus berupa teks")
+        if not isinstance(rules, dict):
+            raise ProfileError("'rules' harus berupa tabel/objek")
+        if not isinstance(disabled, list) or not all(isinstance(code, str) for code in disabled):
+            raise ProfileError("'disabled' harus berupa daftar kode aturan")
+        if codes is not None:
+            unknown = set(disabled) - set(codes)
+            if unknown:
+                raise ProfileError(f"Kode aturan tidak dikenal: {', '.join(sorted(unknown))}")
+        return cls(name.strip(), rules, disabled, source)
+
+    @classmethod
+    def from_file(cls, path: str, codes: Iterable[str] = None) -> "Profile":
+        """Load and validate a ``.toml`` or ``.json`` profile file."""
+        stem, ext = os.path.splitext(os.path.basename(path))
+        ext = ext.lower()
+        try:
+            if ext == ".toml":
+                if tomllib is None:
+                    raise ProfileError("Profil TOML memerlukan Python 3.11 atau paket tomli")
+                with open(path, "rb") as f:
+                    data = tomllib.load(f)
+            elif ext == ".json":
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            else:
+                raise ProfileError(f"Format profil tidak didukung: {ext}")
+        except ProfileError:
+            raise
+        except Exception as e:
+            raise ProfileError(f"Berkas profil tidak dapat dibaca: {e}") from e
+        return cls.from_dict(data, stem, codes, source=path)
+
+    def __eq__(self, other):
+        return isinstance(other, Profile) and (self.name, self.fingerprint) == (other.name, other.fingerprint)
+
+    def __hash__(self):
+        return hash((self.name, self.fingerprint))
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, fingerprint={self.fingerprint!r})"
+
+
+class ProfileLibrary:
+    """
+    Profiles loaded from ``.toml``/``.json`` files in a folder.
+
+    ``refresh`` compares the (mtime, size) of every file with the previous
+    scan and only re-reads files that changed, so it is cheap enough to call
+    before every check; it runs at most once per ``min_interval`` seconds.
+    Files that fail validation are skipped and listed in ``errors``.
+    """
+
+    def __init__(self, directory: str = None, codes: Iterable[str] = None, min_interval: float = 1.0):
+        self.directory = directory or default_profile_dir()
+        self.codes = list(codes) if codes is not None else None
+        self.min_interval = min_interval
+        self.errors: Dict[str, str] = {}
+        self._entries: Dict[str, tuple] = {}  # path -> ((mtime_ns, size), Profile | None)
+        self._profiles: Dict[str, Profile] = {}
+        self._last_refresh = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings, codes: Iterable[str] = None) -> "ProfileLibrary":
+        return cls(settings.value("rules/profile_dir", "") or None, codes)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload changed, new and deleted profile files. Returns True if anything changed."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_refresh is not None and now - self._last_refresh < self.min_interval:
+                return False
+            self._last_refresh = now
+
+            signatures = {}
+            try:
+                with os.scandir(self.directory) as iterator:
+                    for entry in iterator:
+                        if entry.name.lower().endswith(PROFILE_EXTENSIONS) and entry.is_file():
+                            stat = entry.stat()
+                            signatures[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Folder profil tidak dapat dibaca: {self.directory} ({e})")
+
+            changed = set(self._entries) - set(signatures)
+            for path in changed:
+                del self._entries[path]
+                self.errors.pop(path, None)
+            for path, signature in signatures.items():
+                entry = self._entries.get(path)
+                if entry is not None and entry[0] == signature:
+                    continue
+                changed.add(path)
+                try:
+                    profile = Profile.from_file(path, self.codes)
+                    self.errors.pop(path, None)
+                    logger.info(f"Profil dimuat: {profile.name} ({os.path.basename(path)}, {profile.fingerprint})")
+                except ProfileError as e:
+                    profile = None
+                    self.errors[path] = str(e)
+                    logger.warning(f"Profil {path} dilewati: {e}")
+                self._entries[path] = (signature, profile)
+
+            if changed:
+                profiles: Dict[str, Profile] = {}
+                for path in sorted(self._entries):
+                    profile = self._entries[path][1]
+                    if profile is None:
+                        continue
+                    if profile.name in profiles:
+                        logger.warning(f"Nama profil ganda '{profile.name}' di {path}; berkas ini dilewati.")
+                        continue
+                    profiles[profile.name] = profile
+                self._profiles = profiles
+            return bool(changed)
+
+    def profiles(self) -> List[Profile]:
+        self.refresh()
+        return [self._profiles[name] for name in sorted(self._profiles)]
+
+    def names(self) -> List[str]:
+        return [profile.name for profile in self.profiles()]
+
+    def get(self, name: str) -> Optional[Profile]:
+        self.refresh()
+        return self._profiles.get(name)
+
+
+class ProfileStore:
+    """
+    Named profiles stored in the ``profiles/<name>/`` settings group,
+    separate from the flat rule keys edited in the settings dialog.
+    """
+
+    def __init__(self, settings, codes: Iterable[str]):
+        self.settings = settings
+        # Kode aturan terdaftar, untuk membaca status aktif setiap aturan
+        self.codes = list(codes)
+
+    @staticmethod
+    def validate_name(name: str) -> str:
+        name = name.strip()
+        if not name or "/" in name or "\\" in name:
+            raise ValueError(f"Nama profil tidak valid: {name!r}")
+        return name
+
+    def names(self) -> List[str]:
+        self.settings.beginGroup(PROFILES_GROUP)
+        try:
+            return sorted(self.settings.childGroups())
+        finally:
+            self.settings.endGroup()
+
+    def load(self, name: str) -> Profile:
+        if name not in self.names():
+            raise KeyError(f"Profil tidak ditemukan: {name}")
+        return Profile.from_settings(self.settings, name, self.codes, f"{PROFILES_GROUP}/{name}/")
+
+    def load_all(self, names: Iterable[str] = None) -> List[Profile]:
+        return [self.load(name) for name in (self.names() if names is None else names)]
+
+    def save(self, profile: Profile):
+        name = self.validate_name(profile.name)
+        prefix = f"{PROFILES_GROUP}/{name}/"
+        self.settings.remove(f"{PROFILES_GROUP}/{name}")
+        for key, value in profile.config.items():
+            self.settings.setValue(prefix + key, value)
+        for code in profile.disabled:
+            self.settings.setValue(f"{prefix}rules/{code}/enabled", False)
+        logger.info(f"Profil disimpan: {name}")
+
+    def delete(self, name: str):
+        self.settings.remove(f"{PROFILES_GROUP}/{name}")
+        logger.info(f"Profil dihapus: {name}")
+
+    def current(self, name: str) -> Profile:
+        """The rule settings currently in effect, as a profile called ``name``."""
+        return Profile.from_settings(self.settings, name, self.codes)
+
+
+class VerdictMatrix:
+    """
+    Results of checking files against several profiles: one row per file,
+    one column per profile.
+    """
+
+    def __init__(self, profiles: Iterable[str]):
+        self.profiles = list(profiles)
+        self.rows: Dict[str, Dict[str, CheckResult]] = {}
+
+    def add(self, file_path: str, results: Dict[str, CheckResult]):
+        self.rows[file_path] = results
+
+    def result(self, file_path: str, profile: str) -> Optional[CheckResult]:
+        return self.rows.get(file_path, {}).get(profile)
+
+    def passed(self, file_path: str) -> List[str]:
+        """Profiles the file meets."""
+        results = self.rows.get(file_path, {})
+        return [name for name in self.profiles if name in results and results[name].success]
+
+    def pass_counts(self) -> Dict[str, int]:
+        return {name: sum(1 for results in self.rows.values() if name in results and results[name].success)
+                for name in self.profiles}
+
+    def __len__(self):
+        return len(self.rows)
@@ -0,0 +1,151 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, Optional
+
+from core.features import default_cache_dir
+from core.issues import CheckResult
+
+logger = logging.getLogger(__name__)
+
+# Jumlah fungsi teratas (menurut waktu kumulatif) di laporan teks
+REPORT_FUNCTIONS = 40
+
+
+def default_dump_dir() -> str:
+    """Per-user folder for slow-file profiles, next to the feature cache."""
+    return os.path.join(os.path.dirname(default_cache_dir()), "slow-files")
+
+
+class ProfiledCheck:
+    """One profiled check; the caller sets ``result`` before the ``with`` block ends."""
+    __slots__ = ("path", "result", "duration", "dump_path")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.result: Optional[CheckResult] = None
+        self.duration = 0.0
+        self.dump_path: Optional[str] = None
+
+
+class SlowFileProfiler:
+    """
+    Runs ``cProfile`` around each check and keeps the profile only for slow files.
+
+    A check is slow if it took at least ``threshold`` seconds, or, with
+    ``use_p99``, longer than the 99th percentile of the last ``window``
+    checks (once ``min_samples`` were seen; in a worker process these are the
+    checks of the current batch). Kept profiles are written to ``directory``
+    as ``.pstats`` (for snakeviz, flameprof, gprof2dot) plus a ``.txt`` report
+    naming the file, its size, duration and verdict and the hottest functions.
+    At most ``max_dumps`` profiles are written per profiler.
+    """
+
+    def __init__(self, directory: str = None, threshold: float = 5.0, use_p99: bool = False,
+                 min_samples: int = 20, window: int = 1000, max_dumps: int = 20):
+        self.directory = directory or default_dump_dir()
+        self.threshold = threshold
+        self.use_p99 = use_p99
+        self.min_samples = min_samples
+        self.max_dumps = max_dumps
+        self.dumps = 0
+        self._durations: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["SlowFileProfiler"]:
+        """Profiler configured in the Developer settings, or None when profiling is off."""
+        if not settings.value("developer/profile_slow_files", False, type=bool):
+            return None
+        return cls(
+            settings.value("developer/profile_dir", "") or None,
+            settings.value("developer/profile_threshold", 5.0, type=float),
+            settings.value("developer/profile_p99", False, type=bool),
+            max_dumps=settings.value("developer/profile_max_dumps", 20, type=int),
+        )
+
+    def _p99(self) -> Optional[float]:
+        if len(self._durations) < self.min_samples:
+            return None
+        durations = sorted(self._durations)
+        return durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+
+    def _slow_reason(self, duration: float) -> Optional[str]:
+        """Why a check of ``duration`` seconds counts as slow, or None; records the duration."""
+        with self._lock:
+            p99 = self._p99() if self.use_p99 else None
+            self._durations.append(duration)
+            if self.dumps >= self.max_dumps:
+                return None
+            if self.threshold > 0 and duration >= self.threshold:
+                reason = f"threshold {self.threshold:g}s"
+            elif p99 is not None and duration > p99:
+                reason = f"p99 {p99:.3f}s of the last {len(self._durations) - 1} checks"
+            else:
+                return None
+            self.dumps += 1
+            return reason
+
+    @contextmanager
+    def profile(self, path: str) -> Iterator[ProfiledCheck]:
+        """Profile the ``with`` block as the check of ``path``."""
+        check = ProfiledCheck(path)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Profiler lain sudah aktif (mis. thread pemeriksa lain pada Python 3.12+)
+            profiler = None
+        started = time.perf_counter()
+        try:
+            yield check
+        finally:
+            check.duration = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                reason = self._slow_reason(check.duration)
+                if reason is not None:
+                    self._dump(profiler, check, reason)
+
+    def _dump(self, profiler: cProfile.Profile, check: ProfiledCheck, reason: str):
+        name = re.sub(r"[^\w.-]+", "_", os.path.basename(check.path))
+        base = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{name}")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(base + ".pstats")
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(self._report(profiler, check, reason))
+        except OSError as e:
+            logger.warning(f"Profil berkas lambat {check.path} tidak dapat disimpan: {e}")
+            return
+        check.dump_path = base + ".pstats"
+        logger.warning(f"Berkas lambat {check.path} ({check.duration:.2f}s, {reason}); "
+                       f"profil disimpan di {check.dump_path}")
+
+    @staticmethod
+    def _report(profiler: cProfile.Profile, check: ProfiledCheck, reason: str) -> str:
+        try:
+            size = f"{os.path.getsize(check.path)} bytes"
+        except OSError:
+            size = "unknown"
+        result = check.result
+        lines = [
+            f"File: {check.path}",
+            f"Size: {size}",
+            f"Duration: {check.duration:.3f}s (slow: {reason})",
+        ]
+        if result is not None:
+            lines.append(f"Status: {result.status}, success: {result.success}, issues: {len(result.issues)}")
+            if result.fingerprint:
+                lines.append(f"Rule profile: {result.fingerprint}")
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_FUNCTIONS)
+        return "\n".join(lines) + "\n\n" + stream.getvalue()
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+from core.issues import CheckResult
+from core.rules import CheckContext, ParagraphNode, PageNode, Rule, RuleSet, NODE_PARAGRAPH, NODE_PAGE
+
+# Jarak minimum (detik) antar laporan kemajuan satu dokumen
+DOCUMENT_PROGRESS_INTERVAL = 0.25
+
+# callback(selesai, total, temuan baru sejak laporan sebelumnya)
+DocumentProgressCallback = Callable[[int, int, CheckResult], None]
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as m:ss or h:mm:ss."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class ProgressSnapshot(NamedTuple):
+    """Consistent view of a batch at one point in time."""
+    done: int
+    total: int
+    done_bytes: int
+    total_bytes: int
+    in_flight: int
+    current_file: str
+    elapsed: float
+    files_per_second: float
+    bytes_per_second: float
+    eta: Optional[float]  # Detik tersisa; None sampai ada data untuk memperkirakan
+
+    @property
+    def finished(self) -> bool:
+        return self.total > 0 and self.done >= self.total
+
+    @property
+    def fraction(self) -> float:
+        if self.total_bytes > 0:
+            return self.done_bytes / self.total_bytes
+        return self.done / self.total if self.total else 0.0
+
+
+class BatchProgress:
+    """
+    Thread-safe progress counters for a batch.
+
+    The worker updates the counters per file without emitting anything;
+    consumers (progress dialog, CLI, service endpoints) poll ``snapshot()``
+    at their own rate, so a batch of many small files does not flood the
+    event loop. The ETA is weighted by file size: remaining bytes divided by
+    the byte rate observed so far.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+        self._in_flight: Dict[str, float] = {}
+        self._total = 0
+        self._done = 0
+        self._done_bytes = 0
+        self._total_bytes = 0
+        self._current_file = ""
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def start(self, sizes: Dict[str, int]):
+        """Begin a batch of ``{path: size_in_bytes}``."""
+        with self._lock:
+            self._sizes = dict(sizes)
+            self._total = len(self._sizes)
+            self._total_bytes = sum(self._sizes.values())
+            self._in_flight.clear()
+            self._done = 0
+            self._done_bytes = 0
+            self._current_file = ""
+            self._started_at = time.monotonic()
+            self._finished_at = None
+
+    def start_files(self, paths: Iterable[str]):
+        """Begin a batch, reading file sizes from the file system."""
+        sizes = {}
+        for path in paths:
+            try:
+                sizes[path] = os.path.getsize(path)
+            except OSError:
+                sizes[path] = 0
+        self.start(sizes)
+
+    def add(self, sizes: Dict[str, int]):
+        """Add files to a running batch (a file queued again counts again)."""
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            for path, size in sizes.items():
+                self._sizes[path] = size
+                self._total += 1
+                self._total_bytes += size
+            if sizes:
+                self._finished_at = None
+
+    def file_started(self, path: str):
+        with self._lock:
+            self._in_flight[path] = time.monotonic()
+            self._current_file = os.path.basename(path)
+
+    def file_done(self, path: str):
+        with self._lock:
+            self._in_flight.pop(path, None)
+            self._done += 1
+            self._done_bytes += self._sizes.get(path, 0)
+            if self._done >= self._total:
+                self._finished_at = time.monotonic()
+
+    def snapshot(self) -> ProgressSnapshot:
+        with self._lock:
+            total = self._total
+            done = self._done
+            done_bytes = self._done_bytes
+            total_bytes = self._total_bytes
+            in_flight = len(self._in_flight)
+            current_file = self._current_file
+            started_at = self._started_at
+            end = self._finished_at or time.monotonic()
+
+        elapsed = end - started_at if started_at is not None else 0.0
+        files_per_second = done / elapsed if elapsed > 0 else 0.0
+        bytes_per_second = done_bytes / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if done >= total and total:
+            eta = 0.0
+        elif bytes_per_second > 0:
+            eta = (total_bytes - done_bytes) / bytes_per_second
+        elif files_per_second > 0:
+            eta = (total - done) / files_per_second
+        return ProgressSnapshot(done, total, done_bytes, total_bytes, in_flight, current_file,
+                                elapsed, files_per_second, bytes_per_second, eta)
+
+
+class DocumentProgress(Rule):
+    """
+    Pseudo-rule reporting the progress of one document traversal.
+
+    Added to the rule set like ``FeatureRecorder``; it counts paragraphs
+    (DOCX) or pages (PDF) and calls ``callback(done, total, findings)`` at
+    most every ``interval`` seconds, where ``findings`` is a ``CheckResult``
+    holding only the issues reported since the previous call (it shares the
+    value table of the running check). ``finish`` sends the last report,
+    including findings of whole-document rules such as margins. Not
+    splittable: the page ranges of a split PDF run in other processes.
+    """
+    code = "_document_progress"
+    node_kinds = (NODE_PARAGRAPH, NODE_PAGE)
+    splittable = False
+
+    def __init__(self, config: Dict[str, Any], callback: DocumentProgressCallback, total: int,
+                 interval: float = DOCUMENT_PROGRESS_INTERVAL):
+        super().__init__(config)
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self._reported = 0
+        self._last = 0.0
+
+    def start(self, ctx: CheckContext):
+        self._reported = 0
+        self._last = time.monotonic()
+
+    def visit_paragraph(self, node: ParagraphNode, ctx: CheckContext):
+        # Paragraf dikunjungi setelah run-nya: temuan paragraf ini sudah tercatat
+        self._update(node.index + 1, ctx)
+
+    def visit_page(self, node: PageNode, ctx: CheckContext):
+        # Halaman dikunjungi sebelum span-nya: yang selesai baru halaman sebelumnya
+        self._update(node.number - 1, ctx)
+
+    def finish(self, ctx: CheckContext):
+        self._report(self.total, ctx)
+
+    def _update(self, done: int, ctx: CheckContext):
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._report(done, ctx)
+
+    def _report(self, done: int, ctx: CheckContext):
+        issues = ctx.issues[self._reported:]
+        self._reported += len(issues)
+        findings = CheckResult(ctx.filename, ctx.success, issues, ctx.collector.values)
+        self.callback(done, self.total, findings)
+
+
+def with_progress(rule_set: RuleSet, callback: DocumentProgressCallback, total: int) -> RuleSet:
+    """Copy of ``rule_set`` that additionally reports its traversal to ``callback``."""
+    config = rule_set.rules[0].config if rule_set.rules else {}
+    return RuleSet(rule_set.rules + [DocumentProgress(config, callback, total)])
@@ -0,0 +1,435 @@
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+import logging
+
+from core.issues import (
+    CheckResult, Issue, IssueCollector, NOTE_CANCELLED, STATUS_COMPLETED, STATUS_CANCELLED,
+    ISSUE_FONT, ISSUE_SIZE, ISSUE_SPACING, ISSUE_MARGIN_UNCHECKED,
+    ISSUE_MARGIN_LEFT, ISSUE_MARGIN_RIGHT, ISSUE_MARGIN_TOP, ISSUE_MARGIN_BOTTOM,
+)
+
+logger = logging.getLogger(__name__)
+
+# Jenis node yang dikunjungi oleh traversal dokumen
+NODE_RUN = "run"
+NODE_PARAGRAPH = "paragraph"
+NODE_SECTION = "section"
+NODE_PAGE = "page"
+NODE_SPAN = "span"
+
+NODE_KINDS = (NODE_RUN, NODE_PARAGRAPH, NODE_SECTION, NODE_PAGE, NODE_SPAN)
+DOCX_NODE_KINDS = (NODE_RUN, NODE_PARAGRAPH, NODE_SECTION)
+PDF_NODE_KINDS = (NODE_PAGE, NODE_SPAN)
+
+
+class ParagraphNode(NamedTuple):
+    """Non-empty DOCX paragraph. Visited after all of its runs."""
+    index: int
+    text: str
+    line_spacing: Optional[float]
+
+
+class RunNode(NamedTuple):
+    """Non-empty DOCX run with its effective (inherited) font name."""
+    paragraph: ParagraphNode
+    font_name: Optional[str]
+    size: Optional[float]
+
+
+class SectionNode(NamedTuple):
+    """DOCX section with margins converted to centimetres."""
+    index: int
+    left: float
+    right: float
+    top: float
+    bottom: float
+
+
+class PageNode(NamedTuple):
+    """PDF page (1-based number), visited before its spans."""
+    number: int
+    width: float
+    height: float
+
+
+class SpanNode(NamedTuple):
+    """PDF text span."""
+    page: int
+    text: str
+    font_name: str
+    size: float
+    bbox: Tuple[float, float, float, float]
+
+
+class CheckContext:
+    """Collects the findings of all rules for one document."""
+
+    def __init__(self, filename: str, file_type: str):
+        self.filename = filename
+        self.file_type = file_type
+        self.success = True
+        self.cancelled = False
+        self.cancelled_page = -1
+        self.collector = IssueCollector()
+        # Paragraf terakhir dengan temuan font/ukuran: seperti semula, hanya run pertama
+        # yang bermasalah di setiap paragraf yang dilaporkan (oleh FontNameRule atau FontSizeRule)
+        self.reported_run_paragraph = -1
+
+    @property
+    def issues(self) -> List[Issue]:
+        return self.collector.issues
+
+    def report(self, code: str, page: int = -1, paragraph: int = -1,
+               found: Any = None, expected: Any = None, text: str = None):
+        """Record a rule violation; marks the document as failed."""
+        self.collector.add(code, page, paragraph, found, expected, text)
+        self.success = False
+
+    def note(self, code: str, **params: Any):
+        """Record an informational issue that does not fail the document."""
+        self.collector.add(code, **params)
+
+    def mark_cancelled(self, page: int = -1):
+        """The traversal stopped early; the result only covers the nodes visited so far."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self.cancelled_page = page
+        # Dokumen yang belum selesai diperiksa tidak boleh dianggap lulus
+        self.success = False
+        self.note(NOTE_CANCELLED, page=page)
+
+    def to_result(self) -> CheckResult:
+        status = STATUS_CANCELLED if self.cancelled else STATUS_COMPLETED
+        return CheckResult.from_collector(self.filename, self.collector, self.success, status)
+
+
+class Rule:
+    """
+    Base class for formatting rules.
+
+    A rule lists the node kinds it is interested in via ``node_kinds`` and
+    implements one ``visit_<kind>(node, ctx)`` method per kind. The traversal
+    only builds and dispatches the node kinds requested by enabled rules.
+
+    ``splittable`` rules judge each page on its own, so a large PDF may be
+    checked as independent page ranges in parallel. Rules that aggregate
+    across pages must set it to False; such documents are never split.
+
+    Rules may also define ``evaluate_columns(columns, report)`` to judge a
+    whole document at once from cached features with NumPy (see
+    ``core.columnar``); it must report the same findings as the visit methods.
+    Rules that leave it as None are evaluated node by node.
+    """
+    code = ""
+    node_kinds: Tuple[str, ...] = ()
+    splittable = True
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+    def start(self, ctx: CheckContext):
+        """Called once per document before traversal."""
+
+    def finish(self, ctx: CheckContext):
+        """Called once per document after traversal."""
+
+    # Evaluasi tervektor atas core.columnar.FeatureColumns; None = tidak didukung
+    evaluate_columns: Optional[Callable[[Any, Any], None]] = None
+
+
+class RuleSet:
+    """Enabled rule instances plus a per-node-kind dispatch table."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self._dispatch: Dict[str, Tuple[Callable[[Any, CheckContext], None], ...]] = {}
+        for kind in NODE_KINDS:
+            self._dispatch[kind] = tuple(
+                getattr(rule, f"visit_{kind}") for rule in rules if kind in rule.node_kinds
+            )
+
+    def wants(self, kind: str) -> bool:
+        """True if at least one enabled rule visits nodes of this kind."""
+        return bool(self._dispatch[kind])
+
+    def dispatch(self, kind: str) -> Tuple[Callable[[Any, CheckContext], None], ...]:
+        """Bound visit methods interested in this node kind."""
+        return self._dispatch[kind]
+
+    def rules_for(self, kinds: Iterable[str]) -> List[Rule]:
+        """Rules that visit any of the given node kinds (i.e. apply to a format)."""
+        kinds = set(kinds)
+        return [rule for rule in self.rules if kinds.intersection(rule.node_kinds)]
+
+    def start(self, ctx: CheckContext, kinds: Iterable[str]):
+        for rule in self.rules_for(kinds):
+            rule.start(ctx)
+
+    def finish(self, ctx: CheckContext, kinds: Iterable[str]):
+        for rule in self.rules_for(kinds):
+            rule.finish(ctx)
+
+
+class RuleRegistry:
+    """
+    Ordered collection of rule classes keyed by their code.
+
+    Registration order is the order in which rules see each node, which also
+    determines the order of messages in the report.
+    """
+
+    def __init__(self):
+        self._rules: Dict[str, Type[Rule]] = {}
+
+    def register(self, rule_cls: Type[Rule]) -> Type[Rule]:
+        """Register a rule class. Usable as a class decorator."""
+        if not rule_cls.code:
+            raise ValueError(f"Rule {rule_cls.__name__} tidak memiliki kode")
+        unknown = set(rule_cls.node_kinds) - set(NODE_KINDS)
+        if unknown:
+            raise ValueError(f"Rule {rule_cls.code} meminta jenis node tidak dikenal: {sorted(unknown)}")
+        for kind in rule_cls.node_kinds:
+            if not callable(getattr(rule_cls, f"visit_{kind}", None)):
+                raise ValueError(f"Rule {rule_cls.code} tidak mengimplementasikan visit_{kind}")
+        if rule_cls.code in self._rules:
+            logger.warning(f"Rule '{rule_cls.code}' didaftarkan ulang, menggantikan definisi sebelumnya.")
+        self._rules[rule_cls.code] = rule_cls
+        return rule_cls
+
+    def unregister(self, code: str):
+        self._rules.pop(code, None)
+
+    def codes(self) -> List[str]:
+        return list(self._rules)
+
+    def build(self, config: Dict[str, Any], enabled: Iterable[str] = None) -> RuleSet:
+        """Instantiate the enabled rules. Disabled rules never enter the dispatch table."""
+        enabled_codes = set(self._rules) if enabled is None else set(enabled)
+        rules = [rule_cls(config) for code, rule_cls in self._rules.items() if code in enabled_codes]
+        logger.debug("RuleSet dibangun dengan rule: %s", [rule.code for rule in rules])
+        return RuleSet(rules)
+
+
+default_registry = RuleRegistry()
+
+
+def register_rule(rule_cls: Type[Rule]) -> Type[Rule]:
+    """Register a (third-party) rule class on the default registry."""
+    return default_registry.register(rule_cls)
+
+
+@register_rule
+class FontNameRule(Rule):
+    """Runs and spans must use the expected font (partial, case-insensitive match)."""
+    code = "font_name"
+    node_kinds = (NODE_RUN, NODE_SPAN)
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.expected = config["font_name"]
+        self._expected_lower = self.expected.lower()
+
+    def start(self, ctx: CheckContext):
+        super().start(ctx)
+        self._reported_spans = set()
+
+    def visit_run(self, node: RunNode, ctx: CheckContext):
+        para = node.paragraph
+        # Cukup satu run bermasalah untuk membuat paragraf gagal, laporkan sekali per paragraf
+        if para.index == ctx.reported_run_paragraph:
+            return
+        font_name = node.font_name
+        if font_name == self.expected:
+            return
+        # Izinkan nama font yang mengandung font yang diharapkan (mis. "Times New Roman PSMT")
+        if font_name and self._expected_lower in font_name.lower():
+            return
+        display_font_name = font_name or "Default"
+        ctx.reported_run_paragraph = para.index
+        ctx.report(ISSUE_FONT, paragraph=para.index, found=display_font_name, expected=self.expected, text=para.text[:50])
+        logger.debug("[DOCX] Font tidak sesuai: Para %d, Ditemukan='%s', Diharapkan='%s', Teks='%.30s...'",
+                     para.index + 1, display_font_name, self.expected, para.text)
+
+    def visit_span(self, node: SpanNode, ctx: CheckContext):
+        if self._expected_lower in node.font_name.lower():
+            return
+        # Hindari pesan ganda untuk halaman/font/teks yang sama
+        key = (node.page, node.font_name, node.text[:30])
+        if key in self._reported_spans:
+            return
+        self._reported_spans.add(key)
+        ctx.report(ISSUE_FONT, page=node.page, found=node.font_name, expected=self.expected, text=node.text[:50])
+        logger.debug("[PDF] Font tidak sesuai: Hal %d, Ditemukan='%s', Diharapkan='%s', Teks='%.30s...'",
+                     node.page, node.font_name, self.expected, node.text)
+
+    def _font_mismatch(self, font_name: Optional[str]) -> bool:
+        if font_name == self.expected:
+            return False
+        return not (font_name and self._expected_lower in font_name.lower())
+
+    def evaluate_columns(self, columns, report):
+        features = columns.features
+        mismatch = columns.font_lookup(self._font_mismatch)
+
+        # DOCX: run pertama yang salah font di setiap paragraf; bersama FontSizeRule hanya
+        # run pertama yang bermasalah (font atau ukuran) yang dilaporkan
+        rows = columns.rows(mismatch[columns.run_font])
+        for row in columns.first_rows(rows, columns.run_para[rows]).tolist():
+            ordinal = features.run_para[row]
+            report.add(columns.run_seq[row], ISSUE_FONT, paragraph=features.para_index[ordinal],
+                       found=features.font(features.run_font[row]) or "Default", expected=self.expected,
+                       text=features.para_text[ordinal][:50], once_per=(NODE_RUN, ordinal))
+
+        # PDF: satu laporan per halaman/font/awal teks
+        rows = columns.rows(mismatch[columns.span_font])
+        rows = columns.first_rows(rows, columns.span_page[rows], columns.span_font[rows],
+                                  columns.text_ids(features.span_text, rows, 30))
+        for row in rows.tolist():
+            report.add(columns.span_seq[row], ISSUE_FONT, page=features.span_page[row],
+                       found=features.fonts[features.span_font[row]], expected=self.expected,
+                       text=features.span_text[row][:50])
+
+
+def _size_key(size: float) -> float:
+    """PDF span size as reported and deduplicated (0.1 pt), the same for replay and columns."""
+    return round(size, 1)
+
+
+@register_rule
+class FontSizeRule(Rule):
+    """Runs with direct size formatting and all spans must use the expected size."""
+    code = "font_size"
+    node_kinds = (NODE_RUN, NODE_SPAN)
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.expected = config["font_size"]
+        self.pdf_tolerance = config.get("pdf_size_tolerance", 0.5)
+
+    def start(self, ctx: CheckContext):
+        super().start(ctx)
+        self._reported_spans = set()
+
+    def visit_run(self, node: RunNode, ctx: CheckContext):
+        para = node.paragraph
+        if para.index == ctx.reported_run_paragraph:
+            return
+        # python-docx hanya memberikan ukuran dari format langsung; ukuran turunan dari style tidak diperiksa
+        if node.size is None or node.size == self.expected:
+            return
+        ctx.reported_run_paragraph = para.index
+        ctx.report(ISSUE_SIZE, paragraph=para.index, found=node.size, expected=self.expected, text=para.text[:50])
+        logger.debug("[DOCX] Ukuran font tidak sesuai: Para %d, Ditemukan='%s', Diharapkan='%s', Teks='%.30s...'",
+                     para.index + 1, node.size, self.expected, para.text)
+
+    def visit_span(self, node: SpanNode, ctx: CheckContext):
+        if abs(node.size - self.expected) <= self.pdf_tolerance:
+            return
+        key = (node.page, _size_key(node.size), node.text[:30])
+        if key in self._reported_spans:
+            return
+        self._reported_spans.add(key)
+        ctx.report(ISSUE_SIZE, page=node.page, found=_size_key(node.size), expected=self.expected, text=node.text[:50])
+        logger.debug("[PDF] Ukuran font tidak sesuai: Hal %d, Ditemukan='%.1fpt', Diharapkan='%.1fpt', Teks='%.30s...'",
+                     node.page, node.size, self.expected, node.text)
+
+    def evaluate_columns(self, columns, report):
+        features = columns.features
+
+        # DOCX: NaN = tanpa format ukuran langsung
+        sizes = columns.run_size
+        rows = columns.rows((sizes == sizes) & (sizes != self.expected))
+        for row in columns.first_rows(rows, columns.run_para[rows]).tolist():
+            ordinal = features.run_para[row]
+            report.add(columns.run_seq[row], ISSUE_SIZE, paragraph=features.para_index[ordinal],
+                       found=features.run_size[row], expected=self.expected,
+                       text=features.para_text[ordinal][:50], once_per=(NODE_RUN, ordinal))
+
+        sizes = columns.span_size
+        rows = columns.rows(abs(sizes - self.expected) > self.pdf_tolerance)
+        rows = columns.first_rows(rows, columns.span_page[rows], columns.value_ids(sizes[rows], _size_key),
+                                  columns.text_ids(features.span_text, rows, 30))
+        for row in rows.tolist():
+            report.add(columns.span_seq[row], ISSUE_SIZE, page=features.span_page[row],
+                       found=_size_key(features.span_size[row]), expected=self.expected,
+                       text=features.span_text[row][:50])
+
+
+@register_rule
+class LineSpacingRule(Rule):
+    """Paragraphs with explicit line spacing must match the expected spacing."""
+    code = "line_spacing"
+    node_kinds = (NODE_PARAGRAPH,)
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.expected = config["line_spacing"]
+
+    def visit_paragraph(self, node: ParagraphNode, ctx: CheckContext):
+        spacing = node.line_spacing
+        if spacing is None or spacing == self.expected:
+            return
+        ctx.report(ISSUE_SPACING, paragraph=node.index, found=spacing, expected=self.expected, text=node.text[:50])
+        logger.debug("[DOCX] Spasi tidak sesuai: Para %d, Ditemukan='%s', Diharapkan='%s', Teks='%.30s...'",
+                     node.index + 1, spacing, self.expected, node.text)
+
+    def evaluate_columns(self, columns, report):
+        features = columns.features
+        spacing = columns.para_spacing
+        for row in columns.rows((spacing == spacing) & (spacing != self.expected)).tolist():
+            report.add(columns.para_seq[row], ISSUE_SPACING, paragraph=features.para_index[row],
+                       found=features.para_spacing[row], expected=self.expected,
+                       text=features.para_text[row][:50])
+
+
+@register_rule
+class MarginRule(Rule):
+    """Margins of the first section must be within tolerance of the expected values (cm)."""
+    code = "margins"
+    node_kinds = (NODE_SECTION,)
+
+    _SIDES = (
+        ("left", "kiri", ISSUE_MARGIN_LEFT),
+        ("right", "kanan", ISSUE_MARGIN_RIGHT),
+        ("top", "atas", ISSUE_MARGIN_TOP),
+        ("bottom", "bawah", ISSUE_MARGIN_BOTTOM),
+    )
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.expected = {side: config[f"margin_{side}"] for side, _, _ in self._SIDES}
+        self.tolerance = config["margin_tolerance"]
+
+    def start(self, ctx: CheckContext):
+        super().start(ctx)
+        self._seen_section = False
+
+    def visit_section(self, node: SectionNode, ctx: CheckContext):
+        self._seen_section = True
+        # Hanya section pertama yang diperiksa
+        if node.index != 0:
+            return
+        for side, label, code in self._SIDES:
+            found = getattr(node, side)
+            expected = self.expected[side]
+            if abs(found - expected) <= self.tolerance:
+                continue
+            ctx.report(code, found=found, expected=expected)
+            logger.debug("[DOCX] Margin %s tidak sesuai: Ditemukan=%.2fcm, Diharapkan=%.2fcm", label, found, expected)
+
+    def finish(self, ctx: CheckContext):
+        if not self._seen_section:
+            ctx.report(ISSUE_MARGIN_UNCHECKED)
+            logger.warning("[DOCX] Tidak ada section ditemukan, tidak dapat memeriksa margin.")
+
+    def evaluate_columns(self, columns, report):
+        if not len(columns.section_margins):
+            if columns.complete:
+                report.add(columns.end_seq, ISSUE_MARGIN_UNCHECKED)
+            return
+        margins = columns.features.section_margins
+        for offset, (side, _, code) in enumerate(self._SIDES):
+            found = margins[offset]
+            expected = self.expected[side]
+            if abs(found - expected) > self.tolerance:
+                report.add(columns.section_seq[0], code, found=found, expected=expected)
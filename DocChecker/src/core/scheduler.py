@@ -0,0 +1,514 @@
+import heapq
+import itertools
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Byte yang dibaca dari awal/akhir PDF untuk mencari jumlah halaman
+_PDF_HEAD_BYTES = 2048
+_PDF_TAIL_BYTES = 64 * 1024
+
+# Kamus linearisasi (selalu di awal berkas): "/Linearized 1 ... /N <jumlah halaman>"
+_LINEARIZED_RE = re.compile(rb"/Linearized\b.{0,512}?/N\s+(\d+)", re.S)
+# Pohon halaman: "/Type /Pages ... /Count <n>"; diambil nilai terbesar (akar pohon)
+_PAGES_COUNT_RE = re.compile(rb"/Type\s*/Pages\b[^>]{0,512}?/Count\s+(\d+)|/Count\s+(\d+)[^>]{0,512}?/Type\s*/Pages\b", re.S)
+
+# Perkiraan kasar bila jumlah halaman tidak ditemukan
+_PDF_BYTES_PER_PAGE = 60 * 1024
+
+# Bobot awal model biaya (satuan: detik). Disetel ulang oleh CostModel dari waktu nyata.
+_DEFAULT_WEIGHTS = {
+    # DOCX: biaya didominasi parsing XML dokumen utama
+    ".docx": {"base": 0.05, "per_mb": 0.02, "per_xml_mb": 0.6, "per_page": 0.0},
+    # PDF: ekstraksi teks per halaman ditambah pembukaan berkas
+    ".pdf": {"base": 0.05, "per_mb": 0.01, "per_xml_mb": 0.0, "per_page": 0.02},
+}
+_UNKNOWN_WEIGHTS = {"base": 0.01, "per_mb": 0.0, "per_xml_mb": 0.0, "per_page": 0.0}
+
+
+class CostEstimate:
+    """Cheap signals about one file and the predicted check time derived from them."""
+    __slots__ = ("path", "file_type", "size", "xml_size", "pages", "cost", "priority")
+
+    def __init__(self, path: str, file_type: str, size: int = 0, xml_size: int = 0, pages: int = 0):
+        self.path = path
+        self.file_type = file_type
+        self.size = size
+        self.xml_size = xml_size
+        self.pages = pages
+        self.cost = 0.0
+        self.priority = 0
+
+    def __repr__(self):
+        return (f"CostEstimate({os.path.basename(self.path)!r}, size={self.size}, xml_size={self.xml_size}, "
+                f"pages={self.pages}, cost={self.cost:.3f}, priority={self.priority})")
+
+
+def _docx_xml_size(path: str) -> int:
+    """Uncompressed size of the main document part, read from the zip central directory only."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            total = 0
+            for info in archive.infolist():
+                if info.filename == "word/document.xml":
+                    return info.file_size
+                if info.filename.endswith(".xml"):
+                    total += info.file_size
+            return total
+    except (zipfile.BadZipFile, OSError):
+        return 0
+
+
+def _pdf_page_count(path: str, size: int) -> int:
+    """
+    Page count from the linearization dictionary or the page tree near the
+    end of the file. Returns 0 if neither is readable (e.g. compressed object streams).
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_PDF_HEAD_BYTES)
+            match = _LINEARIZED_RE.search(head)
+            if match:
+                return int(match.group(1))
+            if size > _PDF_HEAD_BYTES:
+                f.seek(max(_PDF_HEAD_BYTES, size - _PDF_TAIL_BYTES))
+                tail = f.read(_PDF_TAIL_BYTES)
+            else:
+                tail = b""
+    except OSError:
+        return 0
+    counts = [int(a or b) for a, b in _PAGES_COUNT_RE.findall(head + tail)]
+    return max(counts) if counts else 0
+
+
+def estimate_file(path: str) -> CostEstimate:
+    """Collect cost signals for a file without parsing it."""
+    file_type = os.path.splitext(path)[1].lower()
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    estimate = CostEstimate(path, file_type, size)
+    if file_type == ".docx":
+        estimate.xml_size = _docx_xml_size(path)
+    elif file_type == ".pdf":
+        estimate.pages = _pdf_page_count(path, size)
+        if not estimate.pages:
+            estimate.pages = max(1, size // _PDF_BYTES_PER_PAGE)
+    return estimate
+
+
+class CostModel:
+    """
+    Linear cost model per file type with a self-tuning scale factor.
+
+    Each observed check time moves the scale of its file type towards
+    ``actual / predicted`` by an exponentially weighted moving average, so
+    the ordering adapts to the machine it runs on.
+    """
+
+    def __init__(self, scales: Dict[str, float] = None, alpha: float = 0.2):
+        self.alpha = alpha
+        self.scales: Dict[str, float] = dict(scales or {})
+
+    def raw_cost(self, estimate: CostEstimate) -> float:
+        weights = _DEFAULT_WEIGHTS.get(estimate.file_type, _UNKNOWN_WEIGHTS)
+        mb = 1024 * 1024
+        return (weights["base"]
+                + weights["per_mb"] * estimate.size / mb
+                + weights["per_xml_mb"] * estimate.xml_size / mb
+                + weights["per_page"] * estimate.pages)
+
+    def predict(self, estimate: CostEstimate) -> float:
+        estimate.cost = self.raw_cost(estimate) * self.scales.get(estimate.file_type, 1.0)
+        return estimate.cost
+
+    def observe(self, estimate: CostEstimate, actual: float):
+        raw = self.raw_cost(estimate)
+        if raw <= 0 or actual <= 0:
+            return
+        scale = self.scales.get(estimate.file_type, 1.0)
+        self.scales[estimate.file_type] = (1 - self.alpha) * scale + self.alpha * (actual / raw)
+
+    @classmethod
+    def load(cls, settings) -> "CostModel":
+        scales = {}
+        for file_type in _DEFAULT_WEIGHTS:
+            scale = settings.value(f"batch/cost_scale/{file_type[1:]}", 1.0, type=float)
+            if scale > 0:
+                scales[file_type] = scale
+        return cls(scales)
+
+    def save(self, settings):
+        for file_type, scale in self.scales.items():
+            if file_type in _DEFAULT_WEIGHTS:
+                settings.setValue(f"batch/cost_scale/{file_type[1:]}", scale)
+
+
+class BatchScheduler:
+    """
+    Shortest-job-first queue of files to check.
+
+    Files are handed out by descending priority, then ascending predicted
+    cost, which minimizes the mean time until each result appears. Files can
+    be added while the batch runs: ``add`` only queues the paths (cheap, safe
+    from the GUI thread) and ``drain`` estimates them on the worker thread.
+    Call ``record`` with the measured duration of every finished file;
+    ``report`` compares predicted and actual cost afterwards.
+    """
+
+    def __init__(self, file_paths: Iterable[str] = (), model: CostModel = None,
+                 priorities: Dict[str, int] = None):
+        self.model = model or CostModel()
+        self.estimates: Dict[str, CostEstimate] = {}
+        self.actuals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._incoming: List[Tuple[str, int]] = []
+        self._heap: List[Tuple[int, float, int, CostEstimate]] = []
+        self._pending: Set[str] = set()
+        # Nomor urut menjaga urutan daftar untuk berkas dengan prioritas dan biaya sama
+        self._sequence = itertools.count()
+        self._closed = False
+        self.add(file_paths, priorities)
+        self.drain()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._incoming) + len(self._heap)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def add(self, file_paths: Iterable[str], priorities: Dict[str, int] = None,
+            priority: int = 0) -> Optional[List[str]]:
+        """
+        Queue files with ``priority`` (per-file ``priorities`` override it).
+        Files that are already waiting are skipped. Returns the paths that
+        were queued, or None if the scheduler has been closed.
+        """
+        priorities = priorities or {}
+        added = []
+        with self._lock:
+            if self._closed:
+                return None
+            for path in file_paths:
+                if path in self._pending:
+                    continue
+                self._pending.add(path)
+                self._incoming.append((path, priorities.get(path, priority)))
+                added.append(path)
+        return added
+
+    def drain(self) -> List[CostEstimate]:
+        """Estimate files queued since the last call and return their estimates."""
+        with self._lock:
+            incoming, self._incoming = self._incoming, []
+        if not incoming:
+            return []
+        estimates = []
+        # Estimasi (stat, baca direktori zip/trailer PDF) dilakukan di luar lock
+        for path, priority in incoming:
+            estimate = estimate_file(path)
+            estimate.priority = priority
+            self.model.predict(estimate)
+            estimates.append(estimate)
+        with self._lock:
+            for estimate in estimates:
+                self.estimates[estimate.path] = estimate
+                heapq.heappush(self._heap, (-estimate.priority, estimate.cost, next(self._sequence), estimate))
+        return estimates
+
+    def ordered_paths(self) -> List[str]:
+        """Estimated files that are still waiting, in the order they will be handed out."""
+        with self._lock:
+            return [entry[3].path for entry in sorted(self._heap)]
+
+    def pop(self) -> Optional[str]:
+        """Next file to check, or None if no estimated file is waiting."""
+        with self._lock:
+            if not self._heap:
+                return None
+            estimate = heapq.heappop(self._heap)[3]
+            self._pending.discard(estimate.path)
+            return estimate.path
+
+    def clear(self) -> List[str]:
+        """Drop every waiting file. Returns the dropped paths in queue order."""
+        with self._lock:
+            dropped = [entry[3].path for entry in sorted(self._heap)] + [path for path, _ in self._incoming]
+            self._incoming = []
+            self._heap = []
+            self._pending.clear()
+            return dropped
+
+    def close_if_empty(self) -> bool:
+        """Stop accepting files if none are waiting; ``add`` then returns None."""
+        with self._lock:
+            if self._incoming or self._heap:
+                return False
+            self._closed = True
+            return True
+
+    def cost(self, path: str) -> float:
+        """Predicted cost (seconds) the file was scheduled with, or 0 if it was never estimated."""
+        estimate = self.estimates.get(path)
+        return estimate.cost if estimate is not None else 0.0
+
+    def record(self, path: str, actual: float):
+        """Store the measured check time of a file and update the cost model."""
+        estimate = self.estimates.get(path)
+        if estimate is None:
+            return
+        self.actuals[path] = actual
+        self.model.observe(estimate, actual)
+
+    def report(self) -> List[Tuple[str, float, float]]:
+        """``(path, predicted, actual)`` for every recorded file, in completion order."""
+        return [(path, self.estimates[path].cost, actual) for path, actual in self.actuals.items()]
+
+    def log_report(self):
+        rows = self.report()
+        if not rows:
+            return
+        errors = [abs(actual - predicted) / actual for _, predicted, actual in rows if actual > 0]
+        mean_error = sum(errors) / len(errors) * 100 if errors else 0.0
+        logger.info(f"Estimasi biaya batch: {len(rows)} berkas, rata-rata galat {mean_error:.0f}%.")
+        for path, predicted, actual in rows:
+            logger.debug("Biaya %s: perkiraan %.3fs, aktual %.3fs", os.path.basename(path), predicted, actual)
+
+
+class Overloaded(Exception):
+    """A job was not admitted by ``FairJobQueue``; retry after ``retry_after`` seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0-100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _Tenant:
+    __slots__ = ("name", "weight", "queue", "running", "last_finish", "waits")
+
+    def __init__(self, name: str, weight: float, window: int):
+        self.name = name
+        self.weight = weight
+        # (start tag, finish tag, waktu masuk antrean, ukuran, item)
+        self.queue: Deque[Tuple[float, float, float, int, Any]] = deque()
+        self.running = 0
+        self.last_finish = 0.0
+        self.waits: Deque[float] = deque(maxlen=window)
+
+
+class FairJobQueue:
+    """
+    Weighted fair job queue shared by several tenants (service mode).
+
+    Uses start-time fair queueing: every job gets a virtual start tag of
+    ``max(virtual time, finish tag of the tenant's previous job)`` and
+    advances its tenant by ``cost / weight``; ``take`` hands out the
+    waiting job with the smallest start tag. A tenant that queues
+    thousands of files therefore only gets its weighted share, and a
+    single file of another tenant waits at most about one job per tenant.
+
+    Admission control: a tenant runs at most ``max_running`` jobs at once
+    and may have ``max_queued`` waiting; the whole queue holds at most
+    ``max_queued_total`` jobs and, if set, ``max_queued_size`` in total
+    ``size`` of the waiting jobs (e.g. upload bytes kept in memory until a
+    job runs; a job is always admitted into an empty queue). ``submit`` raises ``Overloaded`` with an estimated
+    ``retry_after`` instead of queueing beyond that. Queue wait times of
+    the last ``window`` jobs are kept for ``stats``.
+
+    A tenant with nothing queued or running is forgotten as soon as the
+    virtual time has passed its last finish tag (it would restart from the
+    virtual time anyway), so one-off clients do not accumulate. When the
+    queue runs empty the virtual time jumps to the largest finish tag, as
+    in SFQ for an idle server.
+    """
+
+    def __init__(self, workers: int = 1, max_running: int = 2, max_queued: int = 100,
+                 max_queued_total: int = 1000, weights: Dict[str, float] = None,
+                 default_weight: float = 1.0, window: int = 1000, max_queued_size: int = None):
+        self.workers = max(1, workers)
+        self.max_running = max(1, max_running)
+        self.max_queued = max_queued
+        self.max_queued_total = max_queued_total
+        self.max_queued_size = max_queued_size
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.window = window
+        self._tenants: Dict[str, _Tenant] = {}
+        # Tenant menganggur yang finish tag-nya masih di depan waktu virtual; dihapus saat terlewati
+        self._idle: Dict[str, _Tenant] = {}
+        self._queued = 0
+        self._queued_size = 0
+        self._running = 0
+        self._virtual_time = 0.0
+        # Rata-rata bergerak lama pemeriksaan satu job (detik), untuk Retry-After
+        self._service_time = 1.0
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _tenant(self, name: str, weight: float = None) -> _Tenant:
+        tenant = self._tenants.get(name)
+        if tenant is not None:
+            self._idle.pop(name, None)
+        else:
+            tenant = _Tenant(name, self.weights.get(name, self.default_weight), self.window)
+            self._tenants[name] = tenant
+        if weight is not None:
+            tenant.weight = weight
+        return tenant
+
+    def _release(self, state: _Tenant):
+        """Forget ``state`` if it is idle, or remember it until the virtual time passes it."""
+        if state.queue or state.running:
+            return
+        if state.last_finish <= self._virtual_time:
+            self._tenants.pop(state.name, None)
+            self._idle.pop(state.name, None)
+        else:
+            self._idle[state.name] = state
+
+    def _evict_idle(self):
+        for state in [state for state in self._idle.values() if state.last_finish <= self._virtual_time]:
+            del self._idle[state.name]
+            del self._tenants[state.name]
+
+    def _retry_after(self, jobs_ahead: int, slots: int) -> int:
+        return max(1, math.ceil(jobs_ahead * self._service_time / max(1, slots)))
+
+    def submit(self, tenant: str, item: Any, cost: float = 1.0, weight: float = None, size: int = 0):
+        """
+        Queue ``item`` for ``tenant``; raises ``Overloaded`` if it is not
+        admitted. ``size`` counts against ``max_queued_size`` until the job is taken.
+        """
+        with self._condition:
+            if self._closed:
+                raise Overloaded("closed", self._retry_after(1, 1))
+            state = self._tenant(tenant, weight)
+            if len(state.queue) >= self.max_queued:
+                error = Overloaded("tenant_queue_full",
+                                   self._retry_after(len(state.queue), min(self.max_running, self.workers)))
+            elif self._queued >= self.max_queued_total:
+                error = Overloaded("queue_full", self._retry_after(self._queued, self.workers))
+            elif (self.max_queued_size is not None and self._queued
+                  and self._queued_size + size > self.max_queued_size):
+                error = Overloaded("queue_size_full", self._retry_after(self._queued, self.workers))
+            else:
+                error = None
+            if error is not None:
+                # Tenant baru yang ditolak tidak boleh tertinggal di tabel
+                self._release(state)
+                raise error
+            start = max(self._virtual_time, state.last_finish)
+            state.last_finish = start + max(cost, 1e-6) / max(state.weight, 1e-6)
+            state.queue.append((start, state.last_finish, time.monotonic(), size, item))
+            self._queued += 1
+            self._queued_size += size
+            self._condition.notify()
+
+    def _next_tenant(self) -> Optional[_Tenant]:
+        best = None
+        for state in self._tenants.values():
+            if state.queue and state.running < self.max_running:
+                if best is None or state.queue[0][0] < best.queue[0][0]:
+                    best = state
+        return best
+
+    def take(self, timeout: float = None) -> Optional[Tuple[str, Any]]:
+        """
+        Next ``(tenant, item)`` to run, waiting up to ``timeout`` seconds;
+        None on timeout or after ``close``. Call ``done`` when it finished.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                state = self._next_tenant()
+                if state is not None:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            start, _, queued_at, size, item = state.queue.popleft()
+            self._queued -= 1
+            self._queued_size -= size
+            if start > self._virtual_time:
+                self._virtual_time = start
+                self._evict_idle()
+            state.running += 1
+            self._running += 1
+            wait = time.monotonic() - queued_at
+            state.waits.append(wait)
+            self._waits.append(wait)
+            return state.name, item
+
+    def done(self, tenant: str, duration: float = None):
+        """A job taken for ``tenant`` finished after ``duration`` seconds."""
+        with self._condition:
+            state = self._tenants.get(tenant)
+            if state is not None and state.running > 0:
+                state.running -= 1
+                self._running -= 1
+                self._release(state)
+                if not self._queued and not self._running and self._idle:
+                    # Antrean kosong: waktu virtual maju ke finish tag terbesar, semua tenant menganggur dilepas
+                    self._virtual_time = max(state.last_finish for state in self._idle.values())
+                    self._evict_idle()
+            if duration is not None and duration >= 0:
+                self._service_time = 0.8 * self._service_time + 0.2 * duration
+            # Slot tenant ini bebas lagi: job berikutnya mungkin sekarang boleh jalan
+            self._condition.notify_all()
+
+    def close(self):
+        """Wake every waiting ``take``; no more jobs are handed out or admitted."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._queued
+
+    def stats(self) -> Dict[str, Any]:
+        """Queued/running jobs and queue wait percentiles (seconds), overall and per tenant."""
+        def waits(values):
+            values = sorted(values)
+            return {f"p{q}": percentile(values, q) for q in (50, 90, 99)}
+
+        with self._condition:
+            return {
+                "queued": self._queued,
+                "queued_size": self._queued_size,
+                "running": self._running,
+                "service_time": self._service_time,
+                "wait": waits(self._waits),
+                "tenants": {
+                    state.name: {
+                        "weight": state.weight,
+                        "queued": len(state.queue),
+                        "running": state.running,
+                        "wait": waits(state.waits),
+                    }
+                    for state in self._tenants.values()
+                },
+            }
@@ -0,0 +1,369 @@
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from core import metrics, tracing
+from core.cancellation import CancellationToken
+from core.issues import (
+    CheckResult,
+    ERROR_CHECK, ERROR_TIMEOUT, ERROR_CRASHED, ERROR_MEMORY,
+    STATUS_TIMEOUT, STATUS_CRASHED, STATUS_MEMORY_LIMIT,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource  # Hanya tersedia di POSIX
+except ImportError:
+    resource = None
+
+# Penanda yang dikirim worker bila pemeriksaan gagal karena MemoryError
+_MEMORY_EXCEEDED = "memory_limit"
+
+
+class SettingsSnapshot:
+    """
+    Picklable, read-only stand-in for QSettings.
+
+    Worker processes cannot share the GUI's QSettings object, so they receive
+    a plain copy of its values and read it through the same ``value()`` API.
+    """
+
+    def __init__(self, values: Dict[str, Any]):
+        self._values = dict(values)
+
+    @classmethod
+    def from_settings(cls, settings) -> "SettingsSnapshot":
+        values = {}
+        for key in settings.allKeys():
+            value = settings.value(key)
+            # Hanya nilai sederhana; geometri jendela dsb. tidak dibutuhkan worker
+            if isinstance(value, (str, int, float, bool)):
+                values[key] = value
+        return cls(values)
+
+    @classmethod
+    def of(cls, settings) -> "SettingsSnapshot":
+        """Snapshot of QSettings, a plain dict, or the default rules for None."""
+        if settings is None:
+            return cls({})
+        if isinstance(settings, dict):
+            return cls(settings)
+        if isinstance(settings, SettingsSnapshot):
+            return settings
+        return cls.from_settings(settings)
+
+    def value(self, key: str, default: Any = None, type: type = None) -> Any:
+        value = self._values.get(key, default)
+        if type is not None and value is not None and not isinstance(value, type):
+            if type is bool:
+                value = str(value).lower() in ('true', '1', 't', 'y', 'yes')
+            else:
+                try:
+                    value = type(value)
+                except (TypeError, ValueError):
+                    value = default
+        return value
+
+    def allKeys(self) -> List[str]:
+        return list(self._values)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self._values)
+
+
+def _apply_memory_limit(memory_limit_mb: int):
+    """Cap the address space of the current process (POSIX only)."""
+    if memory_limit_mb <= 0:
+        return
+    if resource is None:
+        logger.warning("Batas memori worker tidak didukung pada platform ini, batas diabaikan.")
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker_main(conn, settings_values: Dict[str, Any], memory_limit_mb: int, log_queue, log_level: int,
+                 cancel_event, trace: bool = False):
+    """Entry point of a supervised worker process: check files received over ``conn``."""
+    if hasattr(os, "setpgrp"):
+        # Grup proses sendiri: proses rentang halaman PDF worker ini ikut dihentikan oleh kill()
+        os.setpgrp()
+    from core.logger_config import configure_worker_logging
+    configure_worker_logging(log_queue, log_level)
+    _apply_memory_limit(memory_limit_mb)
+    if trace:
+        tracing.start(f"Worker {os.getpid()}")
+
+    from core.checker import Checker
+    checker = Checker(SettingsSnapshot(settings_values))
+    cancel = CancellationToken(cancel_event)
+    logger.debug("Worker %d siap.", os.getpid())
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        job_id, path = job
+        try:
+            with tracing.span(os.path.basename(path), path=path):
+                result = checker.check_file(path, cancel).compact()
+        except MemoryError:
+            # Heap proses ini tidak lagi dapat dipercaya; laporkan lalu keluar agar diganti
+            conn.send((job_id, _MEMORY_EXCEEDED))
+            break
+        except Exception as e:
+            result = CheckResult.error(os.path.basename(path), ERROR_CHECK, e)
+            metrics.record_check(path, result)
+        # Metrik dan span trace worker dikirim bersama hasil dan digabung di proses induk
+        conn.send((job_id, result, metrics.worker_metrics(), tracing.drain()))
+
+
+class SupervisedWorker:
+    """One worker process plus the job it is currently running."""
+
+    def __init__(self, pool: "SupervisedPool"):
+        self.pool = pool
+        self.job_id = None
+        self.path: Optional[str] = None
+        self.started_at = 0.0
+        parent_conn, child_conn = pool.mp_context.Pipe()
+        self.conn = parent_conn
+        self.process = pool.mp_context.Process(
+            target=_worker_main,
+            args=(child_conn, pool.settings_values, pool.memory_limit_mb, pool.log_queue, pool.log_level,
+                  pool.cancel_token.event, pool.trace),
+            name="DocCheckWorker",
+            # Bukan daemon: worker boleh membuat proses anak sendiri
+            daemon=False,
+        )
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def busy(self) -> bool:
+        return self.job_id is not None
+
+    def submit(self, job_id, path: str):
+        self.job_id = job_id
+        self.path = path
+        self.started_at = time.monotonic()
+        self.conn.send((job_id, path))
+
+    def release(self) -> Tuple[Any, str]:
+        job = (self.job_id, self.path)
+        self.job_id = None
+        self.path = None
+        return job
+
+    def kill(self):
+        """Kill the worker and the processes it started (POSIX: its whole process group)."""
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass  # Grup belum dibuat (worker baru mulai) atau sudah kosong
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        """Ask an idle worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=2)
+        self.kill()
+
+
+class SupervisedPool:
+    """
+    Pool of isolated worker processes with a per-file wall-clock timeout and
+    an address-space (RLIMIT_AS) cap.
+
+    A worker that crashes, times out or runs out of memory is replaced and its
+    file is reported as a ``CheckResult`` with the matching status, so the
+    rest of the batch continues. Jobs are submitted with ``submit`` and
+    finished results are picked up with ``collect``; all calls must come from
+    the same thread.
+
+    ``cancel_token`` (created with ``CancellationToken.shared``) is shared
+    with every worker; setting it makes running checks return their partial
+    results at the next paragraph or page.
+    """
+
+    def __init__(self, settings, size: int, timeout: float = 120.0, memory_limit_mb: int = 2048,
+                 cancel_token: CancellationToken = None):
+        from core.logger_config import worker_log_queue
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.cancel_token = cancel_token or CancellationToken.shared(self.mp_context)
+        self.settings_values = (
+            settings.as_dict() if isinstance(settings, SettingsSnapshot)
+            else SettingsSnapshot.from_settings(settings).as_dict()
+        )
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.log_queue = worker_log_queue(self.mp_context)
+        self.log_level = logging.root.level
+        # Worker ikut mencatat span bila penelusuran aktif saat pool dibuat
+        self.trace = tracing.enabled()
+        self.restarts = 0
+        self.target_size = max(1, size)
+        self.workers: List[SupervisedWorker] = [SupervisedWorker(self) for _ in range(self.target_size)]
+        logger.info(f"SupervisedPool dimulai: {len(self.workers)} worker, batas waktu {timeout}s, batas memori {memory_limit_mb} MB.")
+
+    @property
+    def size(self) -> int:
+        return len(self.workers)
+
+    @property
+    def busy_count(self) -> int:
+        return sum(1 for worker in self.workers if worker.busy)
+
+    def has_idle(self) -> bool:
+        return self.busy_count < self.target_size and any(not worker.busy for worker in self.workers)
+
+    def running_paths(self) -> List[str]:
+        return [worker.path for worker in self.workers if worker.busy]
+
+    def worker_pids(self) -> List[int]:
+        return [worker.process.pid for worker in self.workers if worker.process.pid is not None]
+
+    def resize(self, size: int):
+        """
+        Change the number of workers. Growing starts new processes at once;
+        when shrinking, busy workers finish their current file before they stop.
+        """
+        size = max(1, size)
+        if size == self.target_size:
+            return
+        logger.debug("SupervisedPool diubah ukurannya: %d -> %d worker", self.target_size, size)
+        self.target_size = size
+        while len(self.workers) < size:
+            self.workers.append(SupervisedWorker(self))
+        self._trim()
+
+    def _trim(self):
+        for worker in [worker for worker in self.workers if not worker.busy]:
+            if len(self.workers) <= self.target_size:
+                break
+            self.workers.remove(worker)
+            worker.stop()
+
+    def submit(self, job_id, path: str) -> bool:
+        """Send a file to an idle worker. Returns False if all workers are busy."""
+        if self.busy_count >= self.target_size:
+            return False
+        for index, worker in enumerate(self.workers):
+            if worker.busy:
+                continue
+            if not worker.process.is_alive():
+                worker = self._replace(index)
+            worker.submit(job_id, path)
+            return True
+        return False
+
+    def _replace(self, index: int) -> SupervisedWorker:
+        self.workers[index].kill()
+        self.restarts += 1
+        metrics.WORKER_RESTARTS.inc()
+        self.workers[index] = SupervisedWorker(self)
+        return self.workers[index]
+
+    def _fail(self, index: int, code: str, status: str, value: Any) -> Tuple[Any, str, CheckResult]:
+        worker = self.workers[index]
+        elapsed = time.monotonic() - worker.started_at
+        job_id, path = worker.release()
+        result = CheckResult.error(os.path.basename(path), code, value, status=status).compact()
+        # Worker tidak sempat melaporkan berkas ini; dicatat di sini
+        metrics.record_check(path, result, seconds=elapsed)
+        self._replace(index)
+        return job_id, path, result
+
+    def collect(self, timeout: float = 0.1) -> List[Tuple[Any, str, CheckResult]]:
+        """
+        Wait up to ``timeout`` seconds for finished jobs.
+
+        Returns ``(job_id, path, result)`` tuples, including synthetic results
+        for workers that crashed, timed out or exceeded the memory limit.
+        """
+        busy = [(index, worker) for index, worker in enumerate(self.workers) if worker.busy]
+        if not busy:
+            return []
+
+        now = time.monotonic()
+        if self.timeout > 0:
+            nearest_deadline = min(worker.started_at + self.timeout for _, worker in busy)
+            timeout = max(0.0, min(timeout, nearest_deadline - now))
+
+        waitables = {}
+        for index, worker in busy:
+            waitables[worker.conn] = index
+            waitables[worker.process.sentinel] = index
+        ready = wait(list(waitables), timeout)
+
+        finished = []
+        handled = set()
+        for obj in ready:
+            index = waitables[obj]
+            if index in handled:
+                continue
+            handled.add(index)
+            worker = self.workers[index]
+            try:
+                if not worker.conn.poll():
+                    raise EOFError
+                job_id, payload, *worker_data = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(timeout=1)
+                exitcode = worker.process.exitcode
+                logger.error(f"Worker {worker.process.pid} berhenti tidak normal (kode {exitcode}) saat memeriksa {worker.path}")
+                finished.append(self._fail(index, ERROR_CRASHED, STATUS_CRASHED, exitcode))
+                continue
+
+            if payload == _MEMORY_EXCEEDED:
+                logger.error(f"Worker {worker.process.pid} melebihi batas memori saat memeriksa {worker.path}")
+                finished.append(self._fail(index, ERROR_MEMORY, STATUS_MEMORY_LIMIT, self.memory_limit_mb))
+                continue
+
+            if worker_data:
+                worker_metrics, worker_trace = worker_data
+                metrics.REGISTRY.merge(worker_metrics)
+                tracing.merge(worker_trace)
+            _, path = worker.release()
+            finished.append((job_id, path, payload))
+
+        if self.timeout > 0:
+            now = time.monotonic()
+            for index, worker in busy:
+                if index in handled or not worker.busy:
+                    continue
+                if now - worker.started_at > self.timeout:
+                    logger.error(f"Worker {worker.process.pid} melebihi batas waktu {self.timeout}s saat memeriksa {worker.path}")
+                    finished.append(self._fail(index, ERROR_TIMEOUT, STATUS_TIMEOUT, self.timeout))
+
+        # Worker yang berlebih setelah resize() berhenti begitu berkasnya selesai
+        if len(self.workers) > self.target_size:
+            self._trim()
+        return finished
+
+    def close(self):
+        """Stop all workers; running jobs are abandoned."""
+        for worker in self.workers:
+            if worker.busy:
+                worker.kill()
+            else:
+                worker.stop()
+        self.workers = []
@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Penelusuran aktif di proses ini; None = mati (span tidak mencatat apa pun)
+_tracer: Optional["Tracer"] = None
+
+
+class Tracer:
+    """
+    Collects spans as Chrome trace events (``"ph": "X"``) for one process.
+
+    Timestamps are wall-clock microseconds measured with ``perf_counter``
+    from a calibration point, so spans of worker processes line up with
+    the parent's. Every process is one track group (named by ``name``) and
+    every thread one track within it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pid = os.getpid()
+        self.events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._wall_us = time.time() * 1e6
+        self._perf = time.perf_counter()
+
+    def timestamp(self, perf: float) -> float:
+        """Trace timestamp (µs) of a ``time.perf_counter()`` value."""
+        return self._wall_us + (perf - self._perf) * 1e6
+
+    def add(self, name: str, started: float, duration: float, category: str = "check", **args: Any):
+        """Record a span that started at ``perf_counter`` value ``started``."""
+        thread = threading.current_thread()
+        event = {
+            "name": name, "cat": category, "ph": "X",
+            "ts": round(self.timestamp(started), 1), "dur": round(duration * 1e6, 1),
+            "pid": self.pid, "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            self._threads.setdefault(thread.ident, thread.name)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Recorded events including track names, which are then cleared (for worker processes)."""
+        with self._lock:
+            events, self.events = self.events, []
+            threads = dict(self._threads)
+        return self._metadata(self.pid, self.name, threads) + events
+
+    @staticmethod
+    def _metadata(pid: int, name: str, threads: Dict[int, str]) -> List[Dict[str, Any]]:
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}}]
+        for tid, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        return events
+
+    def merge(self, events: List[Dict[str, Any]]):
+        """Add events drained from another process."""
+        with self._lock:
+            self.events.extend(events)
+
+    def write(self, path: str):
+        """Write the trace as Chrome trace-event JSON (Perfetto, chrome://tracing)."""
+        with self._lock:
+            events = self._metadata(self.pid, self.name, self._threads) + self.events
+        # Metadata worker yang sama dapat datang bersama setiap hasil; cukup sekali
+        seen = set()
+        unique = []
+        for event in events:
+            if event["ph"] == "M":
+                key = (event["name"], event["pid"], event["tid"])
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(event)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": unique, "displayTimeUnit": "ms"}, f)
+        os.replace(temp_path, path)
+        logger.info(f"Trace {len(unique)} event ditulis ke {path}")
+
+
+def start(name: str = "DocChecker") -> Tracer:
+    """Start tracing in this process (replacing a running trace)."""
+    global _tracer
+    _tracer = Tracer(name)
+    return _tracer
+
+
+def stop() -> Optional[Tracer]:
+    """Stop tracing; returns the tracer with the recorded events."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def record(name: str, started: float, duration: float, **args: Any):
+    """Record a span measured elsewhere (``started`` from ``perf_counter``) if tracing is on."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add(name, started, duration, **args)
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Iterator[None]:
+    """Trace the ``with`` block as a span; costs a single check when tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add(name, started, time.perf_counter() - started, **args)
+
+
+def drain() -> Optional[List[Dict[str, Any]]]:
+    """Events of this (worker) process to send to the parent, or None if tracing is off."""
+    tracer = _tracer
+    return tracer.drain() if tracer is not None else None
+
+
+def merge(events: Optional[List[Dict[str, Any]]]):
+    """Add events sent by a worker process to the running trace."""
+    tracer = _tracer
+    if tracer is not None and events:
+        tracer.merge(events)
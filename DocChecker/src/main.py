@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt, QSettings
 from PySide6.QtGui import QGuiApplication, QIcon
@@ -6,6 +7,7 @@ from PySide6.QtGui import QGuiApplication, QIcon
 from ui.main_window import MainWindow
 from ui.theme_manager import ThemeManager
 from ui.language_manager import LanguageManager
+from core import metrics
 
 def main():
     # Modern high DPI handling for Qt 6.5+
@@ -35,6 +37,9 @@ def main():
     # Initialize settings
     settings = QSettings("MDC-2025", "Document Checker")
     
+    # Metrik sesi (format teks Prometheus) ditulis saat aplikasi ditutup, bila berkasnya diatur
+    metrics.dump_on_exit(settings.value("metrics/file", "", type=str))
+    
     # Initialize language manager and apply language (before UI is created)
     language_manager = LanguageManager(settings)
     translations = language_manager.apply_language()
@@ -51,4 +56,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Diperlukan agar worker pemeriksa (multiprocessing spawn) berjalan pada build Windows yang dibekukan
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -1,6 +1,8 @@
 import os
 from PySide6.QtCore import QObject, Signal, QSettings
 
+from core.messages import render_issue, render_messages
+
 class LanguageManager(QObject):
     """
     Centralized language manager for the application.
@@ -52,6 +54,18 @@ class LanguageManager(QObject):
         # Return the key itself if no translation found
         return key
     
+    def render_issue(self, result, issue) -> str:
+        """
+        Render an issue message of a CheckResult in the current language.
+        Rendered strings are cached in core.messages, so switching language
+        only re-renders, it never requires re-checking the document.
+        """
+        return render_issue(result, issue, self.current_language)
+    
+    def render_messages(self, result) -> list:
+        """All messages of a CheckResult in the current language"""
+        return render_messages(result, self.current_language)
+    
     def _load_indonesian(self):
         """Load Indonesian translations"""
         return {
@@ -69,8 +83,10 @@ class LanguageManager(QObject):
             
             # Buttons
             "add_files": "Tambah Berkas",
+            "add_folder": "Tambah Folder",
             "clear_all": "Hapus Semua",
             "check_all_files": "Periksa Semua Berkas",
+            "check_profiles": "Periksa Semua Profil",
             
             # Results view
             "summary": "Ringkasan",
@@ -114,6 +130,21 @@ class LanguageManager(QObject):
             "batch_processing": "Pemrosesan Batch",
             "auto_save_reports": "Simpan laporan otomatis setelah pemrosesan batch",
             "report_folder": "Folder laporan",
+            "isolate_workers": "Periksa setiap berkas di proses terpisah",
+            "file_timeout": "Batas waktu per berkas",
+            "memory_limit": "Batas memori per worker",
+            "no_limit": "Tanpa batas",
+            "max_workers": "Worker maksimum",
+            "memory_budget": "Anggaran memori batch",
+            "automatic": "Otomatis",
+            "pdf_split_threshold": "Bagi PDF besar mulai",
+            "pdf_split_chunk": "Halaman per bagian",
+            "scan_include": "Sertakan pola",
+            "scan_exclude": "Abaikan pola",
+            "scan_check_immediately": "Langsung periksa berkas dari folder",
+            "feature_cache": "Simpan hasil parsing dokumen (cache fitur)",
+            "feature_cache_size": "Ukuran cache maksimum",
+            "clear_cache": "Kosongkan",
             "browse": "Jelajahi...",
             "developer": "Pengembang",
             "logging": "Pencatatan log",
@@ -127,6 +158,8 @@ class LanguageManager(QObject):
             
             # Margin rules
             "margin_rules": "Aturan Margin (cm)",
+            "rule_profiles": "Profil Aturan",
+            "profile_files": "Berkas Profil",
             "left_margin": "Margin Kiri",
             "right_margin": "Margin Kanan",
             "top_margin": "Margin Atas",
@@ -180,8 +213,10 @@ class LanguageManager(QObject):
             
             # Buttons
             "add_files": "Add Files",
+            "add_folder": "Add Folder",
             "clear_all": "Clear All",
             "check_all_files": "Check All Files",
+            "check_profiles": "Check All Profiles",
             
             # Results view
             "summary": "Summary",
@@ -225,6 +260,21 @@ class LanguageManager(QObject):
             "batch_processing": "Batch Processing",
             "auto_save_reports": "Auto-save reports after batch processing",
             "report_folder": "Report folder",
+            "isolate_workers": "Check each file in a separate process",
+            "file_timeout": "Time limit per file",
+            "memory_limit": "Memory limit per worker",
+            "no_limit": "No limit",
+            "max_workers": "Maximum workers",
+            "memory_budget": "Batch memory budget",
+            "automatic": "Automatic",
+            "pdf_split_threshold": "Split large PDFs from",
+            "pdf_split_chunk": "Pages per range",
+            "scan_include": "Include patterns",
+            "scan_exclude": "Ignore patterns",
+            "scan_check_immediately": "Check files from folders right away",
+            "feature_cache": "Keep parsed document data (feature cache)",
+            "feature_cache_size": "Maximum cache size",
+            "clear_cache": "Clear",
             "browse": "Browse...",
             "developer": "Developer",
             "logging": "Logging",
@@ -238,6 +288,8 @@ class LanguageManager(QObject):
             
             # Margin rules
             "margin_rules": "Margin Rules (cm)",
+            "rule_profiles": "Rule Profiles",
+            "profile_files": "Profile Files",
             "left_margin": "Left Margin",
             "right_margin": "Right Margin",
             "top_margin": "Top Margin",
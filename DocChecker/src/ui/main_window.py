@@ -1,5 +1,8 @@
+import multiprocessing
 import os
 import sys
+import threading
+import time
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QFileDialog, QProgressBar,
@@ -16,83 +19,323 @@ from PySide6.QtGui import QFont, QIcon, QDrag, QDragEnterEvent, QDropEvent
 from ui.widgets.file_list_widget import FileListWidget
 from ui.widgets.results_view import ResultsView
 from ui.widgets.settings_dialog import SettingsDialog
-from ui.widgets.batch_progress_dialog import BatchProgressDialog
+from ui.widgets.queue_panel import QueuePanel
 
 from core.document_checker import DocumentChecker, CheckResult
+from core.issues import ERROR_CHECK, NOTE_CANCELLED, NOTE_NOT_CHECKED, STATUS_CANCELLED
+from core.cancellation import CancellationToken
+from core.folder_scanner import FolderScanner
+from core.profiles import ProfileStore, VerdictMatrix
+from core.supervisor import SupervisedPool
+from core.scheduler import BatchScheduler, CostModel
+from core.concurrency import ConcurrencyController
+from core.progress import BatchProgress
+from core import memory_diagnostics, metrics, tracing
 from core.logger_config import setup_logging
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Batas waktu (detik) menunggu hasil parsial worker setelah dibatalkan sebelum worker dihentikan paksa
+CANCEL_GRACE_SECONDS = 2.0
+
 # Worker class untuk menangani pemrosesan batch dalam thread terpisah
 class BatchProcessWorker(QRunnable):
     """
-    Worker thread untuk memproses batch dokumen.
+    Worker thread untuk memproses antrean dokumen.
     
     Menggunakan QRunnable untuk kompatibilitas dengan QThreadPool, yang
     menyediakan manajemen thread yang lebih baik dibandingkan QThread langsung.
+    Berkas dapat ditambahkan ke antrean selama worker berjalan (``enqueue``);
+    worker selesai setelah antrean kosong dan semua berkas selesai diperiksa.
     """
     
     class WorkerSignals(QObject):
         """
         Mendefinisikan sinyal yang tersedia dari worker thread.
         """
-        progress = Signal(int, int, str)  # current, total, current_filename
-        result = Signal(object)  # hasil pemeriksaan
+        result = Signal(str, object)  # path berkas, hasil pemeriksaan
         finished = Signal(list)  # semua hasil batch
         error = Signal(str)  # pesan error
+        concurrency = Signal(int, int, float, int)  # aktif, batas worker, RSS worker (MB), anggaran memori (MB)
         
-    def __init__(self, document_checker, file_paths):
+    def __init__(self, document_checker, file_paths=(), settings=None,
+                 cost_model=None, priorities=None, priority=0):
         super().__init__()
         self.signals = self.WorkerSignals()
         self.document_checker = document_checker
-        self.file_paths = file_paths
         self.is_cancelled = False
         
+        # Progres dibaca (polling) oleh panel antrean; worker tidak mengirim sinyal progres per berkas
+        self.progress = BatchProgress()
+        
+        # Antrean shortest-job-first; estimasi biaya dihitung di thread worker, bukan thread GUI
+        self.scheduler = BatchScheduler(model=cost_model)
+        # Berkas awal masuk antrean sebelum worker dimulai; antrean kosong akan langsung menutup worker
+        self.added = self.scheduler.add(file_paths, priorities, priority)
+        metrics.QUEUE_DEPTH.set_function(self.scheduler.__len__, queue="batch")
+        
+        # Dijeda: berkas yang sedang diperiksa diselesaikan, berkas baru tidak dimulai
+        self._resume = threading.Event()
+        self._resume.set()
+        
+        # Isolasi proses: setiap berkas diperiksa oleh worker terpisah dengan batas waktu dan memori
+        self.settings = settings
+        self.isolate = settings is not None and settings.value("batch/isolate_workers", True, type=bool)
+        
+        # Token pembatalan diperiksa per paragraf/halaman, juga di dalam proses worker
+        self.cancel_token = (
+            CancellationToken.shared(multiprocessing.get_context("spawn")) if self.isolate
+            else CancellationToken()
+        )
+        
+    def enqueue(self, file_paths, priorities=None, priority=0):
+        """
+        Tambahkan berkas ke antrean yang sedang berjalan. Mengembalikan path
+        yang benar-benar ditambahkan, atau None bila worker sudah selesai.
+        """
+        return self.scheduler.add(file_paths, priorities, priority)
+        
+    def pause(self):
+        self._resume.clear()
+        
+    def resume(self):
+        self._resume.set()
+        
+    @property
+    def paused(self):
+        return not self._resume.is_set()
+        
     def run(self):
         """
         Menjalankan worker thread.
         """
         results = []
-        total = len(self.file_paths)
+        # Penelusuran opsional: timeline Chrome trace per worker untuk menganalisis batch yang lambat
+        trace_file = self.settings.value("trace/file", "", type=str) if self.settings is not None else ""
+        if trace_file:
+            tracing.start()
         
         try:
-            for i, file_path in enumerate(self.file_paths):
-                if self.is_cancelled:
-                    break
-                    
-                # Eksekusi pada thread utama - kirim nama file saat ini ke progress dialog
-                current_filename = os.path.basename(file_path)
-                self.signals.progress.emit(i, total, current_filename)
-                
-                try:
-                    # Periksa file
-                    result = self.document_checker.check_file(file_path)
-                    results.append(result)
-                    self.signals.result.emit(result)
-                    
-                    # Update progress
-                    self.signals.progress.emit(i + 1, total, current_filename)
-                except Exception as e:
-                    error_result = CheckResult(
-                        filename=os.path.basename(file_path),
-                        success=False,
-                        messages=[f"Error: {str(e)}"]
-                    )
-                    results.append(error_result)
-                    self.signals.result.emit(error_result)
-                    self.signals.progress.emit(i + 1, total, current_filename)
+            self.progress.start({})
+            if self.isolate:
+                self._run_supervised(results)
+            else:
+                self._run_in_process(results)
         except Exception as e:
             self.signals.error.emit(str(e))
         finally:
+            # Berkas yang belum dimulai (dibatalkan atau error) tetap dilaporkan, sebagai tidak diperiksa
+            for file_path in self.scheduler.clear():
+                result = CheckResult.error(
+                    os.path.basename(file_path), NOTE_NOT_CHECKED, status=STATUS_CANCELLED).compact()
+                results.append(result)
+                self.signals.result.emit(file_path, result)
+            # Berkas yang ditambahkan setelah ini memulai worker baru
+            self.scheduler.close_if_empty()
+            self.scheduler.log_report()
+            tracer = tracing.stop() if trace_file else None
+            if tracer is not None:
+                try:
+                    tracer.write(trace_file)
+                except OSError as e:
+                    logger.warning(f"Trace tidak dapat ditulis ke {trace_file}: {e}")
             # Selesai, kirim sinyal selesai dengan semua hasil
             self.signals.finished.emit(results)
+            
+    def _take_new_files(self):
+        """Estimasi berkas yang baru masuk antrean dan tambahkan ke progres."""
+        estimates = self.scheduler.drain()
+        if estimates:
+            self.progress.add({estimate.path: estimate.size for estimate in estimates})
+    
+    def _run_in_process(self, results):
+        """Periksa berkas satu per satu di thread ini (tanpa isolasi proses)."""
+        while not self.is_cancelled:
+            self._take_new_files()
+            if self.paused:
+                self._resume.wait(0.1)
+                continue
+            file_path = self.scheduler.pop()
+            if file_path is None:
+                if self.scheduler.close_if_empty():
+                    break
+                continue
+                
+            self.progress.file_started(file_path)
+            try:
+                # Periksa file
+                # Simpan isu dalam bentuk tabel array agar hasil batch besar tetap ringkas
+                started = time.perf_counter()
+                with tracing.span(os.path.basename(file_path), path=file_path):
+                    result = self.document_checker.check_file(file_path, self.cancel_token).compact()
+                if result.status != STATUS_CANCELLED:
+                    self.scheduler.record(file_path, time.perf_counter() - started)
+            except Exception as e:
+                result = CheckResult.error(os.path.basename(file_path), ERROR_CHECK, e)
+            results.append(result)
+            with metrics.stage("sink"):
+                self.signals.result.emit(file_path, result)
+                self.progress.file_done(file_path)
+    
+    def _run_supervised(self, results):
+        """
+        Periksa berkas di proses worker yang diawasi. Berkas yang membuat worker
+        crash, hang, atau kehabisan memori dicatat sebagai hasil error dan worker
+        diganti, sehingga sisa antrean tetap berjalan.
+        """
+        self._take_new_files()
+        started = {}
+        # Jumlah worker disesuaikan selama batch berdasarkan throughput, CPU, dan RSS
+        controller = ConcurrencyController.from_settings(self.settings)
+        pool = SupervisedPool(
+            self.settings,
+            size=min(controller.limit, max(1, len(self.scheduler))),
+            timeout=self.settings.value("batch/file_timeout", 120.0, type=float),
+            memory_limit_mb=self.settings.value("batch/memory_limit_mb", 2048, type=int),
+            cancel_token=self.cancel_token,
+        )
+        reported = None
+        
+        def finish(file_path, result):
+            elapsed = time.perf_counter() - started.pop(file_path)
+            # Waktu pemeriksaan parsial tidak mewakili biaya berkas
+            if result.status != STATUS_CANCELLED:
+                self.scheduler.record(file_path, elapsed)
+            results.append(result)
+            with metrics.stage("sink"):
+                self.signals.result.emit(file_path, result)
+                self.progress.file_done(file_path)
+            
+        try:
+            while not self.is_cancelled:
+                self._take_new_files()
+                if not pool.busy_count and self.scheduler.close_if_empty():
+                    break
+                    
+                # Jangan menambah worker melebihi jumlah berkas yang tersisa
+                limit = controller.update(pool.worker_pids())
+                pool.resize(min(limit, max(1, pool.busy_count + len(self.scheduler))))
+                status = (pool.busy_count, controller.limit, round(controller.rss_mb), controller.memory_budget_mb)
+                if status != reported:
+                    reported = status
+                    self.signals.concurrency.emit(*status)
+                    
+                while not self.paused and pool.has_idle():
+                    file_path = self.scheduler.pop()
+                    if file_path is None:
+                        break
+                    started[file_path] = time.perf_counter()
+                    pool.submit(file_path, file_path)
+                    self.progress.file_started(file_path)
+                    
+                if not pool.busy_count:
+                    # Dijeda tanpa berkas yang berjalan: tunggu dilanjutkan
+                    self._resume.wait(0.1)
+                    continue
+                    
+                for _, file_path, result in pool.collect(timeout=0.1):
+                    # Diukur dalam biaya perkiraan, bukan jumlah berkas: SJF membuat berkas/s turun dengan sendirinya
+                    controller.file_done(self.scheduler.cost(file_path))
+                    finish(file_path, result)
+                    
+            if self.is_cancelled:
+                # Worker berhenti di paragraf/halaman berikutnya dan mengirim hasil parsial
+                deadline = time.monotonic() + CANCEL_GRACE_SECONDS
+                while pool.busy_count and time.monotonic() < deadline:
+                    for _, file_path, result in pool.collect(timeout=0.05):
+                        finish(file_path, result)
+                for file_path in pool.running_paths():
+                    logger.warning(f"Worker tidak merespons pembatalan saat memeriksa {file_path}; dihentikan paksa.")
+                    finish(file_path, CheckResult.error(
+                        os.path.basename(file_path), NOTE_CANCELLED, status=STATUS_CANCELLED).compact())
+        finally:
+            if pool.restarts:
+                logger.warning(f"{pool.restarts} worker diganti selama batch (crash, timeout, atau batas memori).")
+            pool.close()
     
     def cancel(self):
         """
-        Set flag untuk membatalkan operasi.
+        Batalkan antrean. Berkas yang sedang diperiksa berhenti di paragraf atau
+        halaman berikutnya dan dilaporkan sebagai hasil parsial.
         """
         self.is_cancelled = True
+        self.cancel_token.cancel()
+        self._resume.set()
+
+class FolderScanWorker(QRunnable):
+    """
+    Worker thread untuk memindai folder secara rekursif.
+    
+    Berkas yang ditemukan dikirim per chunk melalui sinyal ``files_found``
+    sehingga daftar berkas terisi bertahap tanpa membekukan GUI.
+    """
+    
+    class WorkerSignals(QObject):
+        files_found = Signal(list)  # chunk path berkas
+        finished = Signal(int, int)  # jumlah berkas, duplikat yang dilewati
+        error = Signal(str)
+        
+    def __init__(self, scanner, paths, check_immediately=False):
+        super().__init__()
+        self.signals = self.WorkerSignals()
+        self.scanner = scanner
+        self.paths = list(paths)
+        self.check_immediately = check_immediately
+        # Batch antrean tempat chunk berikutnya ditambahkan (bila langsung diperiksa)
+        self.batch_id = None
+        self.cancel_token = CancellationToken()
+        
+    def run(self):
+        try:
+            for chunk in self.scanner.scan(self.paths, self.cancel_token):
+                self.signals.files_found.emit(chunk)
+        except Exception as e:
+            logger.exception("Pemindaian folder gagal")
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit(self.scanner.files_found, self.scanner.duplicates)
+            
+    def cancel(self):
+        self.cancel_token.cancel()
+
+class ProfileCheckWorker(QRunnable):
+    """
+    Worker thread untuk memeriksa berkas terhadap beberapa profil aturan.
+    
+    Setiap berkas diparsing sekali; semua profil dievaluasi pada fitur
+    dokumen yang sama dan hasilnya dikumpulkan dalam ``VerdictMatrix``.
+    """
+    
+    class WorkerSignals(QObject):
+        progress = Signal(int, int)  # berkas selesai, total
+        finished = Signal(object)  # VerdictMatrix
+        error = Signal(str)
+        
+    def __init__(self, document_checker, file_paths, profiles):
+        super().__init__()
+        self.signals = self.WorkerSignals()
+        self.document_checker = document_checker
+        self.file_paths = list(file_paths)
+        self.profiles = list(profiles)
+        self.cancel_token = CancellationToken()
+        
+    def run(self):
+        matrix = VerdictMatrix(profile.name for profile in self.profiles)
+        try:
+            for index, file_path in enumerate(self.file_paths):
+                if self.cancel_token.cancelled:
+                    break
+                matrix.add(file_path, self.document_checker.check_profiles(file_path, self.profiles, self.cancel_token))
+                self.signals.progress.emit(index + 1, len(self.file_paths))
+        except Exception as e:
+            logger.exception("Pemeriksaan profil gagal")
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit(matrix)
+            
+    def cancel(self):
+        self.cancel_token.cancel()
 
 class MainWindow(QMainWindow):
     def __init__(self, language_manager=None, theme_manager=None):
@@ -114,12 +357,16 @@ class MainWindow(QMainWindow):
         self.document_checker = DocumentChecker(self.settings)
         self.old_document_checker = None # Untuk menyimpan referensi lama saat settings berubah
         
+        # Thread pool hanya menjalankan koordinator batch; jumlah worker pemeriksa
+        # diatur secara adaptif oleh ConcurrencyController selama batch berjalan
         self.thread_pool = QThreadPool.globalInstance()
-        # Mengatur jumlah maksimum thread berdasarkan jumlah core CPU
-        optimal_thread_count = max(2, QThreadPool.globalInstance().maxThreadCount() // 2)
-        self.thread_pool.setMaxThreadCount(optimal_thread_count)
+        # Model biaya untuk urutan batch, disetel dari waktu pemeriksaan sebelumnya
+        self.cost_model = CostModel.load(self.settings)
         
         self.current_worker = None
+        self.batch_counter = 0
+        self.folder_scans = []
+        self.profile_worker = None
         
         self.setWindowTitle("MetastroDocChecker 2025 (MDC-2025)")
         self.setMinimumSize(1000, 700)
@@ -155,6 +402,14 @@ class MainWindow(QMainWindow):
         self.content_splitter.addWidget(self.right_panel)
         self.content_splitter.setSizes([300, 700])
         
+        # Background check queue, docked below the main content
+        self.queue_panel = QueuePanel(self)
+        self.queue_panel.pause_toggled.connect(self._toggle_batch_pause)
+        self.queue_panel.cancel_requested.connect(self._cancel_batch_processing)
+        self.queue_panel.result_selected.connect(self.results_view.display_result)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.queue_panel)
+        self.queue_panel.hide()
+        
         # Setup status bar at the bottom
         self.statusBar().showMessage("Siap")
         
@@ -236,16 +491,20 @@ class MainWindow(QMainWindow):
         drop_instruction = "Drop your DOCX or PDF files here\nor click to browse files"
         selected_files_text = "Selected Files"
         add_files_text = "Add Files"
+        add_folder_text = "Add Folder"
         clear_all_text = "Clear All"
         check_all_text = "Check All Files"
+        check_profiles_text = "Check All Profiles"
         
         if hasattr(self, "language_manager") and self.language_manager is not None:
             drag_drop_text = self.language_manager.translate("drag_drop")
             drop_instruction = self.language_manager.translate("drop_instruction")
             selected_files_text = self.language_manager.translate("selected_files")
             add_files_text = self.language_manager.translate("add_files")
+            add_folder_text = self.language_manager.translate("add_folder")
             clear_all_text = self.language_manager.translate("clear_all")
             check_all_text = self.language_manager.translate("check_all_files")
+            check_profiles_text = self.language_manager.translate("check_profiles")
         
         # File drop area group with modern styling
         self.drop_group = QGroupBox(drag_drop_text)
@@ -284,11 +543,16 @@ class MainWindow(QMainWindow):
         self.add_file_btn.setObjectName("secondary")
         self.add_file_btn.clicked.connect(self._open_file_dialog)
         
+        self.add_folder_btn = QPushButton(add_folder_text)
+        self.add_folder_btn.setObjectName("secondary")
+        self.add_folder_btn.clicked.connect(self._open_folder_dialog)
+        
         self.clear_files_btn = QPushButton(clear_all_text)
         self.clear_files_btn.setObjectName("secondary")
         self.clear_files_btn.clicked.connect(self.file_list.clear)
         
         btn_layout.addWidget(self.add_file_btn)
+        btn_layout.addWidget(self.add_folder_btn)
         btn_layout.addWidget(self.clear_files_btn)
         file_layout.addLayout(btn_layout)
         
@@ -296,6 +560,11 @@ class MainWindow(QMainWindow):
         self.check_files_btn.clicked.connect(self._check_all_files)
         file_layout.addWidget(self.check_files_btn)
         
+        self.check_profiles_btn = QPushButton(check_profiles_text)
+        self.check_profiles_btn.setObjectName("secondary")
+        self.check_profiles_btn.clicked.connect(self._check_all_profiles)
+        file_layout.addWidget(self.check_profiles_btn)
+        
         # Add to left panel
         self.left_layout.addWidget(self.drop_group)
         self.left_layout.addWidget(self.file_group, 1)
@@ -362,9 +631,45 @@ class MainWindow(QMainWindow):
         )
         
         if file_paths:
-            self.file_list.add_files(file_paths)
+            self._add_files(file_paths)
             logger.info(f"{len(file_paths)} file ditambahkan dari dialog.")
             
+    def _open_folder_dialog(self):
+        """Select a folder whose documents are added recursively"""
+        folder = QFileDialog.getExistingDirectory(self, "Pilih Folder")
+        if folder:
+            self._scan_folders([folder])
+            
+    def _scan_folders(self, folders):
+        """Scan folders on a background thread and add the documents found in chunks"""
+        worker = FolderScanWorker(
+            FolderScanner.from_settings(self.settings),
+            folders,
+            check_immediately=self.settings.value("scan/check_immediately", False, type=bool),
+        )
+        worker.signals.files_found.connect(lambda chunk: self._add_scanned_files(worker, chunk))
+        worker.signals.finished.connect(lambda found, duplicates: self._folder_scan_completed(worker, found, duplicates))
+        worker.signals.error.connect(self._handle_batch_error)
+        self.folder_scans.append(worker)
+        self.statusBar().showMessage("Memindai folder...")
+        logger.info(f"Memindai {len(folders)} folder di latar belakang.")
+        self.thread_pool.start(worker)
+        
+    def _add_scanned_files(self, worker, file_paths):
+        self.file_list.add_files(file_paths)
+        if worker.check_immediately or self.current_worker is not None:
+            # Semua chunk dari satu pemindaian masuk ke batch antrean yang sama
+            worker.batch_id = self._enqueue_files(file_paths, worker.batch_id)
+        self.statusBar().showMessage(f"Memindai folder: {worker.scanner.files_found} berkas ditemukan")
+        
+    def _folder_scan_completed(self, worker, found, duplicates):
+        if worker in self.folder_scans:
+            self.folder_scans.remove(worker)
+        message = f"Pemindaian selesai: {found} berkas ditemukan"
+        if duplicates:
+            message += f", {duplicates} duplikat dilewati"
+        self.statusBar().showMessage(message, 5000)
+            
     def _check_selected_file(self, file_path):
         """Check a single selected file"""
         if not file_path:
@@ -386,7 +691,7 @@ class MainWindow(QMainWindow):
         logger.info(f"Pemeriksaan file tunggal selesai: {file_path}")
         
     def _check_all_files(self):
-        """Check all files in the list"""
+        """Queue all files in the list for checking"""
         file_paths = self.file_list.get_all_files()
         if not file_paths:
             logger.info("Tidak ada file dalam daftar untuk diperiksa (batch).")
@@ -396,28 +701,115 @@ class MainWindow(QMainWindow):
                 "Silakan tambahkan file untuk diperiksa terlebih dahulu."
             )
             return
-            
-        logger.info(f"Memulai pemeriksaan batch untuk {len(file_paths)} file.")
-        # Show progress dialog
-        self.progress_dialog = BatchProgressDialog(self)
-        self.progress_dialog.set_total(len(file_paths))
-        
-        # Connect dialog cancel signal
-        self.progress_dialog.rejected.connect(self._cancel_batch_processing)
+        self._enqueue_files(file_paths)
         
-        # Create worker and connect signals
+    def _check_all_profiles(self):
+        """Check all files in the list against every saved rule profile"""
+        file_paths = self.file_list.get_all_files()
+        if not file_paths:
+            QMessageBox.information(
+                self,
+                "Tidak Ada File",
+                "Silakan tambahkan file untuk diperiksa terlebih dahulu."
+            )
+            return
+        store = ProfileStore(self.settings, self.document_checker.registry.codes())
+        # Profil dari berkas didahulukan bila namanya sama dengan profil di pengaturan
+        profiles = {profile.name: profile for profile in store.load_all()}
+        profiles.update((profile.name, profile) for profile in self.document_checker.profile_library.profiles())
+        profiles = [profiles[name] for name in sorted(profiles)]
+        if not profiles:
+            QMessageBox.information(
+                self,
+                "Tidak Ada Profil",
+                "Simpan minimal satu profil aturan di Pengaturan > Aturan Dokumen "
+                "atau letakkan berkas profil TOML/JSON di folder profil."
+            )
+            return
+        if self.profile_worker is not None:
+            self.profile_worker.cancel()
+            
+        logger.info(f"Memeriksa {len(file_paths)} file terhadap {len(profiles)} profil.")
+        worker = ProfileCheckWorker(self.document_checker, file_paths, profiles)
+        worker.signals.progress.connect(
+            lambda done, total: self.statusBar().showMessage(f"Memeriksa profil: {done}/{total} file")
+        )
+        worker.signals.error.connect(self._handle_batch_error)
+        worker.signals.finished.connect(lambda matrix, worker=worker: self._profile_check_completed(worker, matrix))
+        self.profile_worker = worker
+        self.check_profiles_btn.setEnabled(False)
+        self.thread_pool.start(worker)
+        
+    def _profile_check_completed(self, worker, matrix):
+        if worker is not self.profile_worker:
+            return
+        self.profile_worker = None
+        self.check_profiles_btn.setEnabled(True)
+        self.statusBar().showMessage(f"Selesai memeriksa {len(matrix)} file terhadap {len(matrix.profiles)} profil")
+        if len(matrix):
+            self.results_view.display_profile_matrix(matrix)
+            
+    def _enqueue_files(self, file_paths, batch_id=None):
+        """
+        Add files to the background queue, starting a worker if none is running.
+        With ``batch_id`` the files extend that batch in the queue panel.
+        Returns the batch id, or None if no file was added.
+        """
+        priority = self.queue_panel.selected_priority()
+        priorities = self.file_list.get_priorities()
+        
+        added = None
+        if self.current_worker is not None:
+            added = self.current_worker.enqueue(file_paths, priorities, priority)
+        if added is None:
+            # Tidak ada worker aktif (atau worker baru saja selesai): mulai worker baru dengan berkas ini
+            added = self._start_batch_worker(file_paths, priorities, priority)
+        if not added:
+            if batch_id is None:
+                self.statusBar().showMessage("Semua berkas sudah ada di antrean", 3000)
+            return batch_id
+            
+        if batch_id is None:
+            self.batch_counter += 1
+            batch_id = self.batch_counter
+        self.queue_panel.add_batch(batch_id, added, priority)
+        self.queue_panel.show()
+        logger.info(f"Batch {batch_id}: {len(added)} file ditambahkan ke antrean (prioritas {priority}).")
+        self.statusBar().showMessage(f"{len(added)} file ditambahkan ke antrean")
+        return batch_id
+        
+    def _start_batch_worker(self, file_paths, priorities, priority):
+        """Create and start a queue worker for ``file_paths``; returns the paths it queued"""
         self.batch_results = []
-        self.current_worker = BatchProcessWorker(self.document_checker, file_paths)
-        self.current_worker.signals.progress.connect(self.progress_dialog.update_progress)
-        self.current_worker.signals.result.connect(self._process_batch_result)
-        self.current_worker.signals.finished.connect(self._batch_check_completed)
-        self.current_worker.signals.error.connect(self._handle_batch_error)
+        self.current_worker = BatchProcessWorker(
+            self.document_checker,
+            file_paths,
+            settings=self.settings,
+            cost_model=self.cost_model,
+            priorities=priorities,
+            priority=priority,
+        )
+        worker = self.current_worker
+        self.queue_panel.track(worker.progress)
+        worker.signals.concurrency.connect(self.queue_panel.update_concurrency)
+        worker.signals.result.connect(self._process_batch_result)
+        worker.signals.finished.connect(lambda results: self._batch_check_completed(worker, results))
+        worker.signals.error.connect(self._handle_batch_error)
         
         # Start processing in thread pool
-        self.thread_pool.start(self.current_worker)
+        self.thread_pool.start(worker)
+        return worker.added
         
-        # Show dialog
-        self.progress_dialog.exec()
+    def _toggle_batch_pause(self, paused):
+        """Pause or resume the running queue"""
+        if not self.current_worker:
+            return
+        if paused:
+            self.current_worker.pause()
+            logger.info("Antrean pemeriksaan dijeda.")
+        else:
+            self.current_worker.resume()
+            logger.info("Antrean pemeriksaan dilanjutkan.")
         
     def _cancel_batch_processing(self):
         """Cancel the current batch processing"""
@@ -426,10 +818,12 @@ class MainWindow(QMainWindow):
             logger.info("Pemrosesan batch dibatalkan oleh pengguna.")
             self.statusBar().showMessage("Pemrosesan batch dibatalkan")
         
-    def _process_batch_result(self, result):
+    def _process_batch_result(self, file_path, result):
         """Process a single result from batch processing"""
         logger.debug(f"Menerima hasil batch untuk: {result.filename}, Sukses: {result.success}")
-        self.batch_results.append(result)
+        with memory_diagnostics.measure(result.filename, "result"):
+            self.batch_results.append(result)
+            self.queue_panel.file_finished(file_path, result)
         
     def _handle_batch_error(self, error_message):
         """Handle batch processing error"""
@@ -440,11 +834,18 @@ class MainWindow(QMainWindow):
             f"Terjadi kesalahan saat memproses batch: {error_message}"
         )
         
-    def _batch_check_completed(self, results):
+    def _batch_check_completed(self, worker, results):
         """Handle batch check completion"""
         logger.info(f"Pemrosesan batch selesai. Jumlah hasil: {len(results)}")
+        if worker is not self.current_worker:
+            # Worker lama yang selesai setelah worker baru dimulai
+            return
         # Update status and results
         self.current_worker = None
+        self.cost_model.save(self.settings)
+        if self.document_checker.feature_cache is not None:
+            self.document_checker.feature_cache.prune()
+        self.queue_panel.stop_tracking(cancelled=worker.is_cancelled)
         self.statusBar().showMessage(f"Selesai memeriksa {len(results)} file")
         
         # If no results (canceled), do nothing
@@ -463,6 +864,18 @@ class MainWindow(QMainWindow):
         )
         
         self.results_view.display_batch_summary(summary, results)
+        self._write_memory_report(memory_diagnostics.active())
+        
+    def _write_memory_report(self, diagnostics):
+        """Write the memory diagnostics report of this process, if diagnostics are on."""
+        if diagnostics is None:
+            return
+        try:
+            path = diagnostics.write()
+        except OSError as e:
+            logger.warning(f"Laporan memori tidak dapat ditulis: {e}")
+            return
+        self.statusBar().showMessage(f"Laporan memori: {path}", 5000)
         
     def _show_settings(self):
         """Show the settings dialog"""
@@ -482,6 +895,9 @@ class MainWindow(QMainWindow):
         logger.info("Pengaturan diubah. Menginisialisasi ulang DocumentChecker dan konfigurasi logging.")
         self.old_document_checker = self.document_checker # Simpan referensi lama
         self.document_checker = DocumentChecker(self.settings) # Buat instance baru
+        if not self.settings.value("developer/memory_diagnostics", False, type=bool):
+            self._write_memory_report(memory_diagnostics.active())
+            memory_diagnostics.stop()
         
         self._disconnect_old_signals() # Putuskan koneksi dari instance lama
         self._connect_signals() # Hubungkan sinyal ke instance baru
@@ -571,9 +987,14 @@ class MainWindow(QMainWindow):
         """Handle drop event for files"""
         if event.mimeData().hasUrls():
             file_paths = []
+            folders = []
             for url in event.mimeData().urls():
                 if url.isLocalFile():
                     file_path = url.toLocalFile()
+                    if os.path.isdir(file_path):
+                        # Folder dipindai rekursif di thread latar belakang
+                        folders.append(file_path)
+                        continue
                     ext = os.path.splitext(file_path)[1].lower()
                     if ext in ['.docx', '.pdf']:
                         file_paths.append(file_path)
@@ -581,9 +1002,17 @@ class MainWindow(QMainWindow):
                         logger.debug(f"File yang di-drop dilewati (ekstensi tidak didukung): {file_path}")
                         
             if file_paths:
-                self.file_list.add_files(file_paths)
+                self._add_files(file_paths)
                 logger.info(f"{len(file_paths)} file di-drop dan ditambahkan ke daftar.")
+            if folders:
+                self._scan_folders(folders)
             event.acceptProposedAction() 
+            
+    def _add_files(self, file_paths):
+        """Add files to the list; while a batch is running they are queued right away"""
+        self.file_list.add_files(file_paths)
+        if self.current_worker is not None:
+            self._enqueue_files(file_paths)
 
     def _handle_language_changed(self, language_code: str):
         """Handle language change event"""
@@ -624,12 +1053,22 @@ class MainWindow(QMainWindow):
         if hasattr(self, "add_file_btn"):
             self.add_file_btn.setText(translate("add_files"))
             
+        if hasattr(self, "add_folder_btn"):
+            self.add_folder_btn.setText(translate("add_folder"))
+            
         if hasattr(self, "clear_files_btn"):
             self.clear_files_btn.setText(translate("clear_all"))
             
         if hasattr(self, "check_files_btn"):
             self.check_files_btn.setText(translate("check_all_files"))
             
+        if hasattr(self, "check_profiles_btn"):
+            self.check_profiles_btn.setText(translate("check_profiles"))
+            
+        # Re-render result messages in the new language without re-checking
+        if hasattr(self, "results_view"):
+            self.results_view.retranslate()
+            
         # Update status bar
         self.statusBar().showMessage(translate("ready"))
         
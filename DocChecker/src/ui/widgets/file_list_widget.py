@@ -6,6 +6,8 @@ import darkdetect
 
 # Define a custom role for storing file paths
 FILE_PATH_ROLE = Qt.UserRole + 1
+# Prioritas batch; berkas dengan prioritas lebih tinggi diperiksa lebih dulu
+PRIORITY_ROLE = Qt.UserRole + 2
 
 class FileListWidget(QListWidget):
     file_selected = Signal(str)  # Signal emitted when a file is selected
@@ -23,6 +25,11 @@ class FileListWidget(QListWidget):
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
         self.itemClicked.connect(self._on_item_clicked)
+        
+        # Indeks path dan prioritas agar penambahan ribuan berkas (mis. dari folder) tidak O(n^2)
+        self._paths = set()
+        self._priorities = {}
+        self._icons = {}
     
     def _set_style(self):
         """Set appropriate style based on system theme"""
@@ -73,14 +80,21 @@ class FileListWidget(QListWidget):
                 }
             """)
         
+    def _icon(self, path):
+        icon = self._icons.get(path)
+        if icon is None:
+            icon = self._icons[path] = QIcon(path)
+        return icon
+        
     def add_files(self, file_paths):
         """Add files to the list widget"""
-        for file_path in file_paths:
-            # Check if file is already in the list
-            for i in range(self.count()):
-                if self.item(i).data(FILE_PATH_ROLE) == file_path:
-                    break
-            else:  # File not found in list
+        self.setUpdatesEnabled(False)
+        try:
+            for file_path in file_paths:
+                # Check if file is already in the list
+                if file_path in self._paths:
+                    continue
+                self._paths.add(file_path)
                 filename = os.path.basename(file_path)
                 ext = os.path.splitext(filename)[1].lower()
                 
@@ -95,16 +109,18 @@ class FileListWidget(QListWidget):
                         item.setForeground(QColor("#a5b4fc"))  # Light purple in dark mode
                     else:
                         item.setForeground(QColor("#4f46e5"))  # Indigo in light mode
-                    item.setIcon(QIcon("resources/icons/docx_icon.png"))
+                    item.setIcon(self._icon("resources/icons/docx_icon.png"))
                 elif ext == '.pdf':
                     # We can add specific styling for PDF files
                     if self.is_dark_mode:
                         item.setForeground(QColor("#bfdbfe"))  # Light blue in dark mode
                     else:
                         item.setForeground(QColor("#2563eb"))  # Blue in light mode
-                    item.setIcon(QIcon("resources/icons/pdf_icon.png"))
+                    item.setIcon(self._icon("resources/icons/pdf_icon.png"))
                     
                 self.addItem(item)
+        finally:
+            self.setUpdatesEnabled(True)
             
     def _on_item_clicked(self, item):
         """Handle item click to emit signal with file path"""
@@ -138,13 +154,18 @@ class FileListWidget(QListWidget):
         """)
         
         check_action = QAction("Check File", self)
+        priority_action = QAction("Check First in Batch", self)
+        priority_action.setCheckable(True)
+        priority_action.setChecked(bool(item.data(PRIORITY_ROLE)))
         remove_action = QAction("Remove", self)
         remove_action.setIcon(QIcon("resources/icons/trash_icon.png"))
         
         check_action.triggered.connect(lambda: self._check_file(item))
+        priority_action.toggled.connect(lambda checked: self.set_priority(item, 1 if checked else 0))
         remove_action.triggered.connect(lambda: self._remove_file(item))
         
         context_menu.addAction(check_action)
+        context_menu.addAction(priority_action)
         context_menu.addAction(remove_action)
         context_menu.exec(self.mapToGlobal(position))
         
@@ -154,8 +175,26 @@ class FileListWidget(QListWidget):
         if file_path:
             self.file_selected.emit(file_path)
             
+    def set_priority(self, item, priority):
+        """Set the batch priority of an item; prioritized items are shown in bold"""
+        item.setData(PRIORITY_ROLE, priority)
+        if priority:
+            self._priorities[item.data(FILE_PATH_ROLE)] = priority
+        else:
+            self._priorities.pop(item.data(FILE_PATH_ROLE), None)
+        font = item.font()
+        font.setBold(priority > 0)
+        item.setFont(font)
+            
+    def get_priorities(self):
+        """Get batch priority overrides as {file_path: priority}"""
+        return dict(self._priorities)
+            
     def _remove_file(self, item):
         """Remove file from the list"""
+        file_path = item.data(FILE_PATH_ROLE)
+        self._paths.discard(file_path)
+        self._priorities.pop(file_path, None)
         self.takeItem(self.row(item))
             
     def get_all_files(self):
@@ -169,4 +208,6 @@ class FileListWidget(QListWidget):
         
     def clear(self):
         """Clear all items from the list"""
+        self._paths.clear()
+        self._priorities.clear()
         super().clear() 
\ No newline at end of file
@@ -0,0 +1,209 @@
+import os
+from PySide6.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar,
+    QPushButton, QComboBox, QTreeWidget, QTreeWidgetItem, QListWidget,
+    QListWidgetItem, QSplitter, QStyle
+)
+from PySide6.QtCore import Qt, Signal, Slot, QTimer
+
+from core.issues import STATUS_COMPLETED, STATUS_CANCELLED, NOTE_NOT_CHECKED
+from core.progress import format_duration
+
+# Interval polling progres (ms); maksimal 10 pembaruan tampilan per detik
+REFRESH_INTERVAL_MS = 100
+
+# Pilihan prioritas batch: (label, nilai)
+PRIORITIES = (("Rendah", -1), ("Normal", 0), ("Tinggi", 1))
+
+# Data role untuk menyimpan CheckResult pada item daftar hasil
+RESULT_ROLE = Qt.UserRole + 1
+
+
+class QueuePanel(QDockWidget):
+    """
+    Dockable view of the background check queue.
+
+    Lists queued batches with their priority and progress, shows live
+    throughput from the running worker's ``BatchProgress`` and lists finished
+    files so their results can be opened while the rest is still running.
+    """
+    pause_toggled = Signal(bool)  # True = jeda
+    cancel_requested = Signal()
+    result_selected = Signal(object)  # CheckResult
+
+    def __init__(self, parent=None):
+        super().__init__("Antrean Pemeriksaan", parent)
+        self.setObjectName("queuePanel")
+        self.setAllowedAreas(Qt.BottomDockWidgetArea | Qt.RightDockWidgetArea | Qt.LeftDockWidgetArea)
+
+        self.progress = None
+        self._batches = {}   # batch_id -> [item, selesai, total]
+        self._batch_of = {}  # path -> batch_id untuk berkas yang belum selesai
+
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(8)
+
+        # Status dan progres
+        self.status_label = QLabel("Antrean kosong")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setFormat("%v dari %m (%p%)")
+        self.progress_bar.setMaximum(1)
+        self.progress_bar.setValue(0)
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet("color: #64748b; font-size: 12px;")
+        self.concurrency_label = QLabel("")
+        self.concurrency_label.setStyleSheet("color: #64748b; font-size: 12px;")
+
+        # Kontrol antrean
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Prioritas batch baru:"))
+        self.priority_combo = QComboBox()
+        for label, value in PRIORITIES:
+            self.priority_combo.addItem(label, value)
+        self.priority_combo.setCurrentIndex(1)
+        controls.addWidget(self.priority_combo)
+        controls.addStretch(1)
+        self.pause_button = QPushButton("Jeda")
+        self.pause_button.setObjectName("secondary")
+        self.pause_button.setCheckable(True)
+        self.pause_button.setEnabled(False)
+        self.pause_button.toggled.connect(self._handle_pause_toggled)
+        self.cancel_button = QPushButton("Batalkan")
+        self.cancel_button.setObjectName("secondary")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_requested)
+        controls.addWidget(self.pause_button)
+        controls.addWidget(self.cancel_button)
+
+        # Daftar batch dan daftar hasil yang sudah selesai
+        splitter = QSplitter(Qt.Horizontal)
+        self.batch_tree = QTreeWidget()
+        self.batch_tree.setHeaderLabels(["Batch", "Prioritas", "Progres"])
+        self.batch_tree.setRootIsDecorated(False)
+        self.finished_list = QListWidget()
+        self.finished_list.itemClicked.connect(self._handle_result_clicked)
+        splitter.addWidget(self.batch_tree)
+        splitter.addWidget(self.finished_list)
+
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.stats_label)
+        layout.addWidget(self.concurrency_label)
+        layout.addLayout(controls)
+        layout.addWidget(splitter, 1)
+        self.setWidget(container)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self._refresh)
+
+    def selected_priority(self):
+        """Priority chosen for the next batch"""
+        return self.priority_combo.currentData()
+
+    def add_batch(self, batch_id, file_paths, priority):
+        """Show a newly queued batch, or add files to a batch that is still growing (folder scan)"""
+        if batch_id in self._batches:
+            entry = self._batches[batch_id]
+            entry[2] += len(file_paths)
+            entry[0].setText(0, f"Batch {batch_id} ({entry[2]} berkas)")
+            entry[0].setText(2, f"{entry[1]}/{entry[2]}")
+            for path in file_paths:
+                self._batch_of[path] = batch_id
+            return
+        label = dict((value, label) for label, value in PRIORITIES).get(priority, str(priority))
+        item = QTreeWidgetItem([f"Batch {batch_id} ({len(file_paths)} berkas)", label, f"0/{len(file_paths)}"])
+        self.batch_tree.addTopLevelItem(item)
+        self._batches[batch_id] = [item, 0, len(file_paths)]
+        for path in file_paths:
+            self._batch_of[path] = batch_id
+
+    def track(self, progress):
+        """Start polling a core.progress.BatchProgress object"""
+        self.progress = progress
+        self.pause_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+        self.refresh_timer.start()
+
+    def stop_tracking(self, cancelled=False):
+        """The worker has finished; show the final numbers and reset the controls"""
+        self._refresh()
+        self.refresh_timer.stop()
+        self.progress = None
+        self.pause_button.setChecked(False)
+        self.pause_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
+        if cancelled:
+            self.status_label.setText("Pemrosesan dibatalkan")
+            for item, done, total in self._batches.values():
+                if done < total:
+                    item.setText(2, f"{done}/{total} (dibatalkan)")
+        self._batch_of.clear()
+
+    @Slot(str, object)
+    def file_finished(self, file_path, result):
+        """Count a finished file towards its batch and list its result"""
+        batch_id = self._batch_of.pop(file_path, None)
+        if batch_id in self._batches:
+            entry = self._batches[batch_id]
+            entry[1] += 1
+            entry[0].setText(2, f"{entry[1]}/{entry[2]}")
+
+        name = os.path.basename(file_path)
+        if result.status == STATUS_CANCELLED:
+            not_started = any(issue.code == NOTE_NOT_CHECKED for issue in result.issues)
+            name += " (tidak diperiksa)" if not_started else " (sebagian)"
+        item = QListWidgetItem(name)
+        item.setData(RESULT_ROLE, result)
+        if result.status != STATUS_COMPLETED:
+            item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxWarning))
+        elif result.success:
+            item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton))
+        else:
+            item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogCancelButton))
+        self.finished_list.insertItem(0, item)
+
+    @Slot(int, int, float, int)
+    def update_concurrency(self, active, limit, rss_mb, budget_mb):
+        """Show the current worker limit and worker memory usage"""
+        text = f"Worker aktif: {active} dari {limit}"
+        if budget_mb > 0:
+            text += f" · Memori worker: {rss_mb:.0f} MB dari anggaran {budget_mb} MB"
+        self.concurrency_label.setText(text)
+
+    def _handle_pause_toggled(self, paused):
+        self.pause_button.setText("Lanjutkan" if paused else "Jeda")
+        self.pause_toggled.emit(paused)
+
+    def _handle_result_clicked(self, item):
+        result = item.data(RESULT_ROLE)
+        if result is not None:
+            self.result_selected.emit(result)
+
+    @Slot()
+    def _refresh(self):
+        """Redraw from the latest progress snapshot"""
+        if self.progress is None:
+            return
+        snapshot = self.progress.snapshot()
+        self.progress_bar.setMaximum(max(1, snapshot.total))
+        self.progress_bar.setValue(snapshot.done)
+        if self.pause_button.isChecked():
+            self.status_label.setText(f"Dijeda · {snapshot.done} dari {snapshot.total} berkas selesai")
+        elif snapshot.finished:
+            self.status_label.setText(f"Selesai · {snapshot.done} berkas diperiksa")
+        elif snapshot.current_file:
+            self.status_label.setText(
+                f"{snapshot.done} dari {snapshot.total} berkas selesai · Memproses: {snapshot.current_file}")
+
+        stats = (
+            f"{snapshot.files_per_second:.1f} berkas/s · "
+            f"{snapshot.bytes_per_second / (1024 * 1024):.1f} MB/s · "
+            f"Berlalu {format_duration(snapshot.elapsed)}"
+        )
+        if snapshot.eta is not None:
+            stats += f" · Sisa ~{format_duration(snapshot.eta)}"
+        self.stats_label.setText(stats)
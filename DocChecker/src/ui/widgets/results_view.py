@@ -8,7 +8,15 @@ from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtGui import QColor, QFont, QPalette, QIcon
 
 import darkdetect
+from core import memory_diagnostics
 from core.document_checker import CheckResult
+from core.issues import Issue, issue_category, STATUS_COMPLETED
+from core.messages import render_issue
+
+
+def _points(size) -> str:
+    return size if isinstance(size, str) and size.endswith("pt") else f"{size} pt"
+
 
 class ResultsView(QWidget):
     def __init__(self, parent=None):
@@ -233,6 +241,10 @@ class ResultsView(QWidget):
         
     def display_result(self, result: CheckResult):
         """Display a single file check result"""
+        with memory_diagnostics.measure(result.filename, "render"):
+            self._display_result(result)
+        
+    def _display_result(self, result: CheckResult):
         self.current_result = result
         self.tab_widget.setCurrentIndex(0)  # Switch to summary tab
         
@@ -251,10 +263,11 @@ class ResultsView(QWidget):
             bg_color = colors['bg_error']
             
         # Count issue types
-        font_issues = len(result.details.get("font_issues", []))
-        size_issues = len(result.details.get("size_issues", []))
-        spacing_issues = len(result.details.get("spacing_issues", []))
-        margin_issues = len(result.details.get("margin_issues", []))
+        issue_counts = result.issue_counts()
+        font_issues = issue_counts.get("font_issues", 0)
+        size_issues = issue_counts.get("size_issues", 0)
+        spacing_issues = issue_counts.get("spacing_issues", 0)
+        margin_issues = issue_counts.get("margin_issues", 0)
             
         summary_html = f"""
         <div style='background-color:{bg_color}; border-radius:8px; padding:15px; margin:0px;'>
@@ -333,22 +346,26 @@ class ResultsView(QWidget):
                      box-shadow:0 1px 3px {colors['shadow']}, 0 1px 2px {colors['shadow']};'>
         """
         
-        if not result.messages:
+        if not result.issues:
             summary_html += f"<p style='color:{colors['text_secondary']};'><i>No issues found.</i></p>"
         else:
             summary_html += f"<ul style='margin:0; padding-left:20px; color:{colors['text_primary']};'>"
-            for msg in result.messages:
+            for issue in result.issues:
+                # Pesan dirender saat ditampilkan, dalam bahasa aktif
+                msg = self._render_issue(result, issue)
+                
                 # Determine icon and color based on issue type
-                if "Font tidak sesuai" in msg:
+                category = issue_category(issue.code)
+                if category == "font_issues":
                     icon = "🔤"
                     color = colors['font_issue']
-                elif "Ukuran font" in msg:
+                elif category == "size_issues":
                     icon = "📏"
                     color = colors['size_issue']
-                elif "Spasi tidak sesuai" in msg:
+                elif category == "spacing_issues":
                     icon = "↕️"
                     color = colors['spacing_issue']
-                elif "Margin" in msg:
+                elif category == "margin_issues":
                     icon = "📄"
                     color = colors['margin_issue']
                 else:
@@ -376,8 +393,28 @@ class ResultsView(QWidget):
         # Update details tab
         self._update_details_table(result)
         
+    def _render_issue(self, result: CheckResult, issue: Issue) -> str:
+        """Render an issue message in the active language"""
+        if self.language_manager:
+            return self.language_manager.render_issue(result, issue)
+        return render_issue(result, issue)
+        
+    def retranslate(self):
+        """Re-render labels and the current result in the active language (no re-check)"""
+        self._update_translations()
+        if self.current_result:
+            self.display_result(self.current_result)
+        elif self.batch_results:
+            self.display_batch_summary("", self.batch_results)
+        else:
+            self.display_empty()
+        
     def display_batch_summary(self, summary_html, results):
         """Display batch check results"""
+        with memory_diagnostics.measure(f"batch summary ({len(results)} files)", "render"):
+            self._display_batch_summary(summary_html, results)
+        
+    def _display_batch_summary(self, summary_html, results):
         self.batch_results = results
         self.current_result = None
         self.tab_widget.setCurrentIndex(0)  # Switch to summary tab
@@ -385,10 +422,14 @@ class ResultsView(QWidget):
         colors = self.colors
         
         # Count total issues by type
-        total_font_issues = sum(len(r.details.get("font_issues", [])) for r in results)
-        total_size_issues = sum(len(r.details.get("size_issues", [])) for r in results)
-        total_spacing_issues = sum(len(r.details.get("spacing_issues", [])) for r in results)
-        total_margin_issues = sum(len(r.details.get("margin_issues", [])) for r in results)
+        total_counts = {}
+        for r in results:
+            for category, count in r.issue_counts().items():
+                total_counts[category] = total_counts.get(category, 0) + count
+        total_font_issues = total_counts.get("font_issues", 0)
+        total_size_issues = total_counts.get("size_issues", 0)
+        total_spacing_issues = total_counts.get("spacing_issues", 0)
+        total_margin_issues = total_counts.get("margin_issues", 0)
         
         # Count successful and failed files
         passed = sum(1 for r in results if r.success)
@@ -456,24 +497,80 @@ class ResultsView(QWidget):
         # Update files list
         self.files_list.clear()
         for result in results:
-            item = QListWidgetItem(result.filename)
-            if result.success:
-                if self.is_dark_mode:
-                    item.setBackground(QColor(39, 55, 41))  # Dark green
-                else:
-                    item.setBackground(QColor(232, 245, 233))  # Light green
-                item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton))
-            else:
-                if self.is_dark_mode:
-                    item.setBackground(QColor(55, 39, 40))  # Dark red
-                else:
-                    item.setBackground(QColor(255, 235, 238))  # Light red
-                item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogCancelButton))
-            self.files_list.addItem(item)
+            self._add_file_item(result.filename, result)
             
         # Clear details table
         self.issues_table.setRowCount(0)
         
+    def display_profile_matrix(self, matrix):
+        """Display the verdict matrix of a check against several rule profiles"""
+        colors = self.colors
+        results = []
+        self.current_result = None
+        self.tab_widget.setCurrentIndex(0)  # Switch to summary tab
+        self.files_list.clear()
+        
+        header = "".join(
+            f"<th style='padding:6px 10px; text-align:center;'>{name}</th>" for name in matrix.profiles
+        )
+        rows = []
+        for file_path, file_results in matrix.rows.items():
+            cells = []
+            for name in matrix.profiles:
+                result = file_results.get(name)
+                if result is None:
+                    cells.append("<td></td>")
+                    continue
+                results.append(result)
+                self._add_file_item(f"{result.filename} [{name}]", result)
+                if result.success:
+                    cells.append(f"<td style='padding:6px 10px; text-align:center; color:{colors['success']};'>✓</td>")
+                else:
+                    cells.append(f"<td style='padding:6px 10px; text-align:center; color:{colors['error']};'>"
+                                 f"✗ {len(result.issues)}</td>")
+            filename = next(iter(file_results.values())).filename if file_results else file_path
+            rows.append(f"<tr><td style='padding:6px 10px;'>{filename}</td>{''.join(cells)}</tr>")
+        totals = "".join(
+            f"<td style='padding:6px 10px; text-align:center; font-weight:bold;'>{count}/{len(matrix)}</td>"
+            for count in matrix.pass_counts().values()
+        )
+        
+        matrix_html = f"""
+        <div style='background-color:{colors['bg_card']}; border-radius:8px; padding:15px; margin:0px;'>
+            <h2 style='margin-top:5px; margin-bottom:15px; color:{colors['text_primary']};'>Profile Check Results</h2>
+            <table style='border-collapse:collapse; color:{colors['text_primary']};'>
+                <tr><th style='padding:6px 10px; text-align:left;'>File</th>{header}</tr>
+                {''.join(rows)}
+                <tr><td style='padding:6px 10px; font-weight:bold;'>Passed</td>{totals}</tr>
+            </table>
+            <p style='margin:30px 0 10px 0; color:{colors['text_secondary']};'>Click on the "Files" tab to see details for each file and profile.</p>
+        </div>
+        """
+        self.summary_text.setHtml(matrix_html)
+        self.batch_results = results
+        self.issues_table.setRowCount(0)
+        
+    def _add_file_item(self, label, result):
+        """Add a result to the files list, colored by its verdict"""
+        item = QListWidgetItem(label)
+        if result.success:
+            if self.is_dark_mode:
+                item.setBackground(QColor(39, 55, 41))  # Dark green
+            else:
+                item.setBackground(QColor(232, 245, 233))  # Light green
+            item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton))
+        else:
+            if self.is_dark_mode:
+                item.setBackground(QColor(55, 39, 40))  # Dark red
+            else:
+                item.setBackground(QColor(255, 235, 238))  # Light red
+            if result.status != STATUS_COMPLETED:
+                # Berkas tidak dapat diperiksa (error, timeout, crash, batas memori)
+                item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxWarning))
+            else:
+                item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogCancelButton))
+        self.files_list.addItem(item)
+        
     def _file_item_clicked(self, item):
         """Handle file item click in batch results view"""
         index = self.files_list.row(item)
@@ -485,13 +582,14 @@ class ResultsView(QWidget):
         """Update the details table with issues"""
         self.issues_table.setRowCount(0)
         
-        if not result.details:
+        details = result.details
+        if not details:
             return
             
         row = 0
         
         # Font issues
-        for issue in result.details.get("font_issues", []):
+        for issue in details.get("font_issues", []):
             self.issues_table.insertRow(row)
             
             type_item = QTableWidgetItem("Font")
@@ -524,7 +622,7 @@ class ResultsView(QWidget):
             row += 1
             
         # Size issues
-        for issue in result.details.get("size_issues", []):
+        for issue in details.get("size_issues", []):
             self.issues_table.insertRow(row)
             
             type_item = QTableWidgetItem("Font Size")
@@ -546,18 +644,19 @@ class ResultsView(QWidget):
                 
             self.issues_table.setItem(row, 1, QTableWidgetItem(location))
             
-            found_item = QTableWidgetItem(f"{issue.get('found', 'Unknown')} pt")
+            # Ukuran PDF sudah berupa teks dengan satuan ("12.0pt")
+            found_item = QTableWidgetItem(_points(issue.get('found', 'Unknown')))
             found_item.setForeground(QColor(self.colors['size_issue']))
             self.issues_table.setItem(row, 2, found_item)
             
-            expected_item = QTableWidgetItem(f"{issue.get('expected', 'Unknown')} pt")
+            expected_item = QTableWidgetItem(_points(issue.get('expected', 'Unknown')))
             expected_item.setForeground(QColor(self.colors['success']))
             self.issues_table.setItem(row, 3, expected_item)
             
             row += 1
             
         # Spacing issues
-        for issue in result.details.get("spacing_issues", []):
+        for issue in details.get("spacing_issues", []):
             self.issues_table.insertRow(row)
             
             type_item = QTableWidgetItem("Line Spacing")
@@ -585,7 +684,7 @@ class ResultsView(QWidget):
             row += 1
             
         # Margin issues
-        for issue in result.details.get("margin_issues", []):
+        for issue in details.get("margin_issues", []):
             self.issues_table.insertRow(row)
             
             type_item = QTableWidgetItem("Margin")
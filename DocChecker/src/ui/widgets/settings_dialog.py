@@ -1,11 +1,18 @@
+import os
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QLineEdit, QDoubleSpinBox, QCheckBox,
+    QLabel, QLineEdit, QDoubleSpinBox, QSpinBox, QCheckBox,
     QPushButton, QTabWidget, QWidget, QGroupBox,
-    QComboBox, QColorDialog, QFileDialog, QMessageBox
+    QComboBox, QColorDialog, QFileDialog, QMessageBox, QInputDialog
 )
 from PySide6.QtCore import Qt, Signal, Slot, QSettings
 
+from core.folder_scanner import DEFAULT_EXCLUDE
+from core.features import FeatureCache
+from core.profiles import Profile, ProfileLibrary, ProfileStore, default_profile_dir
+from core.profiling import default_dump_dir
+from core.rules import default_registry
+
 class SettingsDialog(QDialog):
     settings_changed = Signal()
     
@@ -109,6 +116,86 @@ class SettingsDialog(QDialog):
         
         self.report_folder_button.clicked.connect(self._select_report_folder)
         
+        self.isolate_workers_check = QCheckBox("Periksa setiap berkas di proses terpisah")
+        batch_layout.addRow("", self.isolate_workers_check)
+        
+        self.file_timeout_spin = QDoubleSpinBox()
+        self.file_timeout_spin.setRange(0, 3600)
+        self.file_timeout_spin.setSingleStep(10)
+        self.file_timeout_spin.setDecimals(0)
+        self.file_timeout_spin.setSuffix(" s")
+        self.file_timeout_spin.setSpecialValueText("Tanpa batas")
+        batch_layout.addRow("Batas waktu per berkas:", self.file_timeout_spin)
+        
+        self.memory_limit_spin = QSpinBox()
+        self.memory_limit_spin.setRange(0, 65536)
+        self.memory_limit_spin.setSingleStep(256)
+        self.memory_limit_spin.setSuffix(" MB")
+        self.memory_limit_spin.setSpecialValueText("Tanpa batas")
+        batch_layout.addRow("Batas memori per worker:", self.memory_limit_spin)
+        
+        self.max_workers_spin = QSpinBox()
+        self.max_workers_spin.setRange(0, 256)
+        self.max_workers_spin.setSpecialValueText("Otomatis")
+        batch_layout.addRow("Worker maksimum:", self.max_workers_spin)
+        
+        self.memory_budget_spin = QSpinBox()
+        self.memory_budget_spin.setRange(0, 1048576)
+        self.memory_budget_spin.setSingleStep(512)
+        self.memory_budget_spin.setSuffix(" MB")
+        self.memory_budget_spin.setSpecialValueText("Otomatis")
+        batch_layout.addRow("Anggaran memori batch:", self.memory_budget_spin)
+        
+        self.isolate_workers_check.toggled.connect(self.file_timeout_spin.setEnabled)
+        self.isolate_workers_check.toggled.connect(self.memory_limit_spin.setEnabled)
+        self.isolate_workers_check.toggled.connect(self.max_workers_spin.setEnabled)
+        self.isolate_workers_check.toggled.connect(self.memory_budget_spin.setEnabled)
+        
+        self.pdf_split_threshold_spin = QSpinBox()
+        self.pdf_split_threshold_spin.setRange(0, 100000)
+        self.pdf_split_threshold_spin.setSingleStep(50)
+        self.pdf_split_threshold_spin.setSuffix(" halaman")
+        self.pdf_split_threshold_spin.setSpecialValueText("Nonaktif")
+        batch_layout.addRow("Bagi PDF besar mulai:", self.pdf_split_threshold_spin)
+        
+        self.pdf_split_chunk_spin = QSpinBox()
+        self.pdf_split_chunk_spin.setRange(1, 10000)
+        self.pdf_split_chunk_spin.setSingleStep(10)
+        self.pdf_split_chunk_spin.setSuffix(" halaman")
+        batch_layout.addRow("Halaman per bagian:", self.pdf_split_chunk_spin)
+        
+        self.scan_include_edit = QLineEdit()
+        self.scan_include_edit.setPlaceholderText("Semua dokumen, mis. skripsi*;bab-*/*.docx")
+        batch_layout.addRow("Sertakan pola:", self.scan_include_edit)
+        
+        self.scan_exclude_edit = QLineEdit()
+        self.scan_exclude_edit.setPlaceholderText("mis. ~$*;.*;arsip")
+        batch_layout.addRow("Abaikan pola:", self.scan_exclude_edit)
+        
+        self.scan_check_immediately_check = QCheckBox("Langsung periksa berkas dari folder")
+        batch_layout.addRow("", self.scan_check_immediately_check)
+        
+        self.feature_cache_check = QCheckBox("Simpan hasil parsing dokumen (cache fitur)")
+        self.feature_cache_check.setToolTip(
+            "Teks lengkap dokumen yang diperiksa disimpan di disk (folder cache pengguna)\n"
+            "agar pemeriksaan ulang tidak perlu membaca berkas lagi. Nonaktif secara default."
+        )
+        batch_layout.addRow("", self.feature_cache_check)
+        
+        self.feature_cache_size_spin = QSpinBox()
+        self.feature_cache_size_spin.setRange(0, 65536)
+        self.feature_cache_size_spin.setSingleStep(128)
+        self.feature_cache_size_spin.setSuffix(" MB")
+        self.feature_cache_size_spin.setSpecialValueText("Tanpa batas")
+        self.clear_cache_button = QPushButton("Kosongkan")
+        cache_layout = QHBoxLayout()
+        cache_layout.addWidget(self.feature_cache_size_spin)
+        cache_layout.addWidget(self.clear_cache_button)
+        batch_layout.addRow("Ukuran cache maksimum:", cache_layout)
+        
+        self.feature_cache_check.toggled.connect(self.feature_cache_size_spin.setEnabled)
+        self.clear_cache_button.clicked.connect(self._clear_feature_cache)
+        
         # Developer group
         developer_group = QGroupBox("Pengembang")
         developer_layout = QFormLayout(developer_group)
@@ -116,6 +203,30 @@ class SettingsDialog(QDialog):
         self.extensive_logging_check = QCheckBox("Aktifkan logging ekstensif")
         developer_layout.addRow("Logging:", self.extensive_logging_check)
         
+        self.profile_slow_check = QCheckBox("Simpan profil cProfile berkas yang lambat")
+        developer_layout.addRow("Profil:", self.profile_slow_check)
+        
+        self.profile_threshold_spin = QDoubleSpinBox()
+        self.profile_threshold_spin.setRange(0, 3600)
+        self.profile_threshold_spin.setSingleStep(1)
+        self.profile_threshold_spin.setDecimals(1)
+        self.profile_threshold_spin.setSuffix(" s")
+        self.profile_threshold_spin.setSpecialValueText("Hanya p99")
+        developer_layout.addRow("Lambat jika lebih dari:", self.profile_threshold_spin)
+        
+        self.profile_p99_check = QCheckBox("Atau lebih lambat dari p99 batch")
+        developer_layout.addRow("", self.profile_p99_check)
+        
+        self.profile_dir_slow_edit = QLineEdit()
+        self.profile_dir_slow_edit.setPlaceholderText(default_dump_dir())
+        developer_layout.addRow("Folder profil:", self.profile_dir_slow_edit)
+        
+        for widget in (self.profile_threshold_spin, self.profile_p99_check, self.profile_dir_slow_edit):
+            self.profile_slow_check.toggled.connect(widget.setEnabled)
+        
+        self.memory_diagnostics_check = QCheckBox("Lacak alokasi memori per berkas (tracemalloc, lambat)")
+        developer_layout.addRow("Memori:", self.memory_diagnostics_check)
+        
         # Add groups to layout
         layout.addWidget(interface_group)
         layout.addWidget(batch_group)
@@ -129,8 +240,27 @@ class SettingsDialog(QDialog):
         tab = QWidget()
         layout = QVBoxLayout(tab)
         
+        # Profile files (TOML/JSON); the active one replaces the rule values below
+        profile_file_group = QGroupBox("Berkas Profil")
+        profile_file_layout = QFormLayout(profile_file_group)
+        
+        self.profile_dir_edit = QLineEdit()
+        self.profile_dir_edit.setPlaceholderText(default_profile_dir())
+        self.profile_dir_edit.editingFinished.connect(self._refresh_profile_files)
+        self.profile_dir_button = QPushButton("Jelajahi...")
+        self.profile_dir_button.clicked.connect(self._select_profile_dir)
+        profile_dir_layout = QHBoxLayout()
+        profile_dir_layout.addWidget(self.profile_dir_edit)
+        profile_dir_layout.addWidget(self.profile_dir_button)
+        profile_file_layout.addRow("Folder profil:", profile_dir_layout)
+        
+        self.active_profile_combo = QComboBox()
+        self.active_profile_combo.currentIndexChanged.connect(self._handle_active_profile_changed)
+        profile_file_layout.addRow("Profil aktif:", self.active_profile_combo)
+        
         # Font rules group
         font_group = QGroupBox("Aturan Font")
+        self.font_group = font_group
         font_layout = QFormLayout(font_group)
         
         self.font_name_edit = QLineEdit()
@@ -150,6 +280,7 @@ class SettingsDialog(QDialog):
         
         # Margin rules group
         margin_group = QGroupBox("Aturan Margin (cm)")
+        self.margin_group = margin_group
         margin_layout = QFormLayout(margin_group)
         
         self.margin_left_spin = QDoubleSpinBox()
@@ -182,9 +313,32 @@ class SettingsDialog(QDialog):
         self.margin_tolerance_spin.setDecimals(2)
         margin_layout.addRow("Toleransi (±):", self.margin_tolerance_spin)
         
+        # Named profiles (stored separately from the rule values above)
+        profile_group = QGroupBox("Profil Aturan")
+        profile_layout = QHBoxLayout(profile_group)
+        
+        self.profile_store = ProfileStore(self.settings, default_registry.codes())
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(self.profile_store.names())
+        profile_layout.addWidget(self.profile_combo, 1)
+        
+        self.load_profile_btn = QPushButton("Muat")
+        self.load_profile_btn.clicked.connect(self._load_profile)
+        profile_layout.addWidget(self.load_profile_btn)
+        
+        self.save_profile_btn = QPushButton("Simpan sebagai...")
+        self.save_profile_btn.clicked.connect(self._save_profile)
+        profile_layout.addWidget(self.save_profile_btn)
+        
+        self.delete_profile_btn = QPushButton("Hapus")
+        self.delete_profile_btn.clicked.connect(self._delete_profile)
+        profile_layout.addWidget(self.delete_profile_btn)
+        
         # Add groups to layout
+        layout.addWidget(profile_file_group)
         layout.addWidget(font_group)
         layout.addWidget(margin_group)
+        layout.addWidget(profile_group)
         layout.addStretch()
         
         return tab
@@ -224,6 +378,120 @@ class SettingsDialog(QDialog):
         if folder:
             self.report_folder_edit.setText(folder)
     
+    def _clear_feature_cache(self):
+        """Delete all cached document features"""
+        FeatureCache(self.settings.value("cache/dir", "") or None).clear()
+        QMessageBox.information(self, "Cache Fitur", "Cache fitur dokumen telah dikosongkan.")
+    
+    def _select_profile_dir(self):
+        """Open dialog to select the profile folder"""
+        folder = QFileDialog.getExistingDirectory(
+            self,
+            "Pilih Folder Profil",
+            self.profile_dir_edit.text() or default_profile_dir()
+        )
+        if folder:
+            self.profile_dir_edit.setText(folder)
+            self._refresh_profile_files()
+            
+    def _refresh_profile_files(self, active=None):
+        """List the valid profile files of the selected folder"""
+        if active is None:
+            active = self.active_profile_combo.currentData() or ""
+        library = ProfileLibrary(self.profile_dir_edit.text() or None, default_registry.codes())
+        names = library.names()
+        self.active_profile_combo.clear()
+        self.active_profile_combo.addItem("(Aturan di bawah)", "")
+        for name in names:
+            self.active_profile_combo.addItem(name, name)
+        if active and active not in names:
+            # Profil tetap dapat dipilih; berkasnya mungkin belum ada atau tidak valid
+            self.active_profile_combo.addItem(f"{active} (tidak ditemukan)", active)
+        index = self.active_profile_combo.findData(active)
+        self.active_profile_combo.setCurrentIndex(max(index, 0))
+        if library.errors:
+            self.active_profile_combo.setToolTip("\n".join(
+                f"{os.path.basename(path)}: {error}" for path, error in library.errors.items()
+            ))
+        else:
+            self.active_profile_combo.setToolTip("")
+            
+    def _handle_active_profile_changed(self, index):
+        # Nilai aturan di bawah hanya berlaku tanpa berkas profil aktif
+        uses_fields = index <= 0
+        self.font_group.setEnabled(uses_fields)
+        self.margin_group.setEnabled(uses_fields)
+        
+    def _rule_values(self):
+        """Rule parameters currently shown in the dialog"""
+        return {
+            "font_name": self.font_name_edit.text(),
+            "font_size": self.font_size_spin.value(),
+            "line_spacing": self.line_spacing_spin.value(),
+            "margin_left": self.margin_left_spin.value(),
+            "margin_right": self.margin_right_spin.value(),
+            "margin_top": self.margin_top_spin.value(),
+            "margin_bottom": self.margin_bottom_spin.value(),
+            "margin_tolerance": self.margin_tolerance_spin.value(),
+        }
+        
+    def _refresh_profiles(self, current=None):
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self.profile_store.names())
+        if current:
+            self.profile_combo.setCurrentText(current)
+        
+    def _load_profile(self):
+        """Fill the rule fields with the values of the selected profile"""
+        name = self.profile_combo.currentText()
+        if not name:
+            return
+        config = self.profile_store.load(name).config
+        self.font_name_edit.setText(config["font_name"])
+        self.font_size_spin.setValue(config["font_size"])
+        self.line_spacing_spin.setValue(config["line_spacing"])
+        self.margin_left_spin.setValue(config["margin_left"])
+        self.margin_right_spin.setValue(config["margin_right"])
+        self.margin_top_spin.setValue(config["margin_top"])
+        self.margin_bottom_spin.setValue(config["margin_bottom"])
+        self.margin_tolerance_spin.setValue(config["margin_tolerance"])
+        
+    def _save_profile(self):
+        """Save the rule fields as a named profile"""
+        name, ok = QInputDialog.getText(self, "Simpan Profil", "Nama profil:",
+                                        text=self.profile_combo.currentText())
+        if not ok or not name.strip():
+            return
+        try:
+            name = ProfileStore.validate_name(name)
+        except ValueError:
+            QMessageBox.warning(self, "Simpan Profil", "Nama profil tidak boleh mengandung '/' atau '\\'.")
+            return
+        if name in self.profile_store.names():
+            confirm = QMessageBox.question(
+                self, "Simpan Profil", f"Profil '{name}' sudah ada. Timpa?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if confirm != QMessageBox.Yes:
+                return
+        # Aturan yang dinonaktifkan ikut tersimpan di profil
+        disabled = self.profile_store.current(name).disabled
+        self.profile_store.save(Profile(name, self._rule_values(), disabled))
+        self._refresh_profiles(name)
+        
+    def _delete_profile(self):
+        """Delete the selected profile"""
+        name = self.profile_combo.currentText()
+        if not name:
+            return
+        confirm = QMessageBox.question(
+            self, "Hapus Profil", f"Hapus profil '{name}'?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if confirm == QMessageBox.Yes:
+            self.profile_store.delete(name)
+            self._refresh_profiles()
+        
     def _handle_language_preview(self, language_text):
         """Handle language change preview if enabled"""
         if self.apply_theme_check.isChecked() and hasattr(self.parent_window, 'language_manager'):
@@ -271,6 +539,10 @@ class SettingsDialog(QDialog):
                     widget.setTitle(translate("margin_rules"))
                 elif widget.title() == "Format Ekspor":
                     widget.setTitle(translate("export_format"))
+                elif widget.title() == "Profil Aturan":
+                    widget.setTitle(translate("rule_profiles"))
+                elif widget.title() == "Berkas Profil":
+                    widget.setTitle(translate("profile_files"))
                     
             # Update form labels
             # This would need to be done for each form label, but for simplicity
@@ -309,9 +581,31 @@ class SettingsDialog(QDialog):
         self.show_icons_check.setChecked(self.settings.value("show_icons", True, type=bool))
         self.auto_save_reports_check.setChecked(self.settings.value("auto_save_reports", False, type=bool))
         self.report_folder_edit.setText(self.settings.value("report_folder", ""))
+        self.isolate_workers_check.setChecked(self.settings.value("batch/isolate_workers", True, type=bool))
+        self.file_timeout_spin.setValue(self.settings.value("batch/file_timeout", 120.0, type=float))
+        self.memory_limit_spin.setValue(self.settings.value("batch/memory_limit_mb", 2048, type=int))
+        self.max_workers_spin.setValue(self.settings.value("batch/max_workers", 0, type=int))
+        self.memory_budget_spin.setValue(self.settings.value("batch/memory_budget_mb", 0, type=int))
+        self.pdf_split_threshold_spin.setValue(self.settings.value("pdf/split_threshold", 200, type=int))
+        self.pdf_split_chunk_spin.setValue(self.settings.value("pdf/split_chunk_pages", 50, type=int))
+        self.scan_include_edit.setText(self.settings.value("scan/include_patterns", ""))
+        self.scan_exclude_edit.setText(self.settings.value("scan/exclude_patterns", DEFAULT_EXCLUDE))
+        self.scan_check_immediately_check.setChecked(self.settings.value("scan/check_immediately", False, type=bool))
+        self.feature_cache_check.setChecked(self.settings.value("cache/enabled", False, type=bool))
+        self.feature_cache_size_spin.setValue(self.settings.value("cache/max_mb", 512, type=int))
+        self.feature_cache_size_spin.setEnabled(self.feature_cache_check.isChecked())
         self.extensive_logging_check.setChecked(self.settings.value("developer/extensive_logging", False, type=bool))
+        self.profile_slow_check.setChecked(self.settings.value("developer/profile_slow_files", False, type=bool))
+        self.profile_threshold_spin.setValue(self.settings.value("developer/profile_threshold", 5.0, type=float))
+        self.profile_p99_check.setChecked(self.settings.value("developer/profile_p99", False, type=bool))
+        self.profile_dir_slow_edit.setText(self.settings.value("developer/profile_dir", ""))
+        self.memory_diagnostics_check.setChecked(self.settings.value("developer/memory_diagnostics", False, type=bool))
+        for widget in (self.profile_threshold_spin, self.profile_p99_check, self.profile_dir_slow_edit):
+            widget.setEnabled(self.profile_slow_check.isChecked())
         
         # Document rules
+        self.profile_dir_edit.setText(self.settings.value("rules/profile_dir", ""))
+        self._refresh_profile_files(self.settings.value("rules/profile", ""))
         self.font_name_edit.setText(self.settings.value("font_name", "Times New Roman"))
         self.font_size_spin.setValue(self.settings.value("font_size", 12.0, type=float))
         self.line_spacing_spin.setValue(self.settings.value("line_spacing", 1.5, type=float))
@@ -364,9 +658,28 @@ class SettingsDialog(QDialog):
         self.settings.setValue("show_icons", self.show_icons_check.isChecked())
         self.settings.setValue("auto_save_reports", self.auto_save_reports_check.isChecked())
         self.settings.setValue("report_folder", self.report_folder_edit.text())
+        self.settings.setValue("batch/isolate_workers", self.isolate_workers_check.isChecked())
+        self.settings.setValue("batch/file_timeout", self.file_timeout_spin.value())
+        self.settings.setValue("batch/memory_limit_mb", self.memory_limit_spin.value())
+        self.settings.setValue("batch/max_workers", self.max_workers_spin.value())
+        self.settings.setValue("batch/memory_budget_mb", self.memory_budget_spin.value())
+        self.settings.setValue("pdf/split_threshold", self.pdf_split_threshold_spin.value())
+        self.settings.setValue("pdf/split_chunk_pages", self.pdf_split_chunk_spin.value())
+        self.settings.setValue("scan/include_patterns", self.scan_include_edit.text())
+        self.settings.setValue("scan/exclude_patterns", self.scan_exclude_edit.text())
+        self.settings.setValue("scan/check_immediately", self.scan_check_immediately_check.isChecked())
+        self.settings.setValue("cache/enabled", self.feature_cache_check.isChecked())
+        self.settings.setValue("cache/max_mb", self.feature_cache_size_spin.value())
         self.settings.setValue("developer/extensive_logging", self.extensive_logging_check.isChecked())
+        self.settings.setValue("developer/profile_slow_files", self.profile_slow_check.isChecked())
+        self.settings.setValue("developer/profile_threshold", self.profile_threshold_spin.value())
+        self.settings.setValue("developer/profile_p99", self.profile_p99_check.isChecked())
+        self.settings.setValue("developer/profile_dir", self.profile_dir_slow_edit.text())
+        self.settings.setValue("developer/memory_diagnostics", self.memory_diagnostics_check.isChecked())
         
         # Document rules
+        self.settings.setValue("rules/profile_dir", self.profile_dir_edit.text())
+        self.settings.setValue("rules/profile", self.active_profile_combo.currentData() or "")
         self.settings.setValue("font_name", self.font_name_edit.text())
         self.settings.setValue("font_size", self.font_size_spin.value())
         self.settings.setValue("line_spacing", self.line_spacing_spin.value())
@@ -403,9 +716,28 @@ class SettingsDialog(QDialog):
             self.show_icons_check.setChecked(True)
             self.auto_save_reports_check.setChecked(False)
             self.report_folder_edit.setText("")
+            self.isolate_workers_check.setChecked(True)
+            self.file_timeout_spin.setValue(120)
+            self.memory_limit_spin.setValue(2048)
+            self.max_workers_spin.setValue(0)
+            self.memory_budget_spin.setValue(0)
+            self.pdf_split_threshold_spin.setValue(200)
+            self.pdf_split_chunk_spin.setValue(50)
+            self.scan_include_edit.setText("")
+            self.scan_exclude_edit.setText(DEFAULT_EXCLUDE)
+            self.scan_check_immediately_check.setChecked(False)
+            self.feature_cache_check.setChecked(False)
+            self.feature_cache_size_spin.setValue(512)
             self.extensive_logging_check.setChecked(False)
+            self.profile_slow_check.setChecked(False)
+            self.profile_threshold_spin.setValue(5.0)
+            self.profile_p99_check.setChecked(False)
+            self.profile_dir_slow_edit.setText("")
+            self.memory_diagnostics_check.setChecked(False)
             
             # Document rules
+            self.profile_dir_edit.setText("")
+            self._refresh_profile_files("")
             self.font_name_edit.setText("Times New Roman")
             self.font_size_spin.setValue(12.0)
             self.line_spacing_spin.setValue(1.5)
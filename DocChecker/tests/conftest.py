@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul aplikasi diimpor seperti di main.py: ``from core.x import ...``
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
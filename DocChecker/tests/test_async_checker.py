@@ -0,0 +1,133 @@
+import asyncio
+import os
+import signal
+import threading
+
+import pytest
+
+# Pemeriksa (juga di proses worker) membutuhkan python-docx dan PyMuPDF
+pytest.importorskip("docx")
+pytest.importorskip("fitz")
+
+from core.async_checker import AsyncDocumentChecker  # noqa: E402
+from core.issues import (  # noqa: E402
+    ERROR_PDF_OPEN, ERROR_TIMEOUT, ERROR_UNSUPPORTED, STATUS_CRASHED, STATUS_TIMEOUT,
+)
+
+needs_fifo = pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="butuh named pipe (POSIX)")
+
+
+def fifo(tmp_path, name):
+    # Membuka FIFO tanpa penulis memblokir: pemeriksaan yang sengaja macet sampai unblock()
+    path = str(tmp_path / name)
+    os.mkfifo(path)
+    return path
+
+
+def unblock(path):
+    """Let a check blocked on ``path`` continue; it then reads an empty (invalid) document."""
+    with open(path, "wb"):
+        pass
+
+
+def test_in_memory_document_needs_a_filename():
+    async def main():
+        async with AsyncDocumentChecker(processes=False) as checker:
+            with pytest.raises(ValueError):
+                await checker.check(b"data")
+            return await checker.check(bytearray(b"data"), "catatan.txt")
+
+    assert asyncio.run(main()).issues[0].code == ERROR_UNSUPPORTED
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_check_many_keeps_input_order(tmp_path, processes):
+    paths = []
+    for index in range(5):
+        path = tmp_path / f"catatan{index}.txt"
+        path.write_text("bukan dokumen")
+        paths.append(str(path))
+
+    async def main():
+        async with AsyncDocumentChecker(workers=2, processes=processes) as checker:
+            sources = paths[:4] + [(b"data", "unggahan.txt")]
+            return [result.filename async for result in checker.check_many(sources, ordered=True)]
+
+    assert asyncio.run(main()) == [os.path.basename(path) for path in paths[:4]] + ["unggahan.txt"]
+
+
+@needs_fifo
+def test_thread_check_times_out_and_keeps_its_slot_until_it_returns(tmp_path):
+    hanging = fifo(tmp_path, "macet.pdf")
+
+    async def main():
+        async with AsyncDocumentChecker(workers=1, processes=False, timeout=0.2) as checker:
+            result = await checker.check(hanging)
+            assert checker._slots.qsize() == 0
+            # Thread tidak dapat dimatikan: slot kembali setelah pemeriksaannya selesai
+            await asyncio.get_running_loop().run_in_executor(None, unblock, hanging)
+            for _ in range(100):
+                if checker._slots.qsize():
+                    break
+                await asyncio.sleep(0.05)
+            assert checker._slots.qsize() == 1
+            return result
+
+    result = asyncio.run(main())
+    assert result.status == STATUS_TIMEOUT
+    assert result.issues[0].code == ERROR_TIMEOUT
+
+
+@needs_fifo
+def test_hung_worker_process_is_killed_and_replaced(tmp_path):
+    hanging = fifo(tmp_path, "macet.pdf")
+    note = tmp_path / "catatan.txt"
+    note.write_text("bukan dokumen")
+
+    async def main():
+        async with AsyncDocumentChecker(workers=1, timeout=0.5) as checker:
+            timed_out = await checker.check(hanging)
+            # Worker yang macet dimatikan setelah tenggang waktu; pool pengganti memeriksa berkas berikutnya
+            after = await checker.check(str(note), timeout=60)
+            return timed_out, after
+
+    timed_out, after = asyncio.run(main())
+    assert timed_out.status == STATUS_TIMEOUT
+    assert after.issues[0].code == ERROR_UNSUPPORTED
+
+
+def keep_unblocking(paths, stop):
+    """Unblock every reader that opens one of ``paths`` until ``stop`` is set."""
+    while not stop.wait(0.05):
+        for path in paths:
+            try:
+                # Tanpa pembaca yang menunggu open() gagal (ENXIO) dan dicoba lagi
+                os.close(os.open(path, os.O_WRONLY | os.O_NONBLOCK))
+            except OSError:
+                pass
+
+
+@needs_fifo
+def test_checks_on_a_crashed_pool_are_retried_once(tmp_path):
+    paths = [fifo(tmp_path, "a.pdf"), fifo(tmp_path, "b.pdf")]
+
+    async def main():
+        async with AsyncDocumentChecker(workers=2) as checker:
+            tasks = [asyncio.ensure_future(checker.check(path)) for path in paths]
+            while not all(checker._slot_pids):
+                await asyncio.sleep(0.05)
+            # Satu worker mati: pool bersama rusak untuk kedua pemeriksaan
+            os.kill(checker._slot_pids[0], signal.SIGKILL)
+            stop = threading.Event()
+            unblocker = threading.Thread(target=keep_unblocking, args=(paths, stop))
+            unblocker.start()
+            try:
+                return await asyncio.wait_for(asyncio.gather(*tasks), 60)
+            finally:
+                stop.set()
+                unblocker.join()
+
+    results = asyncio.run(main())
+    # Pemeriksaan di pool yang rusak diulang di proses terpisah dan selesai (dokumen kosong)
+    assert all(result.status != STATUS_CRASHED for result in results)
+    assert [result.issues[0].code for result in results] == [ERROR_PDF_OPEN, ERROR_PDF_OPEN]
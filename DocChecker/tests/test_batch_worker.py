@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("docx")
+pytest.importorskip("fitz")
+
+from core.checker import Checker  # noqa: E402
+from core.issues import ERROR_UNSUPPORTED  # noqa: E402
+from core.supervisor import SettingsSnapshot  # noqa: E402
+from ui.main_window import BatchProcessWorker  # noqa: E402
+
+
+@pytest.mark.parametrize("isolate", [False, True])
+def test_new_worker_checks_the_files_it_was_started_with(tmp_path, isolate):
+    paths = []
+    for name in ("a.txt", "b.txt"):
+        path = tmp_path / name
+        path.write_text("bukan dokumen")
+        paths.append(str(path))
+    settings = SettingsSnapshot({"batch/isolate_workers": isolate, "cache/enabled": False})
+    worker = BatchProcessWorker(Checker(settings), paths, settings=settings, priority=2)
+    assert worker.added == paths
+
+    finished = []
+    worker.signals.finished.connect(finished.append)
+    # Berkas sudah di antrean sebelum run: worker tidak boleh langsung menutup antrean yang kosong
+    worker.run()
+
+    results = finished[0]
+    assert sorted(result.filename for result in results) == ["a.txt", "b.txt"]
+    assert all(result.issues[0].code == ERROR_UNSUPPORTED for result in results)
+    # Worker yang selesai tidak menerima berkas lagi; pemanggil memulai worker baru
+    assert worker.enqueue(paths) is None
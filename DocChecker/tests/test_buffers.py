@@ -0,0 +1,49 @@
+import mmap
+
+from core.buffers import BufferReader, as_buffer, as_bytes
+
+
+def test_as_buffer_does_not_copy():
+    data = b"%PDF-1.4 isi"
+    assert as_buffer(data) is data
+
+    array = bytearray(data)
+    view = as_buffer(array)
+    assert isinstance(view, memoryview) and view.obj is array
+    # Dibaca di tempat: perubahan pada buffer asli terlihat lewat view
+    array[0:1] = b"#"
+    assert bytes(view[:4]) == b"#PDF"
+    view.release()
+
+    mapped = mmap.mmap(-1, len(data))
+    mapped.write(data)
+    view = as_buffer(mapped)
+    assert view.obj is mapped and bytes(view) == data
+    view.release()
+    mapped.close()  # Tidak ada view yang tertinggal
+
+
+def test_as_buffer_copies_only_non_contiguous_views():
+    view = memoryview(b"abcdef")[::2]
+    assert as_buffer(view) == b"ace"
+
+
+def test_as_bytes_keeps_bytes_and_copies_other_buffers():
+    data = b"%PDF"
+    assert as_bytes(data) is data
+    assert as_bytes(memoryview(data)) is data
+    assert as_bytes(memoryview(data)[1:]) == b"PDF"
+    assert as_bytes(bytearray(data)) == data
+
+
+def test_buffer_reader_reads_and_seeks_without_copying_the_buffer():
+    array = bytearray(b"0123456789")
+    reader = BufferReader(array)
+    assert reader.read(3) == b"012"
+    reader.seek(-2, 2)
+    assert reader.read() == b"89"
+    reader.seek(4)
+    target = bytearray(3)
+    assert reader.readinto(target) == 3 and target == b"456"
+    reader.close()
+    array.extend(b"x")  # View dilepas: bytearray boleh diubah ukurannya lagi
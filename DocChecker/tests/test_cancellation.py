@@ -0,0 +1,87 @@
+import multiprocessing
+
+from core.cancellation import CancellationToken
+from core.features import DocumentFeatures
+from core.issues import ISSUE_FONT, NOTE_CANCELLED, STATUS_CANCELLED
+from core.rules import CheckContext, DOCX_NODE_KINDS, PDF_NODE_KINDS, Rule, RuleSet, default_registry
+
+CONFIG = {
+    "font_name": "Times New Roman",
+    "font_size": 12,
+    "line_spacing": 1.5,
+    "margin_left": 4.0,
+    "margin_right": 3.0,
+    "margin_top": 3.0,
+    "margin_bottom": 3.0,
+    "margin_tolerance": 0.1,
+    "pdf_size_tolerance": 0.5,
+}
+
+
+class CancelAfter(Rule):
+    """Sets the token once ``count`` nodes of ``kind`` were visited, like a user pressing Stop."""
+    code = "_cancel_after"
+
+    def __init__(self, config, token, kind, count):
+        super().__init__(config)
+        self.node_kinds = (kind,)
+        self.token = token
+        self.count = count
+        setattr(self, f"visit_{kind}", self._visit)
+
+    def _visit(self, node, ctx):
+        self.count -= 1
+        if self.count == 0:
+            self.token.cancel()
+
+
+def check(features, kinds, token, kind, count):
+    rule_set = RuleSet(default_registry.build(CONFIG).rules + [CancelAfter(CONFIG, token, kind, count)])
+    ctx = CheckContext("doc", features.file_type)
+    rule_set.start(ctx, kinds)
+    features.replay(rule_set, ctx, token)
+    # Seperti Checker: rule seluruh dokumen (margin) tidak menilai dokumen yang belum selesai
+    if not ctx.cancelled:
+        rule_set.finish(ctx, kinds)
+    return ctx.to_result()
+
+
+def test_docx_check_stops_at_the_next_paragraph():
+    features = DocumentFeatures("docx")
+    for ordinal in range(5):
+        features.run_para.append(ordinal)
+        features.run_font.append(features.font_id("Arial"))
+        features.run_size.append(12.0)
+        features.para_index.append(ordinal)
+        features.para_text.append(f"paragraf {ordinal}")
+        features.para_spacing.append(float("nan"))
+    features.section_margins.extend((4.0, 3.0, 3.0, 3.0))
+
+    result = check(features, DOCX_NODE_KINDS, CancellationToken(), "paragraph", 2)
+    assert result.status == STATUS_CANCELLED
+    # Temuan dua paragraf pertama tetap ada; dokumen yang belum selesai tidak lulus
+    assert [(issue.code, issue.paragraph) for issue in result.issues] == [
+        (ISSUE_FONT, 0), (ISSUE_FONT, 1), (NOTE_CANCELLED, -1),
+    ]
+    assert not result.success
+
+
+def test_pdf_check_reports_the_page_it_stopped_at():
+    features = DocumentFeatures("pdf")
+    for page in (1, 2, 3):
+        features.page_number.append(page)
+        features.page_size.extend((595.0, 842.0))
+
+    result = check(features, PDF_NODE_KINDS, CancellationToken(), "page", 1)
+    assert result.status == STATUS_CANCELLED
+    assert [(issue.code, issue.page) for issue in result.issues] == [(NOTE_CANCELLED, 2)]
+    assert not result.success
+
+
+def test_shared_token_is_cancelled_from_another_process():
+    token = CancellationToken.shared(multiprocessing.get_context("spawn"))
+    process = multiprocessing.get_context("spawn").Process(target=token.cancel)
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    assert token.cancelled
@@ -0,0 +1,156 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from core import columnar
+from core.features import DocumentFeatures
+from core.issues import ISSUE_FONT, ISSUE_SIZE
+from core.rules import CheckContext, DOCX_NODE_KINDS, PDF_NODE_KINDS, Rule, default_registry
+
+CONFIG = {
+    "font_name": "Times New Roman",
+    "font_size": 12,
+    "line_spacing": 1.5,
+    "margin_left": 4.0,
+    "margin_right": 3.0,
+    "margin_top": 3.0,
+    "margin_bottom": 3.0,
+    "margin_tolerance": 0.1,
+    "pdf_size_tolerance": 0.5,
+}
+
+
+def pdf_features():
+    features = DocumentFeatures("pdf")
+    # Ukuran di tengah langkah 0,1 pt: ``round(x, 1)`` menggabungkan 0,05 dengan 0,1, sedangkan
+    # pembulatan ``x * 10`` NumPy (0,5 -> 0) tidak; kunci dedupe kedua jalur harus sama
+    spans = [(0.05, "a"), (0.1, "a"), (0.45, "b"), (0.5, "b"), (1.85, "c"), (1.9, "c"),
+             (2.15, "d"), (2.1, "d"), (13.45, "e"), (13.45, "e"), (12.0, "f"), (12.4, "f")]
+    for page in (1, 2):
+        features.page_number.append(page)
+        features.page_size.extend((595.0, 842.0))
+        for index, (size, text) in enumerate(spans):
+            features.span_page.append(page)
+            features.span_text.append(f"teks {text}")
+            features.span_font.append(features.font_id("Arial" if index % 2 else "Times New Roman"))
+            features.span_size.append(size)
+            features.span_bbox.extend((72.0, 72.0 + index, 200.0, 84.0 + index))
+    return features
+
+
+def docx_features():
+    features = DocumentFeatures("docx")
+    runs = [[(None, None)], [("Arial", 11.0), ("Times New Roman", 12.0)], [("Times New Roman", 14.0), (None, 14.0)]]
+    for ordinal, paragraph in enumerate(runs):
+        for font, size in paragraph:
+            features.run_para.append(ordinal)
+            features.run_font.append(features.font_id(font))
+            features.run_size.append(float("nan") if size is None else size)
+        features.para_index.append(ordinal * 2)
+        features.para_text.append(f"paragraf {ordinal}")
+        features.para_spacing.append([1.5, 1.0, float("nan")][ordinal])
+    features.section_margins.extend((4.0, 3.0, 3.0, 3.5))
+    return features
+
+
+def result_by_replay(features, kinds, enabled=None):
+    rule_set = default_registry.build(CONFIG, enabled)
+    ctx = CheckContext("doc", features.file_type)
+    rule_set.start(ctx, kinds)
+    features.replay(rule_set, ctx)
+    rule_set.finish(ctx, kinds)
+    return ctx.to_result()
+
+
+def result_by_columns(features, kinds, enabled=None):
+    rules = default_registry.build(CONFIG, enabled).rules_for(kinds)
+    assert columnar.supports(rules)
+    ctx = CheckContext("doc", features.file_type)
+    columnar.evaluate(features, rules, ctx)
+    return ctx.to_result()
+
+
+def issues_by_replay(features, kinds):
+    return result_by_replay(features, kinds).messages
+
+
+def issues_by_columns(features, kinds):
+    return result_by_columns(features, kinds).messages
+
+
+@pytest.mark.parametrize("features, kinds", [
+    (pdf_features(), PDF_NODE_KINDS),
+    (docx_features(), DOCX_NODE_KINDS),
+])
+def test_columnar_reports_the_same_issues_as_replay(features, kinds):
+    replayed = issues_by_replay(features, kinds)
+    assert replayed
+    assert issues_by_columns(features, kinds) == replayed
+
+
+def run_issue_features():
+    features = DocumentFeatures("docx")
+    runs = [
+        [("Times New Roman", 14.0), ("Arial", 12.0)],  # ukuran salah lebih dulu
+        [("Arial", 11.0), ("Arial", 14.0)],  # font dan ukuran salah di run yang sama
+        [("Times New Roman", 12.0), ("Times New Roman", 10.0), ("Arial", 10.0)],
+    ]
+    for ordinal, paragraph in enumerate(runs):
+        for font, size in paragraph:
+            features.run_para.append(ordinal)
+            features.run_font.append(features.font_id(font))
+            features.run_size.append(size)
+        features.para_index.append(ordinal)
+        features.para_text.append(f"paragraf {ordinal}")
+        features.para_spacing.append(float("nan"))
+    features.section_margins.extend((4.0, 3.0, 3.0, 3.0))
+    return features
+
+
+def run_issues(result):
+    return [(issue.code, issue.paragraph, result.value(issue.found)) for issue in result.issues]
+
+
+@pytest.mark.parametrize("evaluate", [result_by_replay, result_by_columns])
+def test_only_the_first_offending_run_of_a_paragraph_is_reported(evaluate):
+    # Satu temuan font/ukuran per paragraf, dari run pertama yang bermasalah; font lebih dulu
+    assert run_issues(evaluate(run_issue_features(), DOCX_NODE_KINDS)) == [
+        (ISSUE_SIZE, 0, 14.0),
+        (ISSUE_FONT, 1, "Arial"),
+        (ISSUE_SIZE, 2, 10.0),
+    ]
+    # Tanpa aturan ukuran, run yang salah font tetap dilaporkan
+    assert run_issues(evaluate(run_issue_features(), DOCX_NODE_KINDS, ["font_name"])) == [
+        (ISSUE_FONT, 0, "Arial"), (ISSUE_FONT, 1, "Arial"), (ISSUE_FONT, 2, "Arial"),
+    ]
+
+
+def test_rule_without_evaluate_columns_is_not_supported():
+    class VisitOnlyRule(Rule):
+        code = "visit_only"
+        node_kinds = ("span",)
+
+        def visit_span(self, node, ctx):
+            pass
+
+    assert not columnar.supports([VisitOnlyRule(CONFIG)])
+
+
+def test_dominant_font_size_weights_spans_by_characters():
+    features = DocumentFeatures("pdf")
+    for text, size in (("judul", 16.0), ("isi " * 50, 11.96), ("isi " * 40, 12.04), ("catatan kaki " * 5, 10.0)):
+        features.span_page.append(1)
+        features.span_text.append(text)
+        features.span_font.append(features.font_id("Arial"))
+        features.span_size.append(size)
+    # 11,96 dan 12,04 sama-sama 12,0 pt (kunci ukuran 0,1 pt)
+    assert columnar.dominant_font_size(features) == 12.0
+    assert columnar.dominant_font_size(DocumentFeatures("pdf")) is None
+
+
+def test_dominant_font_size_python_fallback(monkeypatch):
+    features = docx_features()
+    expected = columnar.dominant_font_size(features)
+    monkeypatch.setattr(columnar, "np", None)
+    assert expected == 14.0
+    assert columnar.dominant_font_size(features) == expected
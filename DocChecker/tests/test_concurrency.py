@@ -0,0 +1,49 @@
+from core import concurrency
+from core.concurrency import ConcurrencyController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_controller(monkeypatch, clock):
+    monkeypatch.setattr(concurrency.time, "monotonic", clock)
+    monkeypatch.setattr(concurrency, "cpu_count", lambda: 8)
+    monkeypatch.setattr(concurrency._CpuSampler, "sample", lambda self: 50.0)
+    return ConcurrencyController(min_workers=1, max_workers=8, memory_budget_mb=100000, interval=1.0)
+
+
+def run_window(controller, clock, files, cost):
+    for _ in range(files):
+        controller.file_done(cost)
+    clock.now += 1.0
+    return controller.update()
+
+
+def test_growing_file_cost_does_not_shrink_the_pool(monkeypatch):
+    clock = FakeClock()
+    controller = make_controller(monkeypatch, clock)
+    limit = controller.limit
+    # Shortest-job-first: jumlah berkas per detik turun, tetapi kerja per detik naik bersama worker
+    files, cost = 40, 0.1
+    for _ in range(4):
+        new_limit = run_window(controller, clock, files, cost)
+        assert new_limit >= limit
+        work = files * cost * (new_limit / limit)
+        limit = new_limit
+        cost *= 2
+        files = max(1, round(work / cost))
+    assert limit > 4
+
+
+def test_extra_worker_without_more_work_steps_back(monkeypatch):
+    clock = FakeClock()
+    controller = make_controller(monkeypatch, clock)
+    start = run_window(controller, clock, 10, 1.0)
+    assert start == 5
+    # Kerja per detik tetap: worker tambahan tidak berguna
+    assert run_window(controller, clock, 10, 1.0) == 4
@@ -0,0 +1,26 @@
+import os
+
+from core.features import DocumentFeatures, FeatureCache
+from core.supervisor import SettingsSnapshot
+
+
+def test_feature_cache_is_off_unless_enabled(tmp_path):
+    # Entri cache memuat teks dokumen, jadi tidak boleh aktif tanpa persetujuan pengguna
+    assert FeatureCache.from_settings(SettingsSnapshot({})) is None
+    cache = FeatureCache.from_settings(SettingsSnapshot({"cache/enabled": True, "cache/dir": str(tmp_path)}))
+    assert cache.directory == str(tmp_path)
+
+
+def test_feature_cache_misses_after_the_file_changes(tmp_path):
+    document = tmp_path / "a.docx"
+    document.write_bytes(b"isi")
+    features = DocumentFeatures("docx")
+    features.para_text.append("paragraf")
+    cache = FeatureCache(str(tmp_path / "cache"))
+
+    cache.store(str(document), os.stat(document), features)
+    assert cache.load(str(document), os.stat(document)).para_text == ["paragraf"]
+
+    document.write_bytes(b"isi baru")
+    assert cache.load(str(document), os.stat(document)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
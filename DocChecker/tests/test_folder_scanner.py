@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from core.cancellation import CancellationToken
+from core.folder_scanner import FolderScanner, split_patterns
+from core.supervisor import SettingsSnapshot
+
+
+def make_tree(root, names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+
+def scan(scanner, *paths, cancel=None):
+    return [path for chunk in scanner.scan([str(path) for path in paths], cancel) for path in chunk]
+
+
+def relative(root, paths):
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in paths]
+
+
+def test_split_patterns():
+    assert split_patterns(" *.pdf; draft/*,, ~$* ") == ["*.pdf", "draft/*", "~$*"]
+    assert split_patterns(["a", "b"]) == ["a", "b"]
+    assert split_patterns(None) == []
+
+
+def test_scan_filters_documents_depth_first_in_name_order(tmp_path):
+    make_tree(tmp_path, [
+        "b.PDF", "a.docx", "catatan.txt", "~$a.docx", ".tersembunyi.pdf",
+        "bab/1.docx", "bab/lampiran/2.pdf", ".git/x.pdf", "arsip/lama.pdf",
+    ])
+    scanner = FolderScanner(exclude=split_patterns("~$*;.*;arsip"))
+    assert relative(tmp_path, scan(scanner, tmp_path)) == ["a.docx", "b.PDF", "bab/1.docx", "bab/lampiran/2.pdf"]
+    assert scanner.files_found == 4
+
+
+def test_include_patterns_with_a_slash_match_the_relative_path(tmp_path):
+    make_tree(tmp_path, ["bab/1.docx", "lampiran/1.docx", "lampiran/2.pdf"])
+    scanner = FolderScanner(include=["lampiran/*"])
+    assert relative(tmp_path, scan(scanner, tmp_path)) == ["lampiran/1.docx", "lampiran/2.pdf"]
+
+
+def test_files_given_twice_or_through_a_link_are_returned_once(tmp_path):
+    make_tree(tmp_path, ["bab/1.docx"])
+    try:
+        os.symlink(tmp_path / "bab", tmp_path / "tautan")
+        os.symlink(tmp_path, tmp_path / "bab" / "melingkar")
+    except (OSError, NotImplementedError):
+        pytest.skip("symlink tidak didukung")
+    scanner = FolderScanner(follow_symlinks=True)
+    paths = scan(scanner, tmp_path, tmp_path / "bab" / "1.docx")
+    assert relative(tmp_path, paths) == ["bab/1.docx"]
+    assert scanner.duplicates >= 2
+
+
+def test_chunks_and_cancellation(tmp_path):
+    make_tree(tmp_path, [f"{index:02d}.pdf" for index in range(5)] + ["sub/x.pdf"])
+    chunks = list(FolderScanner(chunk_size=2, chunk_interval=3600).scan([str(tmp_path)]))
+    # Sisa berkas folder akar digabung dengan berkas subfolder sampai chunk penuh
+    assert [relative(tmp_path, chunk) for chunk in chunks] == [
+        ["00.pdf", "01.pdf"], ["02.pdf", "03.pdf"], ["04.pdf", "sub/x.pdf"],
+    ]
+
+    cancel = CancellationToken()
+    cancel.cancel()
+    # Berkas yang diberikan langsung tetap dikembalikan, folder tidak dibaca
+    assert scan(FolderScanner(), tmp_path / "00.pdf", tmp_path / "sub", cancel=cancel) == [str(tmp_path / "00.pdf")]
+
+
+def test_from_settings():
+    scanner = FolderScanner.from_settings(SettingsSnapshot({"scan/include_patterns": "*.pdf"}))
+    assert (scanner.include, scanner.exclude, scanner.follow_symlinks) == (["*.pdf"], ["~$*", ".*"], False)
@@ -0,0 +1,84 @@
+import pickle
+
+from core.issues import (
+    ISSUE_FONT, ISSUE_MARGIN_LEFT, ISSUE_SIZE, NOTE_PDF_MARGIN, STATUS_COMPLETED,
+    CheckResult, Issue, IssueCollector, IssueTable, issue_kind, KIND_VIOLATION,
+)
+
+
+def state(issues):
+    return [issue.__getstate__() for issue in issues]
+
+
+def sample_result():
+    collector = IssueCollector()
+    collector.add(ISSUE_FONT, paragraph=3, found="Arial", expected="Times New Roman", text="paragraf")
+    collector.add(ISSUE_FONT, page=2, found="Arial", expected="Times New Roman", text="halaman")
+    collector.add(ISSUE_MARGIN_LEFT, found=3.5, expected=4.0)
+    collector.add(NOTE_PDF_MARGIN)
+    return CheckResult.from_collector("doc.docx", collector)
+
+
+def test_collector_stores_equal_values_once():
+    result = sample_result()
+    assert result.values == ["Arial", "Times New Roman", "paragraf", "halaman", 3.5, 4.0]
+    assert not result.success
+    # Catatan saja tidak membuat dokumen gagal
+    collector = IssueCollector()
+    collector.add(NOTE_PDF_MARGIN)
+    assert CheckResult.from_collector("doc.pdf", collector).success
+
+
+def test_issue_table_round_trips_issues():
+    result = sample_result()
+    issues = list(result.issues)
+    table = IssueTable(issues)
+    assert len(table) == len(issues)
+    assert state(table) == state(issues)
+    assert [table[index].__getstate__() for index in range(len(table))] == state(issues)
+
+    # Kode dari rule pihak ketiga didaftarkan saat pertama kali disimpan
+    table = IssueTable(issues)
+    table.append(Issue("test_custom_rule", page=1))
+    assert table[-1].code == "test_custom_rule"
+    assert issue_kind("test_custom_rule") == KIND_VIOLATION
+
+
+def test_compact_result_keeps_messages_and_details_and_pickles():
+    result = sample_result()
+    messages, details = result.messages, result.details
+    assert result.compact() is result
+    assert isinstance(result.issues, IssueTable)
+    assert result.messages == messages
+    assert result.details == details
+
+    # Hasil dikirim dari proses worker lewat pickle
+    copy = pickle.loads(pickle.dumps(result))
+    assert (copy.filename, copy.success, copy.status) == ("doc.docx", False, STATUS_COMPLETED)
+    assert state(copy.issues) == state(result.issues)
+    assert copy.messages == messages
+
+
+def test_merge_remaps_value_ids():
+    first, second = IssueCollector(), IssueCollector()
+    first.add(ISSUE_SIZE, page=1, found=14.0, expected=12, text="a")
+    second.add(ISSUE_SIZE, page=9, found=10.0, expected=12, text="b")
+    first.merge(CheckResult.from_collector("doc.pdf", second).compact())
+
+    merged = CheckResult.from_collector("doc.pdf", first)
+    assert [(issue.page, merged.value(issue.found), merged.value(issue.expected), merged.value(issue.snippet))
+            for issue in merged.issues] == [(1, 14.0, 12, "a"), (9, 10.0, 12, "b")]
+    assert merged.values.count(12) == 1
+
+
+def test_details_keep_the_legacy_size_formats():
+    collector = IssueCollector()
+    collector.add(ISSUE_SIZE, paragraph=0, found=14.0, expected=12, text="paragraf")
+    collector.add(ISSUE_SIZE, page=2, found=13.5, expected=12, text="halaman")
+    details = CheckResult.from_collector("doc", collector).details
+
+    # DOCX: angka; PDF: teks dengan satuan seperti sebelum rule dipisah
+    assert details["size_issues"] == [
+        {"paragraph": 0, "text": "paragraf", "found": 14.0, "expected": 12},
+        {"page": 2, "text": "halaman", "found": "13.5pt", "expected": "12.0pt"},
+    ]
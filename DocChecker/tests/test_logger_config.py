@@ -0,0 +1,82 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from core import logger_config  # noqa: E402
+from core.logger_config import DeferredQueueHandler, JsonFormatter, SamplingFilter  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_record(msg="pesan %s", args=("a",), level=logging.DEBUG, name="uji"):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_allows_burst_then_rate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(logger_config.time, "monotonic", clock)
+    sampler = SamplingFilter(rate=2.0, burst=3)
+
+    assert [sampler.filter(make_record()) for _ in range(5)] == [True, True, True, False, False]
+    # Setengah detik kemudian satu token tersedia; record itu membawa jumlah yang dibuang
+    clock.now += 0.5
+    record = make_record()
+    assert sampler.filter(record)
+    assert record.sampled_out == 2
+    assert not sampler.filter(make_record())
+
+
+def test_sampling_filter_keys_by_call_site_and_skips_higher_levels(monkeypatch):
+    monkeypatch.setattr(logger_config.time, "monotonic", FakeClock())
+    sampler = SamplingFilter(rate=1.0, burst=1)
+
+    assert sampler.filter(make_record("a %s"))
+    assert not sampler.filter(make_record("a %s", ("lain",)))
+    # Template lain atau logger lain punya jatah sendiri
+    assert sampler.filter(make_record("b %s"))
+    assert sampler.filter(make_record("a %s", name="uji.lain"))
+    # WARNING ke atas tidak pernah disampel
+    assert all(sampler.filter(make_record("a %s", level=logging.WARNING)) for _ in range(10))
+
+
+def test_json_formatter_reports_suppressed_count_and_traceback():
+    try:
+        raise ValueError("rusak")
+    except ValueError:
+        record = logging.LogRecord("uji", logging.ERROR, __file__, 7, "gagal %d", (3,), sys.exc_info())
+    record.sampled_out = 4
+
+    entry = json.loads(logger_config._SampledJsonFormatter().format(record))
+    assert entry["msg"] == "gagal 3"
+    assert entry["level"] == "ERROR" and entry["line"] == 7
+    assert entry["sampled_out"] == 4
+    assert "ValueError: rusak" in entry["exc"]
+    assert "sampled_out" not in json.loads(JsonFormatter().format(make_record()))
+
+
+def test_deferred_queue_handler_keeps_arguments_and_renders_traceback():
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    try:
+        raise KeyError("x")
+    except KeyError:
+        record = logging.LogRecord("uji", logging.ERROR, __file__, 1, "nilai %s", ([1, 2],), sys.exc_info())
+    handler.handle(record)
+
+    queued = log_queue.get_nowait()
+    # Pesan belum diformat di thread pemanggil; traceback sudah, agar frame tidak tertahan
+    assert queued.msg == "nilai %s" and queued.args == ([1, 2],)
+    assert queued.exc_info is None
+    assert "KeyError" in queued.exc_text
+    assert queued.getMessage() == "nilai [1, 2]"
@@ -0,0 +1,63 @@
+import tracemalloc
+
+import pytest
+
+from core import memory_diagnostics
+from core.supervisor import SettingsSnapshot
+
+pytestmark = pytest.mark.skipif(tracemalloc.is_tracing(), reason="tracemalloc sudah dipakai (mis. pytest -X tracemalloc)")
+
+# Disimpan di tingkat modul agar alokasinya bertahan setelah langkah yang diukur
+_kept = []
+
+
+@pytest.fixture
+def diagnostics():
+    assert memory_diagnostics.from_settings(SettingsSnapshot({})) is None
+    diagnostics = memory_diagnostics.from_settings(SettingsSnapshot({"developer/memory_diagnostics": "true"}))
+    try:
+        yield diagnostics
+    finally:
+        memory_diagnostics.stop()
+        _kept.clear()
+
+
+def test_retained_memory_is_flagged_and_attributed(diagnostics):
+    diagnostics.leak_threshold = 512 * 1024
+    with memory_diagnostics.measure("bocor.pdf"):
+        _kept.append(bytearray(2 * 1024 * 1024))
+    with memory_diagnostics.measure("bersih.pdf"):
+        bytearray(4 * 1024 * 1024)
+    with memory_diagnostics.measure("daftar hasil", kind="render"):
+        pass
+
+    leak, clean, render = diagnostics.records
+    assert leak.flagged and leak.retained >= 2 * 1024 * 1024
+    assert "test_memory_diagnostics.py" in leak.sites[0][0]
+    # Memori sementara terlihat di puncak, tetapi tidak tertahan
+    assert not clean.flagged
+    assert clean.peak >= 4 * 1024 * 1024
+    assert render.kind == "render"
+
+    report = diagnostics.report()
+    assert report.index("bocor.pdf") < report.index("bersih.pdf")
+    assert "[NOT BACK TO BASELINE]" in report
+    assert "1 retained more than 512.0 KiB" in report
+
+
+def test_measure_does_nothing_when_off():
+    assert memory_diagnostics.active() is None
+    with memory_diagnostics.measure("a.pdf"):
+        pass
+    assert not tracemalloc.is_tracing()
+
+
+def test_stop_ends_tracing_it_started(diagnostics, tmp_path):
+    assert tracemalloc.is_tracing()
+    with memory_diagnostics.measure("a.pdf"):
+        pass
+    path = diagnostics.write(str(tmp_path / "memori.txt"))
+    assert "1 steps" in open(path, encoding="utf-8").read()
+    assert memory_diagnostics.stop() is diagnostics
+    assert not tracemalloc.is_tracing()
+    assert memory_diagnostics.stop() is None
@@ -0,0 +1,82 @@
+import pytest
+
+from core import metrics
+from core.issues import ERROR_TIMEOUT, STATUS_TIMEOUT, CheckResult, IssueCollector
+from core.metrics import MetricsRegistry
+
+
+def test_render_uses_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    checks = registry.counter("t_checks_total", "Checks.", ("type", "verdict"))
+    depth = registry.gauge("t_queue_depth", "Queue.", ("queue",))
+    latency = registry.histogram("t_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    registry.counter("t_idle_total", "Never incremented.")
+
+    checks.inc(type="pdf", verdict="fail")
+    checks.inc(2, type="docx", verdict="pass")
+    depth.set_function(lambda: 3, queue='batch "1"\n')
+    latency.observe(0.05, stage="parse")
+    latency.observe(0.5, stage="parse")
+    latency.observe(5, stage="parse")
+
+    assert registry.render() == "\n".join([
+        "# HELP t_checks_total Checks.",
+        "# TYPE t_checks_total counter",
+        't_checks_total{type="docx",verdict="pass"} 2',
+        't_checks_total{type="pdf",verdict="fail"} 1',
+        "# HELP t_queue_depth Queue.",
+        "# TYPE t_queue_depth gauge",
+        # Nilai label di-escape
+        't_queue_depth{queue="batch \\"1\\"\\n"} 3',
+        "# HELP t_seconds Latency.",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{stage="parse",le="0.1"} 1',
+        't_seconds_bucket{stage="parse",le="1"} 2',
+        't_seconds_bucket{stage="parse",le="+Inf"} 3',
+        't_seconds_sum{stage="parse"} 5.55',
+        't_seconds_count{stage="parse"} 3',
+        # Penghitung tanpa label tetap muncul dengan nilai 0
+        "# HELP t_idle_total Never incremented.",
+        "# TYPE t_idle_total counter",
+        "t_idle_total 0",
+    ]) + "\n"
+
+
+def test_labels_must_match_the_declared_names():
+    counter = MetricsRegistry().counter("t_total", "Total.", ("type",))
+    with pytest.raises(ValueError):
+        counter.inc(kind="pdf")
+
+
+def test_merge_adds_counters_and_histograms_and_keeps_gauge_maximum():
+    def registry():
+        registry = MetricsRegistry()
+        registry.counter("t_total", "Total.", ("type",))
+        registry.gauge("t_rss", "RSS.", ("process",))
+        registry.histogram("t_seconds", "Latency.", buckets=(1.0,))
+        return registry
+
+    parent, worker = registry(), registry()
+    parent._metrics["t_total"].inc(type="pdf")
+    parent._metrics["t_rss"].set(300, process="worker")
+    worker._metrics["t_total"].inc(2, type="pdf")
+    worker._metrics["t_rss"].set(200, process="worker")
+    worker._metrics["t_seconds"].observe(2.0)
+
+    drained = worker.drain()
+    # Penghitung dan histogram worker direset setelah dikirim
+    assert worker._metrics["t_total"].total() == 0
+    assert worker._metrics["t_seconds"].count() == 0
+
+    parent.merge(drained)
+    parent.merge(None)
+    assert parent._metrics["t_total"].value(type="pdf") == 3
+    assert parent._metrics["t_rss"].drain() == {("worker",): 300}
+    assert parent._metrics["t_seconds"].count() == 1
+    assert 't_seconds_bucket{le="+Inf"} 1' in parent.render()
+
+
+def test_verdict_and_file_type_labels():
+    assert metrics.verdict(CheckResult.from_collector("a.pdf", IssueCollector())) == "pass"
+    assert metrics.verdict(CheckResult.error("a.pdf", ERROR_TIMEOUT, 5, status=STATUS_TIMEOUT)) == STATUS_TIMEOUT
+    assert [metrics.file_type(name) for name in ("a.PDF", "b.docx", "c.txt")] == ["pdf", "docx", "other"]
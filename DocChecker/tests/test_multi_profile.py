@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from core.issues import CheckResult, ERROR_UNSUPPORTED, IssueCollector, ISSUE_FONT
+from core.profiles import Profile, VerdictMatrix
+
+
+def result(success):
+    collector = IssueCollector()
+    if not success:
+        collector.add(ISSUE_FONT, paragraph=0, found="Arial", expected="Times New Roman")
+    return CheckResult.from_collector("doc.docx", collector)
+
+
+def test_verdict_matrix_rows_and_pass_counts():
+    matrix = VerdictMatrix(["Skripsi", "Jurnal"])
+    matrix.add("a.docx", {"Skripsi": result(True), "Jurnal": result(False)})
+    matrix.add("b.docx", {"Skripsi": result(True), "Jurnal": result(True)})
+    matrix.add("c.docx", {"Skripsi": result(False)})
+
+    assert len(matrix) == 3
+    assert matrix.passed("a.docx") == ["Skripsi"]
+    assert matrix.passed("c.docx") == []
+    assert matrix.passed("tidak_ada.docx") == []
+    assert matrix.result("c.docx", "Jurnal") is None
+    assert matrix.pass_counts() == {"Skripsi": 2, "Jurnal": 1}
+
+
+@pytest.fixture
+def checker(tmp_path):
+    pytest.importorskip("docx")
+    pytest.importorskip("fitz")
+    from core.checker import Checker
+    from core.supervisor import SettingsSnapshot
+    return Checker(SettingsSnapshot({"cache/enabled": True, "cache/dir": str(tmp_path / "cache")}))
+
+
+def test_every_profile_is_evaluated_on_one_parse(tmp_path, checker, monkeypatch):
+    from core.features import DocumentFeatures
+
+    path = tmp_path / "bab1.docx"
+    path.write_bytes(b"isi")
+    features = DocumentFeatures("docx")
+    features.run_para.append(0)
+    features.run_font.append(features.font_id("Arial"))
+    features.run_size.append(11.0)
+    features.para_index.append(0)
+    features.para_text.append("paragraf")
+    features.para_spacing.append(1.5)
+    features.section_margins.extend((4.0, 3.0, 3.0, 3.0))
+    # Fitur sudah di cache: pemeriksaan tidak boleh mem-parsing berkas
+    checker.feature_cache.store(str(path), os.stat(path), features)
+    monkeypatch.setattr(type(checker), "_record_docx", lambda *args: pytest.fail("dokumen di-parse"))
+
+    skripsi = Profile("Skripsi")
+    jurnal = Profile("Jurnal", {"font_name": "Arial", "font_size": 11})
+    results = checker.check_profiles(str(path), [skripsi, jurnal])
+
+    assert list(results) == ["Skripsi", "Jurnal"]
+    # Satu temuan font/ukuran per paragraf: run Arial 11 pt dilaporkan sebagai font
+    assert [issue.code for issue in results["Skripsi"].issues] == [ISSUE_FONT]
+    assert results["Jurnal"].success
+    assert results["Skripsi"].fingerprint == skripsi.fingerprint
+    assert results["Jurnal"].fingerprint == jurnal.fingerprint
+
+
+def test_unsupported_file_gets_an_error_per_profile(tmp_path, checker):
+    path = tmp_path / "catatan.txt"
+    path.write_text("bukan dokumen")
+    results = checker.check_profiles(str(path), [Profile("A"), Profile("B", {"font_size": 11})])
+    assert {name: result.issues[0].code for name, result in results.items()} == {"A": ERROR_UNSUPPORTED,
+                                                                                    "B": ERROR_UNSUPPORTED}
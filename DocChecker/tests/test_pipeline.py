@@ -0,0 +1,65 @@
+import asyncio
+import multiprocessing
+
+import pytest
+
+# Pemeriksa (juga di proses worker) membutuhkan python-docx dan PyMuPDF
+pytest.importorskip("docx")
+pytest.importorskip("fitz")
+
+from core.cancellation import CancellationToken  # noqa: E402
+from core.issues import ERROR_CHECK, ERROR_UNSUPPORTED  # noqa: E402
+from core.pipeline import aiter_check, iter_check  # noqa: E402
+
+
+@pytest.fixture
+def notes(tmp_path):
+    paths = []
+    for index in range(4):
+        path = tmp_path / f"catatan{index}.txt"
+        path.write_text("bukan dokumen")
+        paths.append(str(path))
+    return paths
+
+
+def test_inline_mode_turns_failures_into_error_results(tmp_path, notes):
+    missing = str(tmp_path / "hilang.docx")
+    results = list(iter_check([notes[0], missing], jobs=0, with_paths=True))
+    assert [path for path, _ in results] == [notes[0], missing]
+    assert [result.issues[0].code for _, result in results] == [ERROR_UNSUPPORTED, ERROR_CHECK]
+
+
+def test_ordered_results_follow_the_input_order(notes):
+    results = list(iter_check(notes, jobs=2, ordered=True, with_paths=True))
+    assert [path for path, _ in results] == notes
+    assert all(result.issues[0].code == ERROR_UNSUPPORTED for _, result in results)
+
+
+def test_paths_are_consumed_lazily_and_break_stops_the_workers(notes):
+    pulled = []
+
+    def endless():
+        while True:
+            pulled.append(notes[len(pulled) % len(notes)])
+            yield pulled[-1]
+
+    for result in iter_check(endless(), jobs=1, max_in_flight=2):
+        assert result.issues[0].code == ERROR_UNSUPPORTED
+        # Paling banyak max_in_flight berkas dikirim sebelum hasil pertama diambil
+        assert len(pulled) <= 2
+        break
+    assert multiprocessing.active_children() == []
+
+
+def test_cancelled_run_submits_nothing(notes):
+    cancel = CancellationToken()
+    cancel.cancel()
+    assert list(iter_check(notes, jobs=0, cancel=cancel)) == []
+    assert list(iter_check(notes, jobs=1, cancel=cancel)) == []
+
+
+def test_aiter_check_yields_the_same_results(notes):
+    async def collect():
+        return [path async for path, _ in aiter_check(notes, jobs=0, with_paths=True)]
+
+    assert asyncio.run(collect()) == notes
@@ -0,0 +1,110 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from core.profiles import Profile, ProfileError, ProfileLibrary, RULE_DEFAULTS
+from core.supervisor import SettingsSnapshot
+
+CODES = ["font_name", "font_size", "line_spacing", "margins"]
+
+
+def test_fingerprint_depends_on_content_not_name():
+    profile = Profile("Skripsi", {"font_size": 12}, ["margins"])
+    assert profile.config["font_size"] == 12.0
+    assert Profile("Lain", {"font_size": 12.0}, ["margins"]).fingerprint == profile.fingerprint
+    assert Profile("Skripsi", {"font_size": 11}, ["margins"]).fingerprint != profile.fingerprint
+    assert Profile("Skripsi", {"font_size": 12}).fingerprint != profile.fingerprint
+    # Profil kosong = aturan default
+    assert Profile("", dict(RULE_DEFAULTS)).fingerprint == Profile("default").fingerprint
+
+
+def test_profile_is_immutable_and_pickles():
+    profile = Profile("Jurnal", {"font_name": "Arial"}, ["margins"], source="/p/jurnal.toml")
+    with pytest.raises(AttributeError):
+        profile.name = "lain"
+    with pytest.raises(TypeError):
+        profile.config["font_name"] = "Calibri"
+    copy = pickle.loads(pickle.dumps(profile))
+    assert copy == profile
+    assert (copy.fingerprint, copy.disabled, copy.source) == (profile.fingerprint, profile.disabled, profile.source)
+
+
+@pytest.mark.parametrize("data", [
+    {"rules": {"font_colour": "red"}},
+    {"rules": {"font_size": "12"}},
+    {"rules": {"font_size": True}},
+    {"rules": {"font_name": 12}},
+    {"disabled": ["tidak_ada"]},
+    {"disabled": "margins"},
+    {"name": " "},
+    {"aturan": {}},
+    [],
+])
+def test_invalid_profile_content_is_rejected(data):
+    with pytest.raises(ProfileError):
+        Profile.from_dict(data, "profil", CODES)
+
+
+def test_from_settings_converts_string_values():
+    settings = SettingsSnapshot({"font_size": "11", "margin_left": "3", "rules/margins/enabled": "false"})
+    profile = Profile.from_settings(settings, "", CODES)
+    assert profile.config["font_size"] == 11.0
+    assert profile.config["margin_left"] == 3.0
+    assert profile.disabled == frozenset({"margins"})
+    assert profile.fingerprint == Profile("x", {"font_size": 11, "margin_left": 3}, ["margins"]).fingerprint
+
+
+def test_toml_and_json_files_compile_to_the_same_profile(tmp_path):
+    toml_path = tmp_path / "jurnal.toml"
+    toml_path.write_text('disabled = ["margins"]\n\n[rules]\nfont_name = "Arial"\nfont_size = 11\n')
+    json_path = tmp_path / "jurnal.json"
+    json_path.write_text(json.dumps({"name": "Jurnal", "disabled": ["margins"],
+                                     "rules": {"font_name": "Arial", "font_size": 11.0}}))
+    from_toml = Profile.from_file(str(toml_path), CODES)
+    from_json = Profile.from_file(str(json_path), CODES)
+    # Nama default dari nama berkas
+    assert (from_toml.name, from_json.name) == ("jurnal", "Jurnal")
+    assert from_toml.fingerprint == from_json.fingerprint
+
+    broken = tmp_path / "rusak.json"
+    broken.write_text("{")
+    with pytest.raises(ProfileError):
+        Profile.from_file(str(broken))
+
+
+def write(path, data, mtime):
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_library_reloads_changed_files_only(tmp_path):
+    library = ProfileLibrary(str(tmp_path), CODES, min_interval=3600)
+    assert library.profiles() == []
+
+    write(tmp_path / "a.json", {"rules": {"font_size": 11}}, 1_000_000_000)
+    write(tmp_path / "b.json", {"rules": {"font_size": "besar"}}, 1_000_000_000)
+    write(tmp_path / "c.json", {"name": "a"}, 1_000_000_000)
+    (tmp_path / "catatan.txt").write_text("bukan profil")
+
+    # Dibatasi min_interval sampai dipaksa
+    assert library.names() == []
+    assert library.refresh(force=True)
+    # Berkas tidak valid dilewati; nama ganda hanya dipakai sekali (urutan path)
+    assert library.names() == ["a"]
+    assert library.get("a").config["font_size"] == 11.0
+    assert list(library.errors) == [str(tmp_path / "b.json")]
+
+    assert not library.refresh(force=True)
+
+    write(tmp_path / "a.json", {"rules": {"font_size": 10}}, 2_000_000_000)
+    write(tmp_path / "b.json", {"name": "b"}, 2_000_000_000)
+    assert library.refresh(force=True)
+    assert library.names() == ["a", "b"]
+    assert library.get("a").config["font_size"] == 10.0
+    assert library.errors == {}
+
+    os.remove(tmp_path / "b.json")
+    assert library.refresh(force=True)
+    assert library.get("b") is None
@@ -0,0 +1,49 @@
+import os
+import pstats
+
+from core.issues import CheckResult, IssueCollector
+from core.profiling import SlowFileProfiler
+from core.supervisor import SettingsSnapshot
+
+
+def test_profiler_is_off_unless_enabled(tmp_path):
+    assert SlowFileProfiler.from_settings(SettingsSnapshot({})) is None
+    profiler = SlowFileProfiler.from_settings(SettingsSnapshot({
+        "developer/profile_slow_files": "true", "developer/profile_dir": str(tmp_path),
+        "developer/profile_threshold": "2.5", "developer/profile_p99": True,
+    }))
+    assert (profiler.directory, profiler.threshold, profiler.use_p99) == (str(tmp_path), 2.5, True)
+
+
+def test_slow_check_is_dumped_with_a_report(tmp_path):
+    document = tmp_path / "bab 1.docx"
+    document.write_bytes(b"x" * 10)
+    profiler = SlowFileProfiler(str(tmp_path / "profil"), threshold=1e-9, max_dumps=1)
+
+    with profiler.profile(str(document)) as check:
+        sorted(range(1000))
+        check.result = CheckResult.from_collector("bab 1.docx", IssueCollector())
+    assert check.duration > 0
+    assert check.dump_path.endswith("-bab_1.docx.pstats")
+    # Berkas .pstats dapat dibaca alat analisis biasa
+    assert pstats.Stats(check.dump_path).total_calls > 0
+
+    report = open(check.dump_path[:-len(".pstats")] + ".txt", encoding="utf-8").read()
+    assert f"File: {document}" in report
+    assert "Size: 10 bytes" in report
+    assert "Status: completed, success: True, issues: 0" in report
+
+    # Batas max_dumps: berkas lambat berikutnya tidak disimpan lagi
+    with profiler.profile(str(document)) as check:
+        pass
+    assert check.dump_path is None
+    assert len(os.listdir(tmp_path / "profil")) == 2
+
+
+def test_p99_mode_keeps_only_outliers():
+    profiler = SlowFileProfiler(threshold=0, use_p99=True, min_samples=20)
+    # Sebelum ada cukup sampel tidak ada yang dianggap lambat
+    assert [profiler._slow_reason(1.0 + index / 100) for index in range(20)] == [None] * 20
+    assert profiler._slow_reason(1.1) is None
+    assert profiler._slow_reason(5.0).startswith("p99 1.190s")
+    assert profiler.dumps == 1
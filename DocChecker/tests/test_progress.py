@@ -0,0 +1,101 @@
+import pytest
+
+from core import progress
+from core.features import DocumentFeatures
+from core.progress import BatchProgress, DocumentProgress, format_duration
+from core.issues import ISSUE_FONT, ISSUE_MARGIN_BOTTOM
+from core.rules import CheckContext, DOCX_NODE_KINDS, RuleSet, default_registry
+
+CONFIG = {
+    "font_name": "Times New Roman",
+    "font_size": 12,
+    "line_spacing": 1.5,
+    "margin_left": 4.0,
+    "margin_right": 3.0,
+    "margin_top": 3.0,
+    "margin_bottom": 3.0,
+    "margin_tolerance": 0.1,
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_eta_is_weighted_by_file_size(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(progress.time, "monotonic", clock)
+    batch = BatchProgress()
+    assert batch.snapshot().eta is None
+
+    batch.start({"/a/kecil.pdf": 100, "/a/besar.pdf": 300})
+    batch.file_started("/a/kecil.pdf")
+    clock.now += 2.0
+    batch.file_done("/a/kecil.pdf")
+    batch.file_started("/a/besar.pdf")
+
+    snapshot = batch.snapshot()
+    assert (snapshot.done, snapshot.total, snapshot.in_flight, snapshot.current_file) == (1, 2, 1, "besar.pdf")
+    assert snapshot.fraction == 0.25
+    assert snapshot.bytes_per_second == 50.0
+    # Sisa 300 byte pada 50 byte/detik, bukan 1 berkas pada 0,5 berkas/detik
+    assert snapshot.eta == 6.0
+    assert not snapshot.finished
+
+
+def test_finished_batch_stops_the_clock_until_files_are_added(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(progress.time, "monotonic", clock)
+    batch = BatchProgress()
+    batch.start({"a.docx": 10})
+    clock.now += 4.0
+    batch.file_done("a.docx")
+    clock.now += 100.0
+
+    snapshot = batch.snapshot()
+    assert snapshot.finished
+    assert (snapshot.elapsed, snapshot.eta) == (4.0, 0.0)
+
+    batch.add({"b.docx": 30})
+    snapshot = batch.snapshot()
+    assert not snapshot.finished
+    assert (snapshot.total, snapshot.total_bytes) == (2, 40)
+    assert snapshot.elapsed == 104.0
+
+
+@pytest.mark.parametrize("seconds, text", [(0, "0:00"), (59.9, "0:59"), (61, "1:01"), (3725, "1:02:05")])
+def test_format_duration(seconds, text):
+    assert format_duration(seconds) == text
+
+
+def test_document_progress_reports_new_findings_only():
+    features = DocumentFeatures("docx")
+    for ordinal, font in enumerate(("Arial", "Times New Roman", "Arial")):
+        features.run_para.append(ordinal)
+        features.run_font.append(features.font_id(font))
+        features.run_size.append(12.0)
+        features.para_index.append(ordinal)
+        features.para_text.append(f"paragraf {ordinal}")
+        features.para_spacing.append(float("nan"))
+    features.section_margins.extend((4.0, 3.0, 3.0, 3.5))
+
+    reports = []
+
+    def callback(done, total, findings):
+        reports.append((done, total, [issue.code for issue in findings.issues]))
+
+    reporter = DocumentProgress(CONFIG, callback, total=3, interval=0)
+    rule_set = RuleSet(default_registry.build(CONFIG).rules + [reporter])
+
+    ctx = CheckContext("doc.docx", "docx")
+    rule_set.start(ctx, DOCX_NODE_KINDS)
+    features.replay(rule_set, ctx)
+    rule_set.finish(ctx, DOCX_NODE_KINDS)
+
+    # Laporan terakhir (finish) memuat temuan margin dari seluruh dokumen
+    assert reports == [(1, 3, [ISSUE_FONT]), (2, 3, []), (3, 3, [ISSUE_FONT]), (3, 3, [ISSUE_MARGIN_BOTTOM])]
+    assert sum(len(codes) for _, _, codes in reports) == len(ctx.issues)
@@ -0,0 +1,205 @@
+import pytest
+
+from core.scheduler import BatchScheduler, CostModel, FairJobQueue, Overloaded, estimate_file
+
+
+def drain(queue):
+    """Take every job, finishing each before the next, and return ``(tenant, item)`` in order."""
+    order = []
+    while True:
+        taken = queue.take(timeout=0)
+        if taken is None:
+            return order
+        order.append(taken)
+        queue.done(taken[0], 0.1)
+
+
+def test_sfq_interleaves_tenants_by_start_tag():
+    queue = FairJobQueue(workers=1, max_running=1)
+    for i in range(4):
+        queue.submit("a", f"a{i}")
+    queue.submit("b", "b0")
+    queue.submit("b", "b1")
+
+    # "b" masuk belakangan, tetapi start tag-nya sama dengan job kedua "a"
+    assert [item for _, item in drain(queue)] == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+
+def test_sfq_shares_follow_weights_and_cost():
+    queue = FairJobQueue(workers=1, max_running=1, weights={"heavy": 2.0})
+    for i in range(6):
+        queue.submit("heavy", f"h{i}")
+        queue.submit("light", f"l{i}")
+    first = [tenant for tenant, _ in drain(queue)][:6]
+    assert first.count("heavy") == 4 and first.count("light") == 2
+
+    queue = FairJobQueue(workers=1, max_running=1)
+    queue.submit("big", "big0", cost=3.0)
+    queue.submit("big", "big1", cost=3.0)
+    for i in range(3):
+        queue.submit("small", f"s{i}")
+    # Job besar menghabiskan jatah tenantnya tiga kali lebih cepat
+    assert [item for _, item in drain(queue)] == ["big0", "s0", "s1", "s2", "big1"]
+
+
+def test_max_running_per_tenant():
+    queue = FairJobQueue(workers=4, max_running=1)
+    queue.submit("a", "a0")
+    queue.submit("a", "a1")
+    queue.submit("b", "b0")
+
+    assert queue.take(timeout=0) == ("a", "a0")
+    assert queue.take(timeout=0) == ("b", "b0")
+    # "a" sudah menjalankan satu job; job keduanya menunggu meski worker bebas
+    assert queue.take(timeout=0) is None
+    queue.done("a", 0.1)
+    assert queue.take(timeout=0) == ("a", "a1")
+
+
+def test_tenant_queue_limit_rejects_with_retry_after():
+    queue = FairJobQueue(workers=2, max_running=1, max_queued=2)
+    queue.submit("a", 1)
+    queue.submit("a", 2)
+    with pytest.raises(Overloaded) as error:
+        queue.submit("a", 3)
+    assert error.value.reason == "tenant_queue_full"
+    assert error.value.retry_after >= 1
+    # Tenant lain tetap diterima
+    queue.submit("b", 1)
+    assert len(queue) == 3
+
+
+def test_total_queue_limit_and_retry_after_scales_with_backlog():
+    queue = FairJobQueue(workers=1, max_running=1, max_queued=100, max_queued_total=3)
+    for tenant in ("a", "b", "c"):
+        queue.submit(tenant, tenant)
+    with pytest.raises(Overloaded) as error:
+        queue.submit("d", "d")
+    assert error.value.reason == "queue_full"
+    short_wait = error.value.retry_after
+
+    tenant, _ = queue.take(timeout=0)
+    queue.done(tenant, 10.0)  # pemeriksaan lambat menaikkan perkiraan waktu layanan
+    queue.submit("e", "e")
+    with pytest.raises(Overloaded) as error:
+        queue.submit("f", "f")
+    assert error.value.retry_after > short_wait
+
+
+def test_queued_size_limit_counts_waiting_jobs_only():
+    queue = FairJobQueue(workers=1, max_running=1, max_queued_size=100)
+    # Antrean kosong selalu menerima, meski satu job melebihi batas
+    queue.submit("a", "a0", size=150)
+    with pytest.raises(Overloaded) as error:
+        queue.submit("b", "b0", size=10)
+    assert error.value.reason == "queue_size_full"
+    assert error.value.retry_after >= 1
+
+    # Job yang sudah diambil worker tidak lagi dihitung
+    assert queue.take(timeout=0) == ("a", "a0")
+    queue.submit("b", "b0", size=60)
+    queue.submit("c", "c0", size=40)
+    with pytest.raises(Overloaded):
+        queue.submit("d", "d0", size=1)
+    assert queue.stats()["queued_size"] == 100
+
+
+def test_closed_queue_rejects_and_wakes_takers():
+    queue = FairJobQueue()
+    queue.close()
+    assert queue.take(timeout=1) is None
+    with pytest.raises(Overloaded) as error:
+        queue.submit("a", 1)
+    assert error.value.reason == "closed"
+
+
+def test_idle_tenants_are_evicted():
+    queue = FairJobQueue(workers=1, max_running=1)
+    for i in range(50):
+        queue.submit(f"10.0.0.{i}", i)
+        tenant, _ = queue.take(timeout=0)
+        queue.done(tenant, 0.1)
+    assert queue.stats()["tenants"] == {}
+
+    # Selama tenant lain sibuk, tenant menganggur dilepas begitu waktu virtual melewatinya
+    for i in range(5):
+        queue.submit("busy", i)
+    for i in range(4):
+        queue.submit(f"10.0.1.{i}", i)
+        for _ in range(2):
+            tenant, _ = queue.take(timeout=0)
+            queue.done(tenant, 0.1)
+    assert set(queue.stats()["tenants"]) <= {"busy", "10.0.1.3"}
+
+
+def test_rejected_new_tenant_is_not_kept():
+    queue = FairJobQueue(workers=1, max_queued_total=1)
+    queue.submit("a", 1)
+    for i in range(20):
+        with pytest.raises(Overloaded):
+            queue.submit(f"client-{i}", i)
+    assert list(queue.stats()["tenants"]) == ["a"]
+
+
+def test_evicted_tenant_does_not_jump_the_queue():
+    queue = FairJobQueue(workers=1, max_running=1)
+    for i in range(3):
+        queue.submit("a", f"a{i}")
+    queue.submit("b", "b0", cost=5.0)
+    for expected in (("a", "a0"), ("b", "b0")):
+        assert queue.take(timeout=0) == expected
+        queue.done(expected[0], 0.1)
+    # "b" menganggur tetapi finish tag-nya (5) masih di depan; job berikutnya tidak didahulukan
+    queue.submit("b", "b1")
+    assert [item for _, item in drain(queue)] == ["a1", "a2", "b1"]
+
+
+def write_pdf(path, pages):
+    path.write_bytes(b"%PDF-1.4\n" + f"<< /Type /Pages /Count {pages} >>\n%%EOF".encode())
+    return str(path)
+
+
+def test_batch_scheduler_orders_by_priority_then_estimated_cost(tmp_path):
+    big = write_pdf(tmp_path / "besar.pdf", 200)
+    small = write_pdf(tmp_path / "kecil.pdf", 2)
+    medium = write_pdf(tmp_path / "sedang.pdf", 40)
+    urgent = write_pdf(tmp_path / "mendesak.pdf", 500)
+    scheduler = BatchScheduler([big, small, medium, urgent], priorities={urgent: 1})
+
+    # Prioritas lebih tinggi selalu didahulukan, lalu biaya terkecil lebih dulu
+    assert scheduler.ordered_paths() == [urgent, small, medium, big]
+    assert estimate_file(big).pages == 200
+    assert scheduler.cost(small) < scheduler.cost(medium) < scheduler.cost(big)
+    assert [scheduler.pop() for _ in range(4)] == [urgent, small, medium, big]
+    assert scheduler.pop() is None
+
+
+def test_batch_scheduler_keeps_list_order_for_equal_cost_and_skips_duplicates(tmp_path):
+    paths = [write_pdf(tmp_path / f"{name}.pdf", 3) for name in ("c", "a", "b")]
+    scheduler = BatchScheduler(paths)
+    assert scheduler.add([paths[0]]) == []
+    assert scheduler.ordered_paths() == paths
+
+    # Berkas baru baru diurutkan setelah drain
+    late = write_pdf(tmp_path / "susulan.pdf", 1)
+    assert scheduler.add([late]) == [late]
+    assert len(scheduler) == 4 and scheduler.ordered_paths() == paths
+    scheduler.drain()
+    assert scheduler.pop() == late
+
+    assert scheduler.clear() == paths
+    assert scheduler.close_if_empty()
+    assert scheduler.add([late]) is None
+
+
+def test_cost_model_scale_follows_observed_times(tmp_path):
+    path = write_pdf(tmp_path / "dok.pdf", 10)
+    model = CostModel(alpha=0.5)
+    scheduler = BatchScheduler([path], model=model)
+    predicted = scheduler.cost(path)
+
+    # Pemeriksaan nyata dua kali lebih lambat: skala PDF bergerak separuh jalan ke 2,0
+    scheduler.record(path, predicted * 2)
+    assert model.scales[".pdf"] == pytest.approx(1.5)
+    assert model.predict(estimate_file(path)) == pytest.approx(predicted * 1.5)
+    assert scheduler.report() == [(path, predicted, predicted * 2)]
@@ -0,0 +1,53 @@
+import io
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("docx")
+pytest.importorskip("fitz")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import reference  # noqa: E402
+from core.scheduler import FairJobQueue  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Antrean tanpa worker: job yang diterima tetap menunggu sehingga batasnya dapat diuji
+    monkeypatch.setattr(reference, "job_queue", FairJobQueue(workers=1, max_running=1, max_queued=1))
+    monkeypatch.setattr(reference, "jobs", {})
+    monkeypatch.setattr(reference, "jobs_by_digest", {})
+    return reference.app.test_client()
+
+
+def upload(client, data, url="/jobs"):
+    return client.post(url, data={"file": (io.BytesIO(data), "doc.pdf")}, content_type="multipart/form-data")
+
+
+def test_full_tenant_queue_answers_429_with_retry_after(client):
+    assert upload(client, b"%PDF-1.4 first").status_code == 202
+    response = upload(client, b"%PDF-1.4 second")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.get_json()["reason"] == "tenant_queue_full"
+
+
+def test_identical_upload_joins_the_queued_job(client):
+    first = upload(client, b"%PDF-1.4 same").get_json()
+    response = upload(client, b"%PDF-1.4 same")
+    # Tidak memakan tempat antrean kedua, jadi tidak ditolak
+    assert response.status_code == 200
+    assert response.get_json()["job_id"] == first["job_id"]
+
+
+def test_form_upload_redirects_to_the_progress_page(client):
+    response = upload(client, b"%PDF-1.4 form", url="/")
+    assert response.status_code == 303
+    job_id = response.headers["Location"].rstrip("/").rsplit("/", 1)[-1]
+    assert job_id in reference.jobs
+
+    page = client.get(f"/jobs/{job_id}")
+    assert page.status_code == 200
+    assert f"/jobs/{job_id}/events".encode() in page.data
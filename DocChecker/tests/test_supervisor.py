@@ -0,0 +1,87 @@
+import os
+import signal
+import time
+
+import pytest
+
+# Worker memuat core.checker, yang membutuhkan python-docx dan PyMuPDF
+pytest.importorskip("docx")
+pytest.importorskip("fitz")
+
+from core.issues import (  # noqa: E402
+    ERROR_CRASHED, ERROR_TIMEOUT, ERROR_UNSUPPORTED, STATUS_CRASHED, STATUS_TIMEOUT,
+)
+from core.supervisor import SettingsSnapshot, SupervisedPool  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="butuh named pipe (POSIX)")
+
+
+@pytest.fixture
+def hanging_pdf(tmp_path):
+    # Membuka FIFO tanpa penulis memblokir selamanya: pemeriksaan yang sengaja macet
+    path = str(tmp_path / "macet.pdf")
+    os.mkfifo(path)
+    return path
+
+
+@pytest.fixture
+def unsupported(tmp_path):
+    path = tmp_path / "catatan.txt"
+    path.write_text("bukan dokumen")
+    return str(path)
+
+
+def collect_all(pool, count, limit=60.0):
+    finished = []
+    deadline = time.monotonic() + limit
+    while len(finished) < count and time.monotonic() < deadline:
+        finished.extend(pool.collect(timeout=0.2))
+    assert len(finished) == count
+    return finished
+
+
+def make_pool(timeout):
+    return SupervisedPool(SettingsSnapshot({}), size=1, timeout=timeout, memory_limit_mb=0)
+
+
+def test_hung_worker_is_timed_out_and_replaced(hanging_pdf, unsupported):
+    pool = make_pool(timeout=1.0)
+    try:
+        hung_pid = pool.worker_pids()[0]
+        assert pool.submit("macet", hanging_pdf)
+        assert not pool.submit("lain", unsupported)
+
+        [(job_id, path, result)] = collect_all(pool, 1)
+        assert (job_id, path) == ("macet", hanging_pdf)
+        assert result.status == STATUS_TIMEOUT
+        assert result.issues[0].code == ERROR_TIMEOUT
+        assert pool.restarts == 1
+        assert pool.worker_pids() != [hung_pid]
+
+        # Worker pengganti memeriksa berkas berikutnya seperti biasa
+        assert pool.submit("lain", unsupported)
+        [(job_id, _, result)] = collect_all(pool, 1)
+        assert job_id == "lain"
+        assert result.issues[0].code == ERROR_UNSUPPORTED
+    finally:
+        pool.close()
+
+
+def test_crashed_worker_reports_its_exit_code(hanging_pdf, unsupported):
+    pool = make_pool(timeout=0)
+    try:
+        assert pool.submit("mati", hanging_pdf)
+        assert pool.collect(timeout=0.5) == []
+        os.kill(pool.worker_pids()[0], signal.SIGKILL)
+
+        [(job_id, _, result)] = collect_all(pool, 1)
+        assert job_id == "mati"
+        assert result.status == STATUS_CRASHED
+        assert result.issues[0].code == ERROR_CRASHED
+        assert result.value(result.issues[0].found) == str(-signal.SIGKILL)
+        assert pool.restarts == 1
+
+        assert pool.submit("lain", unsupported)
+        assert collect_all(pool, 1)[0][2].issues[0].code == ERROR_UNSUPPORTED
+    finally:
+        pool.close()
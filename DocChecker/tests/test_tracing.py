@@ -0,0 +1,60 @@
+import json
+import time
+
+import pytest
+
+from core import metrics, tracing
+
+
+@pytest.fixture(autouse=True)
+def no_trace():
+    tracing.stop()
+    yield
+    tracing.stop()
+
+
+def test_spans_cost_nothing_when_tracing_is_off():
+    with tracing.span("parse"):
+        pass
+    tracing.record("read", time.perf_counter(), 0.1)
+    assert not tracing.enabled()
+    assert tracing.drain() is None
+
+
+def test_worker_events_are_merged_into_one_trace_file(tmp_path):
+    # Proses worker: span dikumpulkan lalu dikirim bersama hasil
+    worker = tracing.start("Worker 1")
+    worker.pid = 4242
+    with tracing.span("bab1.pdf", path="/data/bab1.pdf"):
+        with metrics.stage("parse"):
+            pass
+    first = tracing.drain()
+    with tracing.span("bab2.pdf"):
+        pass
+    second = tracing.drain()
+    assert tracing.drain() == [event for event in second if event["ph"] == "M"]
+
+    parent = tracing.start("DocChecker")
+    started = time.perf_counter()
+    tracing.record("sink", started, 0.002)
+    tracing.merge(first)
+    tracing.merge(second)
+    tracing.merge(None)
+    path = tmp_path / "trace.json"
+    tracing.stop().write(str(path))
+    assert not tracing.enabled()
+
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    events = trace["traceEvents"]
+    spans = [(event["pid"], event["name"]) for event in events if event["ph"] == "X"]
+    assert spans == [(parent.pid, "sink"), (4242, "parse"), (4242, "bab1.pdf"), (4242, "bab2.pdf")]
+    # Metadata worker yang dikirim bersama setiap hasil ditulis sekali saja
+    names = [(event["pid"], event["args"]["name"]) for event in events if event["name"] == "process_name"]
+    assert names == [(parent.pid, "DocChecker"), (4242, "Worker 1")]
+
+    sink = next(event for event in events if event["name"] == "sink")
+    assert sink["dur"] == 2000.0
+    assert abs(sink["ts"] - parent.timestamp(started)) < 1
+    bab1 = next(event for event in events if event["name"] == "bab1.pdf")
+    assert bab1["args"] == {"path": "/data/bab1.pdf"}
@@ -1,145 +1,274 @@
+import hashlib
+import json
 import os
-from flask import Flask, render_template, request
-from docx import Document  # Pastikan ini adalah python-docx
-from docx.shared import Pt
-import io
-import fitz  # PyMuPDF
+import sys
+import threading
+import time
+import uuid
+from flask import Flask, Response, abort, jsonify, redirect, render_template, request, url_for
+
+# Pemeriksaan memakai inti DocChecker yang sama dengan aplikasi desktop
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DocChecker", "src"))
+from core import metrics
+from core.checker import Checker
+from core.scheduler import FairJobQueue, Overloaded
+from core.supervisor import SettingsSnapshot
 
 app = Flask(__name__)
 
 # Atur batasan ukuran file (misalnya 10MB)
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10 Megabytes
 
-# Fungsi untuk memeriksa dokumen .docx
-def check_docx(doc: Document) -> dict:
-    report = []
-    success = True
-
-    # Memeriksa font, ukuran, dan spasi
-    for para in doc.paragraphs:
-        # Memeriksa font dan ukuran
-        for run in para.runs:
-            if run.font.name != 'Times New Roman':
-                report.append(f'Font tidak sesuai di paragraf: "{para.text[:30]}..."')
-                success = False
-                break
-            if run.font.size and run.font.size.pt != 12:
-                report.append(f'Ukuran font tidak sesuai di paragraf: "{para.text[:30]}..."')
-                success = False
-                break
-
-        # Memeriksa spasi
-        if para.paragraph_format.line_spacing is not None:
-            spacing = para.paragraph_format.line_spacing
-            if spacing != 1.5:
-                report.append(f'Spasi tidak sesuai di paragraf: "{para.text[:30]}..."')
-                success = False
-
-    # Memeriksa margin dalam cm
-    sections = doc.sections
-    if sections:
-        section = sections[0]
-        # Konversi inci ke cm (1 inci = 2.54 cm)
-        left_margin_cm = section.left_margin.inches * 2.54
-        right_margin_cm = section.right_margin.inches * 2.54
-        top_margin_cm = section.top_margin.inches * 2.54
-        bottom_margin_cm = section.bottom_margin.inches * 2.54
-
-        # Margin yang diharapkan
-        expected_margins_cm = {
-            'left': 4.0,    # 4 cm
-            'right': 3.0,   # 3 cm
-            'top': 3.0,     # 3 cm
-            'bottom': 3.0   # 3 cm
-        }
-
-        tolerance = 0.1  # cm
-
-        if abs(left_margin_cm - expected_margins_cm['left']) > tolerance:
-            report.append(f'Margin kiri tidak sesuai: {left_margin_cm:.2f} cm (Diharapkan: {expected_margins_cm["left"]} cm)')
-            success = False
-        if abs(right_margin_cm - expected_margins_cm['right']) > tolerance:
-            report.append(f'Margin kanan tidak sesuai: {right_margin_cm:.2f} cm (Diharapkan: {expected_margins_cm["right"]} cm)')
-            success = False
-        if abs(top_margin_cm - expected_margins_cm['top']) > tolerance:
-            report.append(f'Margin atas tidak sesuai: {top_margin_cm:.2f} cm (Diharapkan: {expected_margins_cm["top"]} cm)')
-            success = False
-        if abs(bottom_margin_cm - expected_margins_cm['bottom']) > tolerance:
-            report.append(f'Margin bawah tidak sesuai: {bottom_margin_cm:.2f} cm (Diharapkan: {expected_margins_cm["bottom"]} cm)')
-            success = False
-    else:
-        report.append('Tidak dapat memeriksa margin.')
-        success = False
+# Aturan default (tanpa QSettings aplikasi desktop); unggahan tidak punya path, jadi tanpa cache fitur
+SETTINGS = SettingsSnapshot({"cache/enabled": False})
+
+# Thread pemeriksa yang mengambil job dari antrean
+JOB_WORKERS = 2
+# Batas per tenant: job yang berjalan bersamaan dan job yang menunggu; batas seluruh antrean
+TENANT_MAX_RUNNING = 1
+TENANT_MAX_QUEUED = 200
+MAX_QUEUED = 1000
+# Batas total ukuran unggahan yang menunggu di memori (byte); job yang sedang diperiksa tidak dihitung
+MAX_QUEUED_BYTES = 256 * 1024 * 1024
+# Kunci API -> [tenant, bobot], mis. DOCCHECKER_TENANTS='{"kunci-fmipa": ["fmipa", 2]}'.
+# Tanpa kunci yang dikenal, tenant adalah alamat klien dengan bobot 1.
+TENANTS = json.loads(os.environ.get("DOCCHECKER_TENANTS", "{}"))
+# Lama (detik) job yang selesai disimpan agar klien dapat menyambung ulang atau mengunggah ulang tanpa diperiksa lagi
+JOB_TTL = 600
+# Interval (detik) komentar keep-alive pada stream SSE saat tidak ada event
+SSE_KEEPALIVE = 15
+
+job_queue = FairJobQueue(JOB_WORKERS, TENANT_MAX_RUNNING, TENANT_MAX_QUEUED, MAX_QUEUED,
+                         weights={tenant: weight for tenant, weight in TENANTS.values()},
+                         max_queued_size=MAX_QUEUED_BYTES)
+metrics.QUEUE_DEPTH.set_function(job_queue.__len__, queue="service")
+jobs = {}
+jobs_by_digest = {}
+jobs_lock = threading.Lock()
+
+
+class Job:
+    """
+    A background check of one upload and its event log.
+
+    Events are kept for the lifetime of the job, so any number of clients
+    can follow it and a reconnecting client resumes from ``Last-Event-ID``.
+    """
+
+    def __init__(self, filename, digest, data):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.digest = digest
+        self.data = data
+        self.events = []
+        self.done = False
+        self.finished_at = None
+        self._condition = threading.Condition()
+
+    def publish(self, event, data, final=False):
+        with self._condition:
+            self.events.append((event, data))
+            if final:
+                self.done = True
+                self.finished_at = time.monotonic()
+            self._condition.notify_all()
 
-    return {"success": success, "messages": report}
+    def wait(self, index, timeout):
+        """Events from ``index`` on (waiting up to ``timeout`` for new ones) and whether the job is done."""
+        with self._condition:
+            if index >= len(self.events) and not self.done:
+                self._condition.wait(timeout)
+            return self.events[index:], self.done
 
-# Fungsi untuk memeriksa dokumen PDF
-def check_pdf(file_stream: io.BytesIO) -> dict:
-    report = []
-    success = True
+    def progress(self, done, total, findings):
+        """``DocumentProgress`` callback; runs in the checking thread."""
+        self.publish("progress", {"done": done, "total": total})
+        messages = findings.messages
+        if messages:
+            self.publish("findings", {"messages": messages})
+
+
+def run_job(job, checker):
+    data, job.data = job.data, None
     try:
-        doc = fitz.open(stream=file_stream.read(), filetype="pdf")
+        result = checker.check_bytes(data, job.filename, progress=job.progress)
+        job.publish("result", {"success": result.success, "status": result.status,
+                               "messages": result.messages}, final=True)
     except Exception as e:
-        report.append('Gagal membaca dokumen PDF.')
-        return {"success": False, "messages": report}
-
-    # Memeriksa font dan ukuran font
-    for page_num in range(doc.page_count):
-        page = doc.load_page(page_num)
-        blocks = page.get_text("dict")["blocks"]
-        for block in blocks:
-            if block['type'] != 0:  # Hanya teks
-                continue
-            for line in block.get('lines', []):
-                for span in line.get('spans', []):
-                    font = span.get('font', '').lower()
-                    size = span.get('size', 0)
-                    text = span.get('text', '').strip()
+        app.logger.exception(f"Job {job.id} gagal")
+        job.publish("result", {"success": False, "status": "error", "messages": [str(e)]}, final=True)
+
+
+def job_worker():
+    # Setiap thread pemeriksa memakai Checker sendiri; satu instance tidak dibagi antar thread
+    checker = Checker(SETTINGS)
+    while True:
+        taken = job_queue.take()
+        if taken is None:
+            return
+        tenant, job = taken
+        started = time.monotonic()
+        try:
+            run_job(job, checker)
+        finally:
+            job_queue.done(tenant, time.monotonic() - started)
+
+
+for _ in range(JOB_WORKERS):
+    threading.Thread(target=job_worker, name="check-job", daemon=True).start()
+
+
+def current_tenant():
+    """``(tenant, weight)`` of the request: from its ``X-API-Key``, else the client address."""
+    entry = TENANTS.get(request.headers.get('X-API-Key', ''))
+    if entry:
+        return entry[0], entry[1]
+    return request.remote_addr or "anonymous", None
 
-                    if 'times new roman' not in font:
-                        report.append(f'Font tidak sesuai di halaman {page_num +1}: "{text[:30]}..."')
-                        success = False
-                    if abs(size - 12) > 0.5:  # Toleransi ukuran font
-                        report.append(f'Ukuran font tidak sesuai di halaman {page_num +1}: "{text[:30]}..."')
-                        success = False
 
-    # Memeriksa margin pada PDF tidak dilakukan secara mendalam
-    report.append('Pemeriksaan margin pada PDF tidak dilakukan secara mendalam.')
+def submit_job(uploaded_file):
+    """
+    Queue a check of the upload for the current tenant, or join the job of an
+    identical upload. Returns ``(job, created)``; raises ``Overloaded``.
+    """
+    file_name = uploaded_file.filename.lower()
+    data = uploaded_file.read()
+    # Unggahan ulang berkas yang sama mengikuti job yang sudah ada, bukan memeriksa lagi
+    digest = hashlib.sha256(data).hexdigest() + os.path.splitext(file_name)[1]
+    tenant, weight = current_tenant()
 
-    return {"success": success and not report, "messages": report}
+    prune_jobs()
+    with jobs_lock:
+        job = jobs_by_digest.get(digest)
+        if job is not None:
+            return job, False
+        job = Job(file_name, digest, data)
+        # Biaya job sebanding dengan ukuran berkas: unggahan besar memakai lebih banyak jatah tenant
+        job_queue.submit(tenant, job, cost=1.0 + len(data) / (1024 * 1024), weight=weight, size=len(data))
+        jobs[job.id] = job
+        jobs_by_digest[digest] = job
+    return job, True
+
+
+def overloaded(error, html=False):
+    """429 response for a job that was not admitted."""
+    message = f"Server sedang sibuk. Coba lagi dalam {error.retry_after} detik."
+    if html:
+        response = app.make_response((render_template('index.html', report={"success": False, "messages": [message]}), 429))
+    else:
+        response = jsonify({"success": False, "reason": error.reason, "messages": [message]})
+        response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def prune_jobs():
+    now = time.monotonic()
+    with jobs_lock:
+        for job in list(jobs.values()):
+            if job.done and now - job.finished_at > JOB_TTL:
+                del jobs[job.id]
+                if jobs_by_digest.get(job.digest) is job:
+                    del jobs_by_digest[job.digest]
+
+
+def validate_upload(uploaded_file):
+    """Error message for an unusable upload, or None."""
+    if not uploaded_file:
+        return "Tidak ada file yang diunggah."
+    file_name = uploaded_file.filename.lower()
+    if not (file_name.endswith('.docx') or file_name.endswith('.pdf')):
+        return "Silakan unggah file .docx atau .pdf saja."
+    return None
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
         uploaded_file = request.files.get('file')
-        if not uploaded_file:
-            return render_template('index.html', report={"success": False, "messages": ["Tidak ada file yang diunggah."]})
+        error = validate_upload(uploaded_file)
+        if error:
+            return render_template('index.html', report={"success": False, "messages": [error]})
 
-        file_name = uploaded_file.filename.lower()
-        if not (file_name.endswith('.docx') or file_name.endswith('.pdf')):
-            return render_template('index.html', report={"success": False, "messages": ["Silakan unggah file .docx atau .pdf saja."]})
+        # Melalui antrean yang sama dengan /jobs, agar unggahan interaktif mendapat bagian yang adil;
+        # hasilnya diikuti di halaman progres, bukan dengan menahan request sampai job selesai
+        try:
+            job, _ = submit_job(uploaded_file)
+        except Overloaded as e:
+            return overloaded(e, html=True)
+        return redirect(url_for('job_page', job_id=job.id), code=303)
 
-        file_bytes = uploaded_file.read()
-        file_stream = io.BytesIO(file_bytes)
+    return render_template('index.html')
 
-        if file_name.endswith('.docx'):
-            try:
-                doc = Document(file_stream)
-                report = check_docx(doc)
-            except Exception as e:
-                return render_template('index.html', report={"success": False, "messages": ["Gagal membaca dokumen .docx. Pastikan file dalam format yang benar."]})
-        elif file_name.endswith('.pdf'):
-            report = check_pdf(file_stream)
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """Start a background check; progress is streamed from the returned ``events`` URL."""
+    uploaded_file = request.files.get('file')
+    error = validate_upload(uploaded_file)
+    if error:
+        return jsonify({"success": False, "messages": [error]}), 400
+    try:
+        job, created = submit_job(uploaded_file)
+    except Overloaded as e:
+        return overloaded(e)
 
-        return render_template('index.html', report=report)
+    return jsonify({"job_id": job.id, "events": url_for('job_events', job_id=job.id)}), 202 if created else 200
 
-    return render_template('index.html')
+@app.route('/jobs/<job_id>')
+def job_page(job_id):
+    """Progress page of a job; follows its ``events`` stream and shows the report when it is done."""
+    job = jobs.get(job_id)
+    if job is None:
+        abort(404)
+    return render_template('job.html', job=job, events_url=url_for('job_events', job_id=job.id))
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Server-Sent Events stream of a job: ``progress`` ({done, total} paragraphs
+    or pages), ``findings`` (messages found since the previous event) and a
+    final ``result`` ({success, status, messages}) after which the stream ends.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        abort(404)
+    try:
+        start = int(request.headers.get('Last-Event-ID', -1)) + 1
+    except ValueError:
+        start = 0
+
+    def stream():
+        index = start
+        while True:
+            events, done = job.wait(index, SSE_KEEPALIVE)
+            if not events and not done:
+                yield ": keep-alive\n\n"
+                continue
+            for event, data in events:
+                yield f"id: {index}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+                index += 1
+            if done and index >= len(job.events):
+                return
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/queue')
+def queue_stats():
+    """Queued and running jobs with queue wait percentiles (seconds), overall and per tenant."""
+    return jsonify(job_queue.stats())
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Checker metrics in the Prometheus text exposition format."""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
 
 @app.errorhandler(413)
 def request_entity_too_large(error):
+    if request.path.startswith('/jobs'):
+        return jsonify({"success": False, "messages": ["File terlalu besar. Maksimal 10MB."]}), 413
     return render_template('index.html', report={"success": False, "messages": ["File terlalu besar. Maksimal 10MB."]}), 413
 
 if __name__ == '__main__':
     # Cetak isi folder templates untuk debugging
     print("Isi folder 'templates':", os.listdir('templates'))
-    app.run(host='0.0.0.0', port=81)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=81, threaded=True)